@@ -0,0 +1,42 @@
+""" Compares the size and the loading time of the binary supervised topic classifier model
+format with those of the jsonpickle-based format used by earlier versions.
+
+Usage: python benchmark_classifier_serialization.py MODEL CORPUS_DIRECTORY
+
+CORPUS_DIRECTORY should contain one subdirectory per classification, each of which contains
+UTF-8 text files that are used as training documents for that classification.
+"""
+import os
+import sys
+import time
+import jsonpickle
+import holmes_extractor as holmes
+
+def measure(name, serialized_model, model_name):
+    # a new manager is used for each load so that no phraselet template sentences are cached
+    holmes_manager = holmes.Manager(model_name, perform_coreference_resolution=False)
+    start_time = time.perf_counter()
+    holmes_manager.deserialize_supervised_topic_classifier(serialized_model)
+    load_seconds = time.perf_counter() - start_time
+    print(''.join((name.ljust(24), str(len(serialized_model)).rjust(12), ' bytes',
+            '{:.3f}'.format(load_seconds).rjust(10), ' s load')))
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    model, corpus_directory = sys.argv[1:]
+    holmes_manager = holmes.Manager(model, perform_coreference_resolution=False)
+    training_basis = holmes_manager.get_supervised_topic_training_basis()
+    for classification in sorted(os.listdir(corpus_directory)):
+        classification_directory = os.sep.join((corpus_directory, classification))
+        for filename in sorted(os.listdir(classification_directory)):
+            with open(os.sep.join((classification_directory, filename)),
+                    encoding='utf-8') as file:
+                training_basis.parse_and_register_training_document(file.read(),
+                        classification, os.sep.join((classification, filename)))
+    training_basis.prepare()
+    classifier = training_basis.train().classifier()
+    print('Phraselets:', len(classifier._model.serialized_phraselets))
+    measure('jsonpickle', jsonpickle.encode(classifier._model), model)
+    measure('binary', classifier.serialize_model(), model)
@@ -0,0 +1,94 @@
+""" Measures the memory occupied by the Holmes information held for a reference corpus.
+
+Usage: python benchmark_memory.py MODEL CORPUS_DIRECTORY
+
+CORPUS_DIRECTORY should contain UTF-8 text files, each of which is registered as a document.
+Run the script on two versions of Holmes to compare their memory use on the same corpus. The
+size the Holmes dictionaries would occupy if their edges were held in lists, as they are while a
+document is being analysed, is also reported.
+"""
+import copy
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import holmes_extractor as holmes
+
+def with_list_backed_edges(holmes_dictionary):
+    """ Returns a copy of a Holmes dictionary whose edges are held in lists built up by appending,
+        as they were before *HolmesDictionary.compact()* was introduced.
+    """
+    copied_dictionary = copy.copy(holmes_dictionary)
+    copied_dictionary.children = [dependency for dependency in holmes_dictionary.children]
+    copied_dictionary.righthand_siblings = [index for index in
+            holmes_dictionary.righthand_siblings]
+    copied_dictionary.parent_dependencies = [[index, label] for index, label in
+            holmes_dictionary.parent_dependencies]
+    if holmes_dictionary.token_and_coreference_chain_indexes != None:
+        copied_dictionary.token_and_coreference_chain_indexes = [index for index in
+                holmes_dictionary.token_and_coreference_chain_indexes]
+    copied_dictionary.mentions = [mention for mention in holmes_dictionary.mentions]
+    return copied_dictionary
+
+def holmes_information_size(holmes_dictionaries):
+    """ Returns the number of bytes occupied by Holmes dictionaries, including the objects,
+        tuples and lists they refer to. Objects shared between tokens are counted once.
+    """
+    visited = set()
+
+    def size(obj):
+        if id(obj) in visited or obj is None or isinstance(obj, (bool, int, float)):
+            return 0
+        visited.add(id(obj))
+        total = sys.getsizeof(obj)
+        if isinstance(obj, (list, tuple, set)):
+            total += sum(size(member) for member in obj)
+        elif isinstance(obj, dict):
+            total += sum(size(key) + size(value) for key, value in obj.items())
+        elif not isinstance(obj, str):
+            if hasattr(obj, '__dict__'):
+                total += size(obj.__dict__)
+            for slot in getattr(type(obj), '__slots__', ()):
+                total += size(getattr(obj, slot, None))
+        return total
+
+    return sum(size(holmes_dictionary) for holmes_dictionary in holmes_dictionaries)
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    model, corpus_directory = sys.argv[1:]
+    holmes_manager = holmes.Manager(model, perform_coreference_resolution=False)
+    gc.collect()
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start_time = time.perf_counter()
+    for filename in sorted(os.listdir(corpus_directory)):
+        with open(os.sep.join((corpus_directory, filename)), encoding='utf-8') as file:
+            holmes_manager.parse_and_register_document(file.read(), filename)
+    parse_seconds = time.perf_counter() - start_time
+    gc.collect()
+    corpus_memory = tracemalloc.get_traced_memory()[0] - start_memory
+    tracemalloc.stop()
+    number_of_tokens = 0
+    holmes_bytes = 0
+    list_backed_holmes_bytes = 0
+    for label in holmes_manager.document_labels():
+        doc = holmes_manager.threadsafe_container.get_document(label)
+        number_of_tokens += len(doc)
+        holmes_bytes += holmes_information_size([token._.holmes for token in doc])
+        # the copies are held in a list so that their ids are not reused while they are measured
+        list_backed_holmes_bytes += holmes_information_size(
+                [with_list_backed_edges(token._.holmes) for token in doc])
+    print('Documents:', len(holmes_manager.document_labels()))
+    print('Tokens:', number_of_tokens)
+    print('Parse time (seconds):', round(parse_seconds, 2))
+    print('Python memory allocated for the registered corpus (bytes):', corpus_memory)
+    print('Bytes per token (all Python allocations):',
+            round(corpus_memory / number_of_tokens, 1))
+    print('Bytes per token (Holmes dictionaries only):',
+            round(holmes_bytes / number_of_tokens, 1))
+    print('Bytes per token (Holmes dictionaries with list-backed edges):',
+            round(list_backed_holmes_bytes / number_of_tokens, 1))
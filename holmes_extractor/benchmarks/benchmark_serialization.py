@@ -0,0 +1,59 @@
+""" Compares the size and the encoding and decoding times of the binary document serialization
+format with those of the jsonpickle-based format used by earlier versions.
+
+Usage: python benchmark_serialization.py MODEL CORPUS_DIRECTORY
+
+CORPUS_DIRECTORY should contain UTF-8 text files, each of which is parsed as a document.
+"""
+import os
+import sys
+import time
+import jsonpickle
+import holmes_extractor as holmes
+from holmes_extractor.semantics import SerializedHolmesDocument
+
+def jsonpickle_encode(semantic_analyzer, doc):
+    """ Serializes a document in the way earlier versions did. """
+    dictionaries = [token._.holmes for token in doc]
+    for token in doc:
+        token._.holmes = None
+    try:
+        return jsonpickle.encode(SerializedHolmesDocument(doc.to_bytes(), dictionaries,
+                semantic_analyzer.model))
+    finally:
+        for token in doc:
+            token._.holmes = dictionaries[token.i]
+
+def measure(name, docs, encode, decode):
+    start_time = time.perf_counter()
+    serialized_docs = [encode(doc) for doc in docs]
+    encode_seconds = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for serialized_doc in serialized_docs:
+        decode(serialized_doc)
+    decode_seconds = time.perf_counter() - start_time
+    size = sum(len(serialized_doc) for serialized_doc in serialized_docs)
+    print(''.join((name.ljust(24), str(size).rjust(12), ' bytes',
+            '{:.3f}'.format(encode_seconds).rjust(10), ' s encode',
+            '{:.3f}'.format(decode_seconds).rjust(10), ' s decode')))
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    model, corpus_directory = sys.argv[1:]
+    holmes_manager = holmes.Manager(model, perform_coreference_resolution=False)
+    semantic_analyzer = holmes_manager.semantic_analyzer
+    docs = []
+    for filename in sorted(os.listdir(corpus_directory)):
+        with open(os.sep.join((corpus_directory, filename)), encoding='utf-8') as file:
+            docs.append(semantic_analyzer.parse(file.read()))
+    print('Documents:', len(docs))
+    print('Tokens:', sum(len(doc) for doc in docs))
+    measure('jsonpickle', docs, lambda doc: jsonpickle_encode(semantic_analyzer, doc),
+            semantic_analyzer.from_serialized_string)
+    measure('binary', docs, semantic_analyzer.to_serialized_string,
+            semantic_analyzer.from_serialized_string)
+    measure('binary (compressed)', docs,
+            lambda doc: semantic_analyzer.to_serialized_string(doc, compress=True),
+            semantic_analyzer.from_serialized_string)
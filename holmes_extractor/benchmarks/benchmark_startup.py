@@ -0,0 +1,72 @@
+""" Measures the cold-start time of Holmes.
+
+Usage: python benchmark_startup.py MODEL [NUMBER_OF_WORKERS]
+
+Reports the time taken to import holmes_extractor in a fresh interpreter and which optional
+subsystems this import loads, the time taken to construct a Manager in a fresh interpreter, and
+the time taken for a MultiprocessingManager to be constructed and for each of its workers to
+start up.
+"""
+import subprocess
+import sys
+import time
+
+OPTIONAL_MODULES = ('neuralcoref', 'sklearn', 'scipy.sparse', 'rdflib', 'jsonpickle')
+
+IMPORT_SCRIPT = """
+import sys
+import time
+start_time = time.perf_counter()
+import holmes_extractor
+print(time.perf_counter() - start_time)
+print(' '.join(module for module in {} if module in sys.modules))
+""".format(repr(OPTIONAL_MODULES))
+
+MANAGER_SCRIPT = """
+import ast
+import sys
+import time
+import holmes_extractor as holmes
+start_time = time.perf_counter()
+holmes.Manager(sys.argv[1], **ast.literal_eval(sys.argv[2]))
+print(time.perf_counter() - start_time)
+"""
+
+def manager_construction_seconds(model, arguments):
+    """ Returns the time taken to construct a Manager with keyword *arguments* in a fresh
+        interpreter, so that the model is not already held in memory.
+    """
+    output = subprocess.run([sys.executable, '-c', MANAGER_SCRIPT, model, repr(arguments)],
+            check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout.split('\n')
+    return float(output[0])
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        print(__doc__)
+        sys.exit(1)
+    model = sys.argv[1]
+    number_of_workers = int(sys.argv[2]) if len(sys.argv) == 3 else 2
+    output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout.split('\n')
+    print('Import time (seconds):', round(float(output[0]), 2))
+    print('Optional subsystems loaded on import:', output[1] if output[1] != '' else 'none')
+    print('Manager construction without coreference resolution (seconds):',
+            round(manager_construction_seconds(model,
+            {'perform_coreference_resolution': False}), 2))
+    print('Manager construction with default settings (seconds):',
+            round(manager_construction_seconds(model, {}), 2))
+
+    import holmes_extractor as holmes
+    start_time = time.perf_counter()
+    multiprocessing_manager = holmes.MultiprocessingManager(model,
+            number_of_workers=number_of_workers, verbose=False)
+    print('MultiprocessingManager construction (seconds):',
+            round(time.perf_counter() - start_time, 2))
+    worker_startup_timings = multiprocessing_manager.worker_startup_timings()
+    multiprocessing_manager.close()
+    for worker_label in sorted(worker_startup_timings):
+        timings = worker_startup_timings[worker_label]
+        print(''.join((worker_label, ': process started after ',
+                str(round(timings['process_start'], 2)), ' s, model loaded in ',
+                str(round(timings['model_load'], 2)), ' s, ready after ',
+                str(round(timings['ready'], 2)), ' s')))
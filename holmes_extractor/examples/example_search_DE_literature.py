@@ -52,7 +52,7 @@ if __name__ in ('__main__', 'example_search_DE_literature'):
                 print('Saving', this_document_label)
                 output_filename = os.sep.join((working_directory, this_document_label))
                 output_filename = '.'.join((output_filename, HOLMES_EXTENSION))
-                with open(output_filename, "w") as f:
+                with open(output_filename, "wb") as f:
                     f.write(manager.serialize_document(this_document_label))
 
     def load_documents_from_working_directory(labels_to_documents):
@@ -62,7 +62,7 @@ if __name__ in ('__main__', 'example_search_DE_literature'):
                 print('Loading', file)
                 label = file[:-4]
                 long_filename = os.sep.join((working_directory, file))
-                with open(long_filename, "r") as f:
+                with open(long_filename, "rb") as f:
                     contents = f.read()
                 serialized_documents[label] = contents
         holmes_manager.deserialize_and_register_documents(serialized_documents)
@@ -60,8 +60,8 @@ def train_model(working_directory, zip_filename):
                         training_contents, category, filename)
     training_basis.prepare()
     classifier = training_basis.train().classifier()
-    output_filename = os.sep.join((working_directory, 'model.json'))
-    with open(output_filename, "w") as f:
+    output_filename = os.sep.join((working_directory, 'model.holmes'))
+    with open(output_filename, "wb") as f:
         f.write(classifier.serialize_model())
     evaluate_classifier(zip_filename, classifier)
 holmes_manager = holmes.Manager('en_core_web_lg')
@@ -76,11 +76,11 @@ if not os.path.exists(zip_filename):
     url='http://mlg.ucd.ie/files/datasets/bbc-fulltext.zip'
     with urllib.request.urlopen(url) as response, open(zip_filename, 'wb') as out_file:
         shutil.copyfileobj(response, out_file)
-model_filename = os.sep.join((working_directory, 'model.json'))
+model_filename = os.sep.join((working_directory, 'model.holmes'))
 if not os.path.exists(model_filename):
     train_model(working_directory, zip_filename)
 else:
-    print('Reloading existing trained model. Delete model.json from working directory to repeat training.')
-    with open(model_filename) as model_file:
+    print('Reloading existing trained model. Delete model.holmes from working directory to repeat training.')
+    with open(model_filename, "rb") as model_file:
         classifier = holmes_manager.deserialize_supervised_topic_classifier(model_file.read())
     evaluate_classifier(zip_filename, classifier)
@@ -1,12 +1,15 @@
 import collections
-import jsonpickle
 import uuid
 import statistics
-from scipy.sparse import dok_matrix
-from sklearn.neural_network import MLPClassifier
+import msgpack
+import numpy
 from .errors import WrongModelDeserializationError, FewerThanTwoClassificationsError, \
         DuplicateDocumentError, NoPhraseletsAfterFilteringError, \
-        EmbeddingThresholdGreaterThanRelationThresholdError
+        EmbeddingThresholdGreaterThanRelationThresholdError, WrongVersionDeserializationError
+from .ontology import Ontology
+from .structural_matching import SerializedPhraselet
+
+SERIALIZED_SUPERVISED_TOPIC_CLASSIFIER_MODEL_VERSION = 1
 
 class TopicMatch:
     """A topic match between some text and part of a document. Note that the end indexes refer
@@ -65,7 +68,8 @@ class TopicMatcher:
             single_word_score, single_word_any_tag_score, overlapping_relation_multiplier,
             embedding_penalty, maximum_number_of_single_word_matches_for_relation_matching,
             maximum_number_of_single_word_matches_for_embedding_matching,
-            sideways_match_extent, only_one_result_per_document, number_of_results):
+            sideways_match_extent, only_one_result_per_document, number_of_results,
+            corpus_index=None):
         if maximum_number_of_single_word_matches_for_embedding_matching > \
                 maximum_number_of_single_word_matches_for_relation_matching:
             raise EmbeddingThresholdGreaterThanRelationThresholdError(' '.join((
@@ -76,6 +80,7 @@ class TopicMatcher:
         self._semantic_analyzer = semantic_analyzer
         self.structural_matcher = structural_matcher
         self.indexed_documents = indexed_documents
+        self.corpus_index = corpus_index
         self._ontology = structural_matcher.ontology
         self.maximum_activation_distance = maximum_activation_distance
         self.relation_score = relation_score
@@ -446,7 +451,8 @@ class TopicMatcher:
                 compare_embeddings_on_root_words = False,
                 compare_embeddings_on_non_root_words = False,
                 document_labels_to_indexes_for_reverse_matching_sets = None,
-                document_labels_to_indexes_for_embedding_reverse_matching_sets = None)
+                document_labels_to_indexes_for_embedding_reverse_matching_sets = None,
+                corpus_index = self.corpus_index)
         if not self.structural_matcher.embedding_based_matching_on_root_words:
             rebuild_document_info_dict(structural_matches, phraselet_labels_to_search_phrases)
             for phraselet in (phraselet for phraselet in phraselet_labels_to_search_phrases.values()
@@ -462,7 +468,8 @@ class TopicMatcher:
                 compare_embeddings_on_root_words = False,
                 compare_embeddings_on_non_root_words = False,
                 document_labels_to_indexes_for_reverse_matching_sets = None,
-                document_labels_to_indexes_for_embedding_reverse_matching_sets = None))
+                document_labels_to_indexes_for_embedding_reverse_matching_sets = None,
+                corpus_index = self.corpus_index))
 
         rebuild_document_info_dict(structural_matches, phraselet_labels_to_search_phrases)
         parent_document_labels_to_indexes_for_direct_retry_sets = {}
@@ -491,7 +498,8 @@ class TopicMatcher:
                     document_labels_to_indexes_for_reverse_matching_sets =
                     parent_document_labels_to_indexes_for_direct_retry_sets,
                     document_labels_to_indexes_for_embedding_reverse_matching_sets =
-                    parent_document_labels_to_indexes_for_embedding_retry_sets))
+                    parent_document_labels_to_indexes_for_embedding_retry_sets,
+                    corpus_index = self.corpus_index))
 
         if len(child_document_labels_to_indexes_for_embedding_retry_sets) > 0:
 
@@ -505,7 +513,8 @@ class TopicMatcher:
                     compare_embeddings_on_non_root_words = True,
                     document_labels_to_indexes_for_reverse_matching_sets = None,
                     document_labels_to_indexes_for_embedding_reverse_matching_sets =
-                    child_document_labels_to_indexes_for_embedding_retry_sets))
+                    child_document_labels_to_indexes_for_embedding_retry_sets,
+                    corpus_index = self.corpus_index))
         if len(parent_document_labels_to_indexes_for_direct_retry_sets) > 0 or \
                 len(parent_document_labels_to_indexes_for_embedding_retry_sets) > 0 or \
                 len(child_document_labels_to_indexes_for_embedding_retry_sets) > 0:
@@ -1198,6 +1207,8 @@ class SupervisedTopicModelTrainer:
         self._sorted_label_dict = {}
         for index, label in enumerate(sorted(self._labels_to_classification_frequencies.keys())):
             self._sorted_label_dict[label] = index
+        from scipy.sparse import dok_matrix # deferred to avoid the import cost for other uses
+        from sklearn.neural_network import MLPClassifier
         self._input_matrix = dok_matrix((len(self._training_basis.training_documents),
                 len(self._sorted_label_dict)))
         self._output_matrix = dok_matrix((len(self._training_basis.training_documents),
@@ -1344,6 +1355,178 @@ class SupervisedTopicClassifierModel:
         self.overlap_memory_size = overlap_memory_size
         self.oneshot = oneshot
 
+    def to_bytes(self, semantic_analyzer):
+        """Returns a compact binary representation of the model that can be loaded using
+            *from_bytes()* without phraselet template sentences being parsed. The phraselets
+            are stored column by column, the neural network as its weight arrays, and the
+            ontology together with the dictionaries generated for its search phrase words.
+        """
+        phraselets = list(self.serialized_phraselets)
+        template_labels = sorted(set(phraselet.template_label for phraselet in phraselets))
+        template_label_ids = {label: index for index, label in enumerate(template_labels)}
+        template_docs = {}
+        for phraselet_template in semantic_analyzer.phraselet_templates:
+            if phraselet_template.label in template_label_ids:
+                template_docs[phraselet_template.label] = semantic_analyzer.holmes_doc_to_bytes(
+                        semantic_analyzer.phraselet_template_doc(phraselet_template))
+        mlp = self.mlp if isinstance(self.mlp, MLPWeights) else MLPWeights.from_mlp(self.mlp)
+        if self.structural_matcher_ontology == None:
+            ontology = None
+        else:
+            ontology = {
+                    'description': [
+                            self.structural_matcher_ontology.content_fingerprint(),
+                            self.structural_matcher_ontology.symmetric_matching],
+                    'ontology': self.structural_matcher_ontology.to_bytes(),
+                    'dictionaries': self.structural_matcher_ontology.dictionaries()}
+        return msgpack.packb({
+                'version': SERIALIZED_SUPERVISED_TOPIC_CLASSIFIER_MODEL_VERSION,
+                'model': self.semantic_analyzer_model,
+                'ontology': ontology,
+                'phraselets': {
+                        'labels': [phraselet.label for phraselet in phraselets],
+                        'template_labels': template_labels,
+                        'template_label_ids': numpy.array([template_label_ids[
+                                phraselet.template_label] for phraselet in phraselets],
+                                dtype='<i4').tobytes(),
+                        'parent_words': [phraselet.parent_word for phraselet in phraselets],
+                        'child_words': [phraselet.child_word for phraselet in phraselets],
+                        'created_without_matching_tags': numpy.array([
+                                phraselet.created_without_matching_tags for phraselet in
+                                phraselets], dtype='<i1').tobytes()},
+                'template_docs': template_docs,
+                'sorted_labels': sorted(self.sorted_label_dict.keys(),
+                        key=lambda label: self.sorted_label_dict[label]),
+                'classifications': self.classifications,
+                'overlap_memory_size': self.overlap_memory_size,
+                'oneshot': self.oneshot,
+                'mlp': mlp.to_serializable()}, use_bin_type=True)
+
+    @classmethod
+    def from_bytes(cls, serialized_model, semantic_analyzer, structural_matcher):
+        """Recreates a model from the output of *to_bytes()*. The stored phraselet template
+            sentences are supplied to *semantic_analyzer*. The ontology of *structural_matcher*
+            is reused if it has the same content and settings as the ontology of the model, in
+            which case the stored ontology is not decoded. Otherwise the stored ontology is
+            used, so that the stored dictionaries are never added to a different ontology.
+        """
+        serialized = msgpack.unpackb(serialized_model, raw=False)
+        if serialized['model'] != semantic_analyzer.model:
+            raise WrongModelDeserializationError(serialized['model'])
+        if serialized['version'] != SERIALIZED_SUPERVISED_TOPIC_CLASSIFIER_MODEL_VERSION:
+            raise WrongVersionDeserializationError(serialized['version'])
+        if serialized['ontology'] == None:
+            ontology = None
+        else:
+            if structural_matcher.ontology != None and [
+                    structural_matcher.ontology.content_fingerprint(),
+                    structural_matcher.ontology.symmetric_matching] == \
+                    serialized['ontology']['description']:
+                ontology = structural_matcher.ontology
+            else:
+                ontology = Ontology.from_bytes(serialized['ontology']['ontology'])
+            for word, entries in serialized['ontology']['dictionaries'].items():
+                ontology.add_dictionary_entries(word, entries)
+        for phraselet_template in semantic_analyzer.phraselet_templates:
+            if phraselet_template.label in serialized['template_docs']:
+                semantic_analyzer.add_phraselet_template_doc(phraselet_template,
+                        semantic_analyzer.holmes_doc_from_bytes(
+                        serialized['template_docs'][phraselet_template.label]))
+        phraselets = serialized['phraselets']
+        template_labels = phraselets['template_labels']
+        serialized_phraselets = [SerializedPhraselet(label, template_labels[template_label_id],
+                parent_word, child_word, created_without_matching_tags == 1) for
+                label, template_label_id, parent_word, child_word, created_without_matching_tags
+                in zip(phraselets['labels'], numpy.frombuffer(phraselets['template_label_ids'],
+                dtype='<i4').tolist(), phraselets['parent_words'], phraselets['child_words'],
+                numpy.frombuffer(phraselets['created_without_matching_tags'],
+                dtype='<i1').tolist())]
+        return cls(
+                semantic_analyzer_model = serialized['model'],
+                structural_matcher_ontology = ontology,
+                serialized_phraselets = serialized_phraselets,
+                mlp = MLPWeights.from_serializable(serialized['mlp']),
+                sorted_label_dict = {label: index for index, label in
+                        enumerate(serialized['sorted_labels'])},
+                classifications = serialized['classifications'],
+                overlap_memory_size = serialized['overlap_memory_size'],
+                oneshot = serialized['oneshot'])
+
+class MLPWeights:
+    """The weights of a trained *MLPClassifier* together with the forward pass needed to
+        classify with them, which allows a classifier model to be loaded without an
+        *MLPClassifier* being recreated. Supports the subset of the *MLPClassifier* interface
+        used by *SupervisedTopicClassifier*.
+
+        Parameters:
+
+        activation -- the activation function of the hidden layers as named by *MLPClassifier*.
+        output_activation -- the activation function of the output layer as named by
+            *MLPClassifier*.
+        coefs -- a list containing the weight matrix of each layer after the input layer.
+        intercepts -- a list containing the bias vector of each layer after the input layer.
+    """
+
+    def __init__(self, activation, output_activation, coefs, intercepts):
+        self.activation = activation
+        self.output_activation = output_activation
+        self.coefs = coefs
+        self.intercepts = intercepts
+
+    @classmethod
+    def from_mlp(cls, mlp):
+        return cls(mlp.activation, mlp.out_activation_, mlp.coefs_, mlp.intercepts_)
+
+    def to_serializable(self):
+        return {
+                'activation': self.activation,
+                'output_activation': self.output_activation,
+                'coefs': [[coef.shape[0], coef.shape[1], numpy.asarray(coef,
+                        dtype='<f8').tobytes()] for coef in self.coefs],
+                'intercepts': [numpy.asarray(intercept, dtype='<f8').tobytes() for intercept in
+                        self.intercepts]}
+
+    @classmethod
+    def from_serializable(cls, serializable):
+        return cls(serializable['activation'], serializable['output_activation'],
+                [numpy.frombuffer(values, dtype='<f8').reshape((rows, columns)) for
+                rows, columns, values in serializable['coefs']],
+                [numpy.frombuffer(values, dtype='<f8') for values in serializable['intercepts']])
+
+    def _activate(self, values, activation):
+        if activation == 'identity':
+            return values
+        if activation == 'logistic':
+            return 1.0 / (1.0 + numpy.exp(-values))
+        if activation == 'tanh':
+            return numpy.tanh(values)
+        if activation == 'relu':
+            return numpy.maximum(values, 0)
+        if activation == 'softmax':
+            values = numpy.exp(values - values.max(axis=1, keepdims=True))
+            return values / values.sum(axis=1, keepdims=True)
+        raise ValueError(' '.join(('Unsupported activation function', activation)))
+
+    def predict_proba(self, matrix):
+        """Returns the output layer values for the rows of *matrix*, which may be sparse."""
+        values = matrix
+        for layer_index, (coef, intercept) in enumerate(zip(self.coefs, self.intercepts)):
+            values = self._activate(numpy.asarray(values.dot(coef)) + intercept,
+                    self.output_activation if layer_index == len(self.coefs) - 1 else
+                    self.activation)
+        return values
+
+    def predict(self, matrix):
+        """Returns a matrix in which the predicted classifications for each row of *matrix* are
+            marked with *1*.
+        """
+        probabilities = self.predict_proba(matrix)
+        if self.output_activation == 'softmax':
+            predictions = numpy.zeros(probabilities.shape, dtype=int)
+            predictions[numpy.arange(probabilities.shape[0]), probabilities.argmax(axis=1)] = 1
+            return predictions
+        return (probabilities > 0.5).astype(int)
+
 class SupervisedTopicClassifier:
     """ Classifies new documents based on a pre-trained model."""
 
@@ -1382,6 +1565,7 @@ class SupervisedTopicClassifier:
 
         if self._model == None:
             raise RuntimeError('No model defined')
+        from scipy.sparse import dok_matrix # deferred to avoid the import cost for other uses
         new_document_matrix = dok_matrix((1, len(self._model.sorted_label_dict)))
         if not self._utils.record_matches(structural_matcher=self._structural_matcher,
                 phraselet_labels_to_search_phrases=self._phraselet_labels_to_search_phrases,
@@ -1402,4 +1586,7 @@ class SupervisedTopicClassifier:
                     classification_indexes))
 
     def serialize_model(self):
-        return jsonpickle.encode(self._model)
+        """Returns a compact binary representation of the model that can be loaded using
+            *Manager.deserialize_supervised_topic_classifier()*.
+        """
+        return self._model.to_bytes(self._semantic_analyzer)
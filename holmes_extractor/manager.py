@@ -1,16 +1,85 @@
 import copy
+import hashlib
+import os
 import sys
+import time
 import thinc
 from .errors import *
 from .structural_matching import StructuralMatcher, ThreadsafeContainer
-from .semantics import SemanticAnalyzerFactory
+from .semantics import SemanticAnalyzerFactory, content_hash_shard_index
+from .parse_cache import ParseCache, SentenceMemo
+from .storage import DocumentStore, SnapshotDirectory, SNAPSHOT_LOG_MAGIC
 from .extensive_matching import *
 from .consoles import HolmesConsoles
-from multiprocessing import Process, Queue, Manager as Multiprocessing_manager, cpu_count
+from multiprocessing import Process, Queue, Manager as Multiprocessing_manager, cpu_count, Pool
 from threading import Lock
+from collections import deque
+
+# The semantic analyzer used within each process of the pool created by
+# *Manager.parse_and_register_documents()*
+_ingestion_semantic_analyzer = None
+
+def _initialize_ingestion_process(model, perform_coreference_resolution,
+        coreference_window_size, sentence_memo_size):
+    global _ingestion_semantic_analyzer
+    _ingestion_semantic_analyzer = SemanticAnalyzerFactory().semantic_analyzer(model=model,
+            perform_coreference_resolution=perform_coreference_resolution, debug=False)
+    _ingestion_semantic_analyzer.coreference_window_size = coreference_window_size
+    if sentence_memo_size != None:
+        _ingestion_semantic_analyzer.sentence_memo = SentenceMemo(maximum_size=sentence_memo_size)
+
+def _parse_document_to_bytes(document_text, perform_coreference_resolution):
+    if _ingestion_semantic_analyzer.sentence_memo != None:
+        doc = _ingestion_semantic_analyzer.parse_with_sentence_memo(document_text)
+    else:
+        doc = _ingestion_semantic_analyzer.parse(document_text,
+                perform_coreference_resolution=perform_coreference_resolution)
+    return _ingestion_semantic_analyzer.holmes_doc_to_bytes(doc)
+
+# Dict from content hashes to the labels of the documents registered with them within a
+# *MultiprocessingManager* worker process. Documents with identical content are always sent to
+# the same worker, so that only the workers need to hold this information.
+_worker_content_hashes_to_labels = {}
+
+# The *time.time()* values at which a *MultiprocessingManager* worker process started listening,
+# had finished loading its model and was ready to receive requests.
+_worker_startup_times = None
+
+class _FileContents:
+    """Stands for the contents of the file at *path* among the parts passed to
+        *_content_hash()*. If *as_text* is *True*, the file is read as UTF-8 text, so that the
+        hash is the same as if the text had been passed as a string.
+    """
+
+    def __init__(self, path, *, as_text=False):
+        self.path = path
+        self.as_text = as_text
+
+def _content_hash(*parts):
+    """Returns a hash under which documents with identical content and parsing options are
+        registered so that they can share a single parsed and indexed representation.
+    """
+    content_hash = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, _FileContents):
+            # read in blocks so that the file never has to be held in memory as a whole
+            with open(part.path, 'r' if part.as_text else 'rb',
+                    encoding='utf-8' if part.as_text else None) as file:
+                while True:
+                    block = file.read(1048576)
+                    if len(block) == 0:
+                        break
+                    content_hash.update(block.encode('utf-8') if part.as_text else block)
+        else:
+            if not isinstance(part, bytes):
+                part = str(part).encode('utf-8')
+            content_hash.update(part)
+        content_hash.update(b'\0')
+    return content_hash.hexdigest()
 
 def validate_options(semantic_analyzer, overall_similarity_threshold,
-        embedding_based_matching_on_root_words, perform_coreference_resolution):
+        embedding_based_matching_on_root_words, perform_coreference_resolution,
+        coreference_window_size):
     if overall_similarity_threshold < 0.0 or overall_similarity_threshold > 1.0:
         raise ValueError(
                 'overall_similarity_threshold must be between 0 and 1')
@@ -25,6 +94,12 @@ def validate_options(semantic_analyzer, overall_similarity_threshold,
             semantic_analyzer.model_supports_coreference_resolution():
         raise ValueError(
                 'Model does not support coreference resolution: perform_coreference_resolution may not be True')
+    if coreference_window_size != None:
+        if not perform_coreference_resolution:
+            raise ValueError(
+                    'coreference_window_size may only be set if perform_coreference_resolution is True')
+        if coreference_window_size < 2:
+            raise ValueError('coreference_window_size must be at least 2')
 
 
 class Manager:
@@ -43,18 +118,64 @@ class Manager:
         should be performed depending on whether the model supports it. Defaults to *None*.
     debug -- a boolean value specifying whether debug representations should be outputted
         for parsed sentences. Defaults to *False*.
+    parse_cache_size -- the number of parsed texts to cache in memory so that repeated
+        documents, search phrases and queries do not have to be parsed again, or *None* if
+        there should be no in-memory cache. Defaults to *None*.
+    parse_cache_directory -- a directory in which parsed texts should additionally be cached
+        on disk, or *None* if there should be no on-disk cache. Defaults to *None*.
+    sentence_memo_size -- the number of parsed sentences to retain so that sentences repeated
+        across registered documents, e.g. boilerplate, are only parsed once, or *None* if
+        documents should be parsed as a whole. Documents are then parsed sentence by sentence,
+        which requires *perform_coreference_resolution* to be *False*. Defaults to *None*.
+    coreference_window_size -- the number of sentences in each of the overlapping windows
+        within which coreference is resolved, which caps the cost of coreference resolution
+        on long documents, or *None* if coreference should be resolved over whole documents.
+        Defaults to *None*.
+    document_storage_directory -- a directory in which registered documents should be stored
+        on disk so that only their indexes are held in memory, or *None* if registered
+        documents should be held in memory. Stored documents are materialized when matching
+        requires them. Documents registered with *parse_lazily=True* are not stored. Defaults
+        to *None*.
+    document_memory_budget -- where *document_storage_directory* is set, the maximum total
+        size in bytes of the serialized representations of the stored documents that are held
+        materialized in memory, the least recently used documents being evicted once it is
+        exceeded. Defaults to *None*, which is interpreted as 100 MB.
     """
 
     def __init__(self, model, *, overall_similarity_threshold=1.0,
             embedding_based_matching_on_root_words=False, ontology=None,
-            perform_coreference_resolution=None, debug=False):
+            perform_coreference_resolution=None, debug=False, parse_cache_size=None,
+            parse_cache_directory=None, sentence_memo_size=None, coreference_window_size=None,
+            document_storage_directory=None, document_memory_budget=None):
         self.semantic_analyzer = SemanticAnalyzerFactory().semantic_analyzer(model=model,
                 perform_coreference_resolution=perform_coreference_resolution, debug=debug)
+        if parse_cache_size != None or parse_cache_directory != None:
+            if parse_cache_size == None:
+                parse_cache_size = 1000
+            self.semantic_analyzer.parse_cache = ParseCache(maximum_size=parse_cache_size,
+                    directory=parse_cache_directory)
         if perform_coreference_resolution == None:
             perform_coreference_resolution = \
                     self.semantic_analyzer.model_supports_coreference_resolution()
         validate_options(self.semantic_analyzer, overall_similarity_threshold,
-                embedding_based_matching_on_root_words, perform_coreference_resolution)
+                embedding_based_matching_on_root_words, perform_coreference_resolution,
+                coreference_window_size)
+        self.semantic_analyzer.coreference_window_size = coreference_window_size
+        if sentence_memo_size != None:
+            if perform_coreference_resolution:
+                raise ValueError(
+                        'sentence_memo_size may only be set if perform_coreference_resolution is False')
+            self.semantic_analyzer.sentence_memo = SentenceMemo(maximum_size=sentence_memo_size)
+        if document_storage_directory != None:
+            if document_memory_budget == None:
+                document_memory_budget = 100000000
+            self.document_store = DocumentStore(directory=document_storage_directory,
+                    memory_budget=document_memory_budget)
+        elif document_memory_budget != None:
+            raise ValueError(
+                    'document_memory_budget may only be set if document_storage_directory is set')
+        else:
+            self.document_store = None
         self.ontology = ontology
         self.debug = debug
         self.overall_similarity_threshold = overall_similarity_threshold
@@ -64,17 +185,292 @@ class Manager:
                 overall_similarity_threshold, embedding_based_matching_on_root_words,
                 perform_coreference_resolution)
         self.threadsafe_container = ThreadsafeContainer()
-
-    def parse_and_register_document(self, document_text, label=''):
+        # The directory, snapshot id and log size of the snapshot the registered documents were
+        # last saved to or loaded from, or *None*
+        self._snapshot_state = None
+        self._snapshot_lock = Lock()
+
+    def parse_and_register_document(self, document_text, label='', *,
+            split_oversized_document=False, perform_coreference_resolution=None,
+            parse_lazily=False):
         """Parameters:
 
         document_text -- the raw document text.
         label -- a label for the document which must be unique. Defaults to the empty string,
             which is intended for use cases involving single documents (typically user entries).
+        split_oversized_document -- if *True*, a document text that exceeds the maximum
+            document size is split at paragraph or sentence boundaries into chunks that are
+            parsed separately and joined back together into a single document. If *False*,
+            an oversized document text causes a *DocumentTooBigError*. Defaults to *False*.
+        perform_coreference_resolution -- *False* if coreference resolution should be skipped
+            for this document, or *None* if it should be performed if it was activated when
+            this object was created. Defaults to *None*.
+        parse_lazily -- if *True*, only the spaCy pipeline components other than the dependency
+            parser are run when the document is registered. The dependency parse and the Holmes
+            parse are performed the first time the document contains a word matching the root
+            word of a search phrase or the document is retrieved. Saves time for documents that
+            are rarely matched. May not be combined with *split_oversized_document*. Defaults to
+            *False*.
+
+        A document whose text is identical to that of a document that is already registered is
+        not parsed again, but shares the parsed and indexed representation of the existing
+        document.
         """
 
-        doc = self.semantic_analyzer.parse(document_text)
-        self.register_parsed_document(doc, label)
+        if parse_lazily and split_oversized_document:
+            raise ValueError('parse_lazily may not be combined with split_oversized_document')
+        content_hash = _content_hash('text', perform_coreference_resolution,
+                split_oversized_document, document_text)
+        if self.threadsafe_container.register_duplicate_document(label, content_hash) != None:
+            return
+        if parse_lazily:
+            indexed_document = self.structural_matcher.index_document_lazily(
+                    self.semantic_analyzer.lazy_spacy_parse(document_text),
+                    perform_coreference_resolution=perform_coreference_resolution)
+            self.threadsafe_container.register_document(indexed_document, label, content_hash)
+            return
+        if self.semantic_analyzer.sentence_memo != None:
+            doc = self.semantic_analyzer.parse_with_sentence_memo(document_text,
+                    allow_oversized_document=split_oversized_document)
+        elif split_oversized_document:
+            doc = self.semantic_analyzer.parse_in_chunks(document_text,
+                    perform_coreference_resolution=perform_coreference_resolution)
+        else:
+            doc = self.semantic_analyzer.parse(document_text,
+                    perform_coreference_resolution=perform_coreference_resolution)
+        indexed_document = self.structural_matcher.index_document(doc)
+        self._register_indexed_document(indexed_document, label, content_hash)
+
+    def parse_and_register_documents(self, documents, *, batch_size=50, verbose=False,
+            perform_coreference_resolution=None, number_of_processes=None,
+            maximum_documents_in_flight=None, progress_callback=None, parse_lazily=False):
+        """Parses and registers a number of documents, passing them to spaCy in batches using
+            *nlp.pipe()*, which is considerably faster than parsing them one at a time, or
+            parsing them in a pool of processes. Returns a dictionary describing the throughput
+            achieved.
+
+        Parameters:
+
+        documents -- an iterable of *(label, document_text)* tuples or a dictionary from labels
+            to document texts. Labels must be unique.
+        batch_size -- the number of documents spaCy should buffer and process together. Has no
+            effect if a sentence memo is configured, in which case each document is parsed
+            sentence by sentence. Defaults to *50*.
+        verbose -- if *True*, the throughput is outputted to the console. Defaults to *False*.
+        perform_coreference_resolution -- *False* if coreference resolution should be skipped
+            for these documents, e.g. for bulk archives, or *None* if it should be performed if
+            it was activated when this object was created. Defaults to *None*.
+        number_of_processes -- the number of processes that should parse the documents, or
+            *None* if the documents should be parsed within the calling process. The processes
+            return serialized documents that are deserialized and registered within the calling
+            process. Each process loads its own copy of the model. Defaults to *None*.
+        maximum_documents_in_flight -- where *number_of_processes* is set, the maximum number
+            of documents that may have been submitted to the processes but not yet registered,
+            which keeps memory consumption flat for large numbers of documents. Defaults to
+            four times *number_of_processes*.
+        progress_callback -- a function that is called after each document has been registered
+            with the number of documents and the number of tokens registered so far, or *None*.
+            Defaults to *None*.
+        parse_lazily -- if *True*, the dependency parse and the Holmes parse of each document
+            are deferred as described for *parse_and_register_document()*. May not be combined
+            with *number_of_processes*. Defaults to *False*.
+
+        Documents whose texts are identical to one another or to documents that are already
+        registered are only parsed once and share a single parsed and indexed representation.
+        """
+
+        # Dict from content hashes to labels of documents that are to share the representation of
+        # a document with the same content once that document has been registered
+        labels_awaiting_registration = {}
+        # Content hashes of documents that have already been registered
+        registered_content_hashes = deque()
+        labels_to_content_hashes = {}
+        # Labels of the documents supplied to this call so far
+        labels_in_batch = set()
+
+        def texts_and_labels():
+            for label, document_text in documents:
+                if label in labels_in_batch or \
+                        label in self.threadsafe_container.document_labels():
+                    raise DuplicateDocumentError(label)
+                labels_in_batch.add(label)
+                content_hash = _content_hash('text', perform_coreference_resolution, False,
+                        document_text)
+                if content_hash in labels_awaiting_registration:
+                    labels_awaiting_registration[content_hash].append(label)
+                    if self.threadsafe_container.contains_content_hash(content_hash):
+                        registered_content_hashes.append(content_hash)
+                    continue
+                labels_awaiting_registration[content_hash] = []
+                if self.threadsafe_container.contains_content_hash(content_hash):
+                    labels_awaiting_registration[content_hash].append(label)
+                    registered_content_hashes.append(content_hash)
+                    continue
+                labels_to_content_hashes[label] = content_hash
+                yield document_text, label
+
+        def register_duplicate_documents(content_hash):
+            nonlocal number_of_documents, number_of_tokens
+            for label in labels_awaiting_registration[content_hash]:
+                number_of_documents += 1
+                number_of_tokens += self.threadsafe_container.register_duplicate_document(label,
+                        content_hash).number_of_tokens
+                if progress_callback != None:
+                    progress_callback(number_of_documents, number_of_tokens)
+            labels_awaiting_registration[content_hash] = []
+
+        def docs_and_labels_using_sentence_memo():
+            for document_text, label in texts_and_labels():
+                yield self.semantic_analyzer.parse_with_sentence_memo(document_text), label
+
+        if isinstance(documents, dict):
+            documents = documents.items()
+        if parse_lazily and number_of_processes != None:
+            raise ValueError('parse_lazily may not be combined with number_of_processes')
+        if parse_lazily:
+            docs_and_labels = self.semantic_analyzer.lazy_spacy_parse_documents(
+                    texts_and_labels(), batch_size=batch_size)
+        elif number_of_processes != None:
+            if number_of_processes < 1:
+                raise ValueError('number_of_processes must be at least 1')
+            if maximum_documents_in_flight == None:
+                maximum_documents_in_flight = 4 * number_of_processes
+            docs_and_labels = self._parse_documents_in_processes(texts_and_labels(),
+                    number_of_processes=number_of_processes,
+                    maximum_documents_in_flight=maximum_documents_in_flight,
+                    perform_coreference_resolution=perform_coreference_resolution)
+        elif self.semantic_analyzer.sentence_memo != None:
+            docs_and_labels = docs_and_labels_using_sentence_memo()
+        else:
+            docs_and_labels = self.semantic_analyzer.parse_documents(texts_and_labels(),
+                    batch_size=batch_size,
+                    perform_coreference_resolution=perform_coreference_resolution)
+        number_of_documents = 0
+        number_of_tokens = 0
+        start_time = time.perf_counter()
+        try:
+            for doc, label in docs_and_labels:
+                content_hash = labels_to_content_hashes.pop(label)
+                if parse_lazily:
+                    self.threadsafe_container.register_document(
+                            self.structural_matcher.index_document_lazily(doc,
+                            perform_coreference_resolution=perform_coreference_resolution),
+                            label, content_hash)
+                else:
+                    self._register_indexed_document(self.structural_matcher.index_document(doc),
+                            label, content_hash)
+                number_of_documents += 1
+                number_of_tokens += len(doc)
+                if progress_callback != None:
+                    progress_callback(number_of_documents, number_of_tokens)
+                registered_content_hashes.append(content_hash)
+                while len(registered_content_hashes) > 0:
+                    register_duplicate_documents(registered_content_hashes.popleft())
+            while len(registered_content_hashes) > 0:
+                register_duplicate_documents(registered_content_hashes.popleft())
+        finally:
+            docs_and_labels.close() # terminates any process pool
+        return self._throughput('Parsed and registered', number_of_documents, number_of_tokens,
+                time.perf_counter() - start_time, verbose)
+
+    def _throughput(self, activity, number_of_documents, number_of_tokens, seconds, verbose):
+        """Returns a dictionary describing the throughput achieved when registering documents,
+            outputting it to the console if *verbose* is *True*.
+        """
+        throughput = {
+                'documents': number_of_documents,
+                'tokens': number_of_tokens,
+                'seconds': seconds,
+                'documents_per_second': number_of_documents / seconds if seconds > 0 else 0.0,
+                'tokens_per_second': number_of_tokens / seconds if seconds > 0 else 0.0}
+        if verbose:
+            print(''.join((activity, ' ', str(number_of_documents), ' documents (',
+                    str(number_of_tokens), ' tokens) in ', '{:.2f}'.format(seconds),
+                    ' seconds: ', '{:.1f}'.format(throughput['documents_per_second']),
+                    ' documents/sec, ', '{:.1f}'.format(throughput['tokens_per_second']),
+                    ' tokens/sec')))
+        return throughput
+
+    def import_and_register_documents(self, paths, *, verbose=False,
+            perform_coreference_resolution=None):
+        """Registers documents that have already been tokenized, tagged and parsed elsewhere,
+            e.g. by a shared NLP service, so that the spaCy pipeline is not run and only the
+            Holmes parse and indexing are performed. The tags and dependency labels must follow
+            the scheme of the model with which this object was created. Returns a dictionary
+            describing the throughput achieved.
+
+        Parameters:
+
+        paths -- an iterable of paths of files each containing either text in the CoNLL-U
+            format, if the file name ends in *.conllu*, or otherwise a single spaCy document
+            serialized using *Doc.to_bytes()*. A document within a CoNLL-U file is labelled
+            with the id from its *# newdoc id = ...* comment if there is one. Other documents
+            are labelled with the file name without its extension, followed by an underscore
+            and the number of the document within the file if the file contains several
+            documents. Labels must be unique.
+        verbose -- if *True*, the throughput is outputted to the console.
+        perform_coreference_resolution -- *False* if coreference resolution should be skipped
+            for these documents, or *None* if it should be performed if it was activated when
+            this object was created. Defaults to *None*.
+        """
+
+        def docs_and_labels():
+            for path in paths:
+                file_label = os.path.splitext(os.path.basename(path))[0]
+                if path.endswith('.conllu'):
+                    with open(path, encoding='utf-8') as file:
+                        ids_and_docs = list(self.semantic_analyzer.spacy_docs_from_conllu(
+                                file.read()))
+                    for counter, (document_id, doc) in enumerate(ids_and_docs, start=1):
+                        if document_id != None:
+                            yield doc, document_id
+                        elif len(ids_and_docs) == 1:
+                            yield doc, file_label
+                        else:
+                            yield doc, '_'.join((file_label, str(counter)))
+                else:
+                    with open(path, 'rb') as file:
+                        yield self.semantic_analyzer.spacy_doc_from_bytes(file.read()), \
+                                file_label
+
+        number_of_documents = 0
+        number_of_tokens = 0
+        start_time = time.perf_counter()
+        for spacy_doc, label in docs_and_labels():
+            if label in self.threadsafe_container.document_labels():
+                raise DuplicateDocumentError(label)
+            doc = self.semantic_analyzer.holmes_parse_external_doc(spacy_doc,
+                    perform_coreference_resolution=perform_coreference_resolution)
+            self.register_parsed_document(doc, label)
+            number_of_documents += 1
+            number_of_tokens += len(doc)
+        return self._throughput('Imported and registered', number_of_documents,
+                number_of_tokens, time.perf_counter() - start_time, verbose)
+
+    def _parse_documents_in_processes(self, texts_and_labels, *, number_of_processes,
+            maximum_documents_in_flight, perform_coreference_resolution):
+        """Parses documents in a pool of processes, yielding *(doc, label)* tuples in the
+            order in which the documents were supplied. No more than
+            *maximum_documents_in_flight* documents are submitted to the pool before the oldest
+            submitted document has been returned.
+        """
+        sentence_memo_size = self.semantic_analyzer.sentence_memo.maximum_size if \
+                self.semantic_analyzer.sentence_memo != None else None
+        documents_in_flight = deque()
+        with Pool(number_of_processes, _initialize_ingestion_process, (
+                self.semantic_analyzer.model, self.perform_coreference_resolution,
+                self.semantic_analyzer.coreference_window_size, sentence_memo_size)) as pool:
+            for document_text, label in texts_and_labels:
+                if len(documents_in_flight) >= maximum_documents_in_flight:
+                    oldest_label, oldest_result = documents_in_flight.popleft()
+                    yield self.semantic_analyzer.holmes_doc_from_bytes(oldest_result.get()), \
+                            oldest_label
+                documents_in_flight.append((label, pool.apply_async(_parse_document_to_bytes,
+                        (document_text, perform_coreference_resolution))))
+            while len(documents_in_flight) > 0:
+                oldest_label, oldest_result = documents_in_flight.popleft()
+                yield self.semantic_analyzer.holmes_doc_from_bytes(oldest_result.get()), \
+                        oldest_label
 
     def register_parsed_document(self, doc, label=''):
         """Parameters:
@@ -84,7 +480,13 @@ class Manager:
             which is intended for use cases involving single documents (typically user entries).
         """
         indexed_document = self.structural_matcher.index_document(doc)
-        self.threadsafe_container.register_document(indexed_document, label)
+        self._register_indexed_document(indexed_document, label)
+
+    def _register_indexed_document(self, indexed_document, label, content_hash=None):
+        if self.document_store != None:
+            indexed_document = self.structural_matcher.store_indexed_document(indexed_document,
+                    self.document_store)
+        self.threadsafe_container.register_document(indexed_document, label, content_hash)
 
     def deserialize_and_register_document(self, document, label=''):
         """Parameters:
@@ -93,12 +495,14 @@ class Manager:
         label -- a label for the document which must be unique. Defaults to the empty string,
             which is intended for use cases involving single documents (typically user entries).
         """
-        if self.perform_coreference_resolution:
-            raise SerializationNotSupportedError(self.semantic_analyzer.model)
-        doc = self.semantic_analyzer.from_serialized_string(document)
+        content_hash = _content_hash('serialized', document)
+        if self.threadsafe_container.register_duplicate_document(label, content_hash) != None:
+            return
+        doc, serialized_index = self.semantic_analyzer.from_serialized_string_with_index(
+                document)
         self.semantic_analyzer.debug_structures(doc) # only has effect when debug=True
-        indexed_document = self.structural_matcher.index_document(doc)
-        self.threadsafe_container.register_document(indexed_document, label)
+        indexed_document = self.structural_matcher.reindex_document(doc, serialized_index)
+        self._register_indexed_document(indexed_document, label, content_hash)
 
     def remove_document(self, label):
         """Parameters:
@@ -114,24 +518,202 @@ class Manager:
         """Returns a list of the labels of the currently registered documents."""
         return self.threadsafe_container.document_labels()
 
-    def serialize_document(self, label):
-        """Returns a serialized representation of a Holmes document that can be persisted to
-            a file. If *label* is not the label of a registered document, *None* is returned
-            instead.
+    def serialize_document(self, label, *, compress=False):
+        """Returns a binary serialized representation of a Holmes document that can be
+            persisted to a file. If *label* is not the label of a registered document, *None* is
+            returned instead.
 
         Parameters:
 
         label -- the label of the document to be serialized.
+        compress -- if *True*, the representation is compressed using *zlib*, which makes it
+            several times smaller at the cost of some extra time. Defaults to *False*.
         """
-
-        if self.perform_coreference_resolution:
-            raise SerializationNotSupportedError(self.semantic_analyzer.model)
-        doc = self.threadsafe_container.get_document(label)
-        if doc != None:
-            return self.semantic_analyzer.to_serialized_string(doc)
+        indexed_document = self.threadsafe_container.get_indexed_document(label)
+        if indexed_document != None:
+            return self.semantic_analyzer.to_serialized_string(indexed_document.doc,
+                    compress=compress,
+                    index=self.structural_matcher.serializable_index(indexed_document))
         else:
             return None
 
+    def save_corpus(self, path):
+        """Writes all registered documents into a single bundle file that can be loaded using
+            *load_corpus()*, either by this class or by *MultiprocessingManager*. The strings
+            used by the documents are stored once for the whole bundle, and documents whose
+            labels share a single representation are stored once. The content hashes of the
+            documents are stored with them, so that documents registered after the bundle has
+            been loaded whose content is identical to that of a loaded document share it.
+
+        Parameters:
+
+        path -- the path of the bundle file.
+        """
+        content_hashes = self.threadsafe_container.get_content_hashes()
+        self.semantic_analyzer.write_corpus_bundle(path, ((label, indexed_document.doc,
+                self.structural_matcher.serializable_index(indexed_document),
+                content_hashes.get(label)) for label, indexed_document in
+                self.threadsafe_container.get_indexed_documents().items()))
+
+    def load_corpus(self, path):
+        """Registers the documents in a bundle file written using *save_corpus()*. The file is
+            memory-mapped, so that documents are decoded from it without it having to be read
+            into memory as a whole. Raises a *WrongModelDeserializationError* if the bundle was
+            written using a different model from the one used by this object.
+
+        Parameters:
+
+        path -- the path of the bundle file.
+        """
+        for labels, doc, serialized_index, content_hash in \
+                self.semantic_analyzer.read_corpus_bundle(path):
+            if content_hash == None: # not stored, e.g. by an earlier version
+                content_hash = _content_hash('bundle', os.path.abspath(path), labels[0])
+            if self.threadsafe_container.register_duplicate_document(labels[0],
+                    content_hash) == None:
+                indexed_document = self.structural_matcher.reindex_document(doc,
+                        serialized_index)
+                self._register_indexed_document(indexed_document, labels[0], content_hash)
+            for label in labels[1:]:
+                self.threadsafe_container.register_duplicate_document(label, content_hash)
+
+    def save_snapshot(self, directory, *, compact=False):
+        """Persists the registered documents to a snapshot directory from which they can be
+            restored using *load_snapshot()*. The first snapshot this object saves to a
+            directory writes all registered documents into a base corpus bundle. Subsequent
+            snapshots only append the documents registered and the labels removed since the
+            previous snapshot to a log, so that they take time proportional to the changes
+            rather than to the size of the corpus. A new base bundle replacing the log is
+            written if *compact* is *True*, if the log has grown larger than the base bundle,
+            or if the snapshot has been modified by another object in the meantime.
+
+        Parameters:
+
+        directory -- the snapshot directory, which is created if it does not exist.
+        compact -- if *True*, a new base bundle is written regardless of the size of the log.
+            Defaults to *False*.
+        """
+        snapshot_directory = SnapshotDirectory(directory)
+        with self._snapshot_lock:
+            snapshot_id = snapshot_directory.current_id()
+            if not compact and snapshot_id != None and self._snapshot_state == (
+                    snapshot_directory.directory, snapshot_id,
+                    os.path.getsize(snapshot_directory.log_path(snapshot_id))) and \
+                    self._snapshot_state[2] <= os.path.getsize(
+                    snapshot_directory.base_path(snapshot_id)):
+                self._append_to_snapshot(snapshot_directory, snapshot_id)
+            else:
+                self._write_snapshot_base(snapshot_directory)
+
+    def _write_snapshot_base(self, snapshot_directory):
+        self._snapshot_state = None
+        snapshot_id = snapshot_directory.new_id()
+        # changes made while the base bundle is being written are recorded for the log
+        self.threadsafe_container.track_changes()
+        self.save_corpus(snapshot_directory.base_path(snapshot_id))
+        log_size = snapshot_directory.make_current(snapshot_id)
+        self._snapshot_state = (snapshot_directory.directory, snapshot_id, log_size)
+
+    def _append_to_snapshot(self, snapshot_directory, snapshot_id):
+        changed_labels = self.threadsafe_container.take_changed_labels()
+        try:
+            removed_labels = []
+            # Dict from indexed document object ids to the indexed documents and the changed
+            # labels they are registered under, so that shared documents are written once
+            ids_to_documents = {}
+            for label in sorted(changed_labels):
+                indexed_document = self.threadsafe_container.get_indexed_document(label)
+                if indexed_document == None:
+                    removed_labels.append(label)
+                else:
+                    ids_to_documents.setdefault(id(indexed_document),
+                            (indexed_document, []))[1].append(label)
+            if len(removed_labels) == 0 and len(ids_to_documents) == 0:
+                return
+            log_size = snapshot_directory.append(snapshot_id, {
+                    'removed': removed_labels,
+                    'documents': [[labels, self.semantic_analyzer.holmes_doc_to_bytes(
+                            indexed_document.doc,
+                            index=self.structural_matcher.serializable_index(indexed_document))]
+                            for indexed_document, labels in ids_to_documents.values()]})
+        except:
+            self.threadsafe_container.restore_changed_labels(changed_labels)
+            raise
+        self._snapshot_state = (snapshot_directory.directory, snapshot_id, log_size)
+
+    def load_snapshot(self, directory):
+        """Registers the documents persisted to a snapshot directory using *save_snapshot()*
+            by loading the base corpus bundle and replaying the log of changes made since it
+            was written. Subsequent calls to *save_snapshot()* for the same directory append to
+            the log. Raises a *WrongModelDeserializationError* if the snapshot was written using
+            a different model from the one used by this object.
+
+        Parameters:
+
+        directory -- the snapshot directory.
+        """
+        snapshot_directory = SnapshotDirectory(directory)
+        with self._snapshot_lock:
+            snapshot_id = snapshot_directory.current_id()
+            if snapshot_id == None:
+                raise ValueError(' '.join((snapshot_directory.directory,
+                        'does not contain a Holmes snapshot')))
+            # documents registered before the snapshot is loaded are not part of it
+            labels_before = list(self.threadsafe_container.document_labels())
+            self.load_corpus(snapshot_directory.base_path(snapshot_id))
+            log_path = snapshot_directory.log_path(snapshot_id)
+            log_size = len(SNAPSHOT_LOG_MAGIC)
+            for record, end_offset in snapshot_directory.records(snapshot_id):
+                for label in record['removed']:
+                    if self.threadsafe_container.get_indexed_document(label) != None:
+                        self.threadsafe_container.remove_document(label)
+                for labels, serialized_doc in record['documents']:
+                    for label in labels:
+                        if self.threadsafe_container.get_indexed_document(label) != None:
+                            self.threadsafe_container.remove_document(label)
+                    doc, serialized_index = \
+                            self.semantic_analyzer.holmes_doc_and_index_from_bytes(
+                            serialized_doc)
+                    content_hash = _content_hash('snapshot', log_path, end_offset, labels[0])
+                    indexed_document = self.structural_matcher.reindex_document(doc,
+                            serialized_index)
+                    self._register_indexed_document(indexed_document, labels[0], content_hash)
+                    for label in labels[1:]:
+                        self.threadsafe_container.register_duplicate_document(label,
+                                content_hash)
+                log_size = end_offset
+            self.threadsafe_container.track_changes(labels_before)
+            if log_size == os.path.getsize(log_path):
+                self._snapshot_state = (snapshot_directory.directory, snapshot_id, log_size)
+            else: # an incomplete record at the end of the log is replaced by a new base bundle
+                self._snapshot_state = None
+
+    def document_store_statistics(self):
+        """Returns a dictionary containing the number of stored documents held materialized in
+            memory, the total size of their serialized representations, and the numbers of hits
+            and of loads from disk, or *None* if no *document_storage_directory* was configured.
+        """
+        if self.document_store == None:
+            return None
+        return self.document_store.statistics()
+
+    def parse_cache_statistics(self):
+        """Returns a dictionary containing the number of entries held in the in-memory parse
+            cache and the numbers of memory hits, disk hits and misses, or *None* if no parse cache
+            was configured.
+        """
+        if self.semantic_analyzer.parse_cache == None:
+            return None
+        return self.semantic_analyzer.parse_cache.statistics()
+
+    def sentence_memo_statistics(self):
+        """Returns a dictionary containing the number of sentences held in the sentence memo
+            and the numbers of hits and misses, or *None* if no sentence memo was configured.
+        """
+        if self.semantic_analyzer.sentence_memo == None:
+            return None
+        return self.semantic_analyzer.sentence_memo.statistics()
+
     def register_search_phrase(self, search_phrase_text, label=None):
         """Parameters:
 
@@ -146,6 +728,28 @@ class Manager:
                 search_phrase_doc, label, None, False)
         self.threadsafe_container.register_search_phrase(search_phrase)
 
+    def serialize_search_phrases(self):
+        """Returns a compact byte representation of the registered search phrases that can be
+            persisted to a file and registered with *deserialize_and_register_search_phrases()*,
+            e.g. when an application starts up, without the search phrases having to be parsed
+            again.
+        """
+        return self.structural_matcher.serialize_search_phrases(
+                self.threadsafe_container.get_search_phrases())
+
+    def deserialize_and_register_search_phrases(self, serialized_search_phrases):
+        """Registers search phrases serialized using *serialize_search_phrases()*. Raises a
+            *WrongModelDeserializationError* if the search phrases were serialized using a
+            different model or model version from the one used by this object.
+
+        Parameters:
+
+        serialized_search_phrases -- the output of *serialize_search_phrases()*.
+        """
+        for search_phrase in self.structural_matcher.deserialize_search_phrases(
+                serialized_search_phrases):
+            self.threadsafe_container.register_search_phrase(search_phrase)
+
     def remove_all_search_phrases(self):
         self.threadsafe_container.remove_all_search_phrases()
 
@@ -167,7 +771,8 @@ class Manager:
                 compare_embeddings_on_root_words = False,
                 compare_embeddings_on_non_root_words = True,
                 document_labels_to_indexes_for_reverse_matching_sets = None,
-                document_labels_to_indexes_for_embedding_reverse_matching_sets = None)
+                document_labels_to_indexes_for_embedding_reverse_matching_sets = None,
+                corpus_index = self.threadsafe_container)
 
     def _build_match_dictionaries(self, matches):
         """Builds and returns a list of dictionaries describing matches."""
@@ -249,7 +854,8 @@ class Manager:
                         compare_embeddings_on_root_words = False,
                         compare_embeddings_on_non_root_words = True,
                         document_labels_to_indexes_for_reverse_matching_sets = None,
-                        document_labels_to_indexes_for_embedding_reverse_matching_sets = None)
+                        document_labels_to_indexes_for_embedding_reverse_matching_sets = None,
+                        corpus_index = self.threadsafe_container)
         return self._build_match_dictionaries(matches)
 
     def topic_match_documents_against(self, text_to_match, *, maximum_activation_distance=75,
@@ -299,6 +905,7 @@ class Manager:
         topic_matcher = TopicMatcher(semantic_analyzer = self.semantic_analyzer,
                 structural_matcher = self.structural_matcher,
                 indexed_documents = self.threadsafe_container.get_indexed_documents(),
+                corpus_index = self.threadsafe_container,
                 maximum_activation_distance=maximum_activation_distance,
                 relation_score=relation_score,
                 reverse_only_relation_score=reverse_only_relation_score,
@@ -365,6 +972,7 @@ class Manager:
         topic_matcher = TopicMatcher(semantic_analyzer = self.semantic_analyzer,
                 structural_matcher = self.structural_matcher,
                 indexed_documents = self.threadsafe_container.get_indexed_documents(),
+                corpus_index = self.threadsafe_container,
                 maximum_activation_distance=maximum_activation_distance,
                 relation_score=relation_score,
                 reverse_only_relation_score=reverse_only_relation_score,
@@ -409,11 +1017,17 @@ class Manager:
 
             Parameters:
 
-            serialized_model -- the pre-trained model, which will correspond to a
-                'SupervisedTopicClassifierModel' instance.
+            serialized_model -- the pre-trained model as returned by
+                'SupervisedTopicClassifier.serialize_model()'. Models serialized as strings by
+                earlier versions can still be loaded.
             verbose -- if 'True', information about matching is outputted to the console.
         """
-        model = jsonpickle.decode(serialized_model)
+        if isinstance(serialized_model, str):
+            import jsonpickle # deferred to avoid the import cost for other uses
+            model = jsonpickle.decode(serialized_model)
+        else:
+            model = SupervisedTopicClassifierModel.from_bytes(serialized_model,
+                    self.semantic_analyzer, self.structural_matcher)
         return SupervisedTopicClassifier(self.semantic_analyzer,
                 self.structural_matcher,
                 model, verbose)
@@ -479,34 +1093,39 @@ class MultiprocessingManager:
         console. Defaults to *True*
     number_of_workers -- the number of worker processes to use, or *None* if the number of worker
         processes should depend on the number of available cores. Defaults to *None*
+    coreference_window_size -- the number of sentences in each of the overlapping windows
+        within which coreference is resolved, or *None* if coreference should be resolved over
+        whole documents. Defaults to *None*.
     """
     def __init__(self, model, *, overall_similarity_threshold=1.0,
             embedding_based_matching_on_root_words=False, ontology=None,
             perform_coreference_resolution=None, debug=False, verbose=True,
-            number_of_workers=None):
+            number_of_workers=None, coreference_window_size=None):
         self.semantic_analyzer = SemanticAnalyzerFactory().semantic_analyzer(model=model,
                 perform_coreference_resolution=perform_coreference_resolution, debug=debug)
         if perform_coreference_resolution == None:
             perform_coreference_resolution = \
                     self.semantic_analyzer.model_supports_coreference_resolution()
         validate_options(self.semantic_analyzer, overall_similarity_threshold,
-                embedding_based_matching_on_root_words, perform_coreference_resolution)
+                embedding_based_matching_on_root_words, perform_coreference_resolution,
+                coreference_window_size)
+        self.semantic_analyzer.coreference_window_size = coreference_window_size
         self.structural_matcher = StructuralMatcher(self.semantic_analyzer, ontology,
                 overall_similarity_threshold, embedding_based_matching_on_root_words,
                 perform_coreference_resolution)
         self._perform_coreference_resolution = perform_coreference_resolution
 
         self._verbose = verbose
-        self._document_labels = []
+        self._document_labels = set()
         self._input_queues = []
         if number_of_workers == None:
             number_of_workers = cpu_count()
         self._number_of_workers = number_of_workers
-        self._next_worker_to_use = 0
         self._multiprocessor_manager = Multiprocessing_manager()
         self._worker = Worker() # will be copied to worker processes by value (Windows) or
                                 # by reference (Linux)
         self._workers = []
+        self._worker_creation_time = time.time()
         for counter in range(0, self._number_of_workers):
             input_queue = Queue()
             self._input_queues.append(input_queue)
@@ -522,7 +1141,7 @@ class MultiprocessingManager:
             if label in self._document_labels:
                 raise DuplicateDocumentError(label)
             else:
-                self._document_labels.append(label)
+                self._document_labels.add(label)
 
     def _handle_reply(self, worker_label, return_value):
         """ If 'return_value' is an exception, return it, otherwise return 'None'. """
@@ -536,44 +1155,171 @@ class MultiprocessingManager:
                     print(': '.join((worker_label, return_value)))
             return None
 
-    def _internal_register_documents(self, dict, worker_method):
+    def _internal_register_documents(self, documents, worker_method, content_hash_parts,
+            *additional_args, maximum_documents_in_flight=None):
+        """Sends documents to the workers. *documents* is a dictionary from labels to
+            values or an iterable of *(label, value)* tuples that is consumed as the documents
+            are sent, no more than *maximum_documents_in_flight* documents awaiting registration
+            at any one time. Each document is sent to the worker determined by the hash of the
+            parts returned by *content_hash_parts* for its value, so that documents with
+            identical content reach the same worker, which registers them with a single shared
+            representation. Where the values are file paths, the parts include the contents of
+            the files, which are read in blocks to calculate the hash. Apart from the documents
+            in flight, this process only holds the set of document labels.
+        """
+        if isinstance(documents, dict):
+            documents = documents.items()
+        if maximum_documents_in_flight == None:
+            maximum_documents_in_flight = 4 * self._number_of_workers
         reply_queue = self._multiprocessor_manager.Queue()
-        for label, value in dict.items():
-            self._add_document_label(label)
-            with(self._lock):
-                self._input_queues[self._next_worker_to_use].put\
-                        ((worker_method, (value, label), reply_queue))
-                self._next_worker_to_use += 1
-                if self._next_worker_to_use == self._number_of_workers:
-                    self._next_worker_to_use = 0
-        for _ in range(0, len(dict)):
+        number_of_documents_in_flight = 0
+
+        def await_reply():
             possible_exception = self._handle_reply(*reply_queue.get())
             if possible_exception != None:
                 self.close()
 
-    def parse_and_register_documents(self, document_dictionary):
+        for label, value in documents:
+            if number_of_documents_in_flight >= maximum_documents_in_flight:
+                await_reply()
+                number_of_documents_in_flight -= 1
+            self._add_document_label(label)
+            content_hash = _content_hash(*content_hash_parts(value))
+            self._input_queues[content_hash_shard_index(content_hash,
+                    self._number_of_workers)].put((
+                    self._worker.worker_register_document_once,
+                    (worker_method, content_hash, value, label) + additional_args,
+                    reply_queue))
+            number_of_documents_in_flight += 1
+        for _ in range(0, number_of_documents_in_flight):
+            await_reply()
+
+    def _labels_and_paths(self, directory):
+        """Returns a list of *(label, path)* tuples for the files within *directory*, each file
+            being labelled with its name without its extension.
+        """
+        return [(os.path.splitext(file_name)[0], os.sep.join((directory, file_name))) for
+                file_name in sorted(os.listdir(directory)) if
+                os.path.isfile(os.sep.join((directory, file_name)))]
+
+    def parse_and_register_documents(self, documents, *, perform_coreference_resolution=None,
+            maximum_documents_in_flight=None):
         """Parameters:
 
-        document_dictionary -- a dictionary from unique document labels to raw document texts.
+        documents -- a dictionary from unique document labels to raw document texts, an
+            iterable of *(label, document_text)* tuples, which is consumed as the documents are
+            sent to the worker processes, or the path of a directory containing UTF-8 text
+            files. Each file is labelled with its name without its extension and is read by
+            the worker process that parses it, so that only its path is passed between
+            processes. This process reads each file in blocks to calculate the hash of its
+            contents, so that files with identical contents share a single representation.
+        perform_coreference_resolution -- *False* if coreference resolution should be skipped
+            for these documents, or *None* if it should be performed if it was activated when
+            this object was created. Defaults to *None*.
+        maximum_documents_in_flight -- the maximum number of documents that have been sent to
+            the worker processes but not yet registered, or *None* for four times the number of
+            worker processes. Limits the memory used while documents are supplied from an
+            iterable. Defaults to *None*.
         """
-        self._internal_register_documents(document_dictionary,
-                self._worker.worker_parse_and_register_document)
-
-    def deserialize_and_register_documents(self, serialized_document_dictionary):
+        # the hashes are calculated as by *Manager*, so that a text supplied directly and a file
+        # holding the same text share a single representation
+        if isinstance(documents, str):
+            self._internal_register_documents(self._labels_and_paths(documents),
+                    self._worker.worker_parse_and_register_document_file,
+                    lambda path: ('text', perform_coreference_resolution, False,
+                    _FileContents(path, as_text=True)), perform_coreference_resolution,
+                    maximum_documents_in_flight=maximum_documents_in_flight)
+        else:
+            self._internal_register_documents(documents,
+                    self._worker.worker_parse_and_register_document,
+                    lambda document_text: ('text', perform_coreference_resolution, False,
+                    document_text), perform_coreference_resolution,
+                    maximum_documents_in_flight=maximum_documents_in_flight)
+
+    def deserialize_and_register_documents(self, serialized_documents, *,
+            maximum_documents_in_flight=None):
         """Parameters:
 
-        serialized_document_dictionary -- a dictionary from unique document labels to
-        documents serialized using the *Manager.serialize_document()* method.
+        serialized_documents -- a dictionary from unique document labels to documents
+            serialized using the *Manager.serialize_document()* method, an iterable of
+            *(label, serialized_document)* tuples, which is consumed as the documents are sent
+            to the worker processes, or a path. A path may either be that of a directory
+            containing files each holding a serialized document or that of a bundle file
+            written using *Manager.save_corpus()*, which is then loaded as described for
+            *load_corpus()*. Each file within a directory is labelled with its name without
+            its extension and is read by the worker process that registers it, so that only
+            its path is passed between processes. This process reads each file in blocks to
+            calculate the hash of its contents, so that files with identical contents share a
+            single representation.
+        maximum_documents_in_flight -- the maximum number of documents that have been sent to
+            the worker processes but not yet registered, or *None* for four times the number of
+            worker processes. Defaults to *None*.
         """
-        if self._perform_coreference_resolution:
-            raise SerializationNotSupportedError(self.semantic_analyzer.model)
-        self._internal_register_documents(serialized_document_dictionary,
-                self._worker.worker_deserialize_and_register_document)
+        if isinstance(serialized_documents, str):
+            if os.path.isdir(serialized_documents):
+                self._internal_register_documents(self._labels_and_paths(serialized_documents),
+                        self._worker.worker_deserialize_and_register_document_file,
+                        lambda path: ('serialized', _FileContents(path)),
+                        maximum_documents_in_flight=maximum_documents_in_flight)
+            else:
+                self.load_corpus(serialized_documents)
+        else:
+            self._internal_register_documents(serialized_documents,
+                    self._worker.worker_deserialize_and_register_document,
+                    lambda document: ('serialized', document),
+                    maximum_documents_in_flight=maximum_documents_in_flight)
+
+    def load_corpus(self, path):
+        """Registers the documents in a bundle file written using *Manager.save_corpus()*.
+            Each worker process memory-maps the file and decodes only the documents it is to
+            hold. Documents stored with content hashes are held by the workers to which
+            documents with identical content registered later are sent, so that these share
+            the loaded documents.
+
+        Parameters:
+
+        path -- the path of the bundle file.
+        """
+        for label in self.semantic_analyzer.read_corpus_bundle_labels(path):
+            self._add_document_label(label)
+        reply_queue = self._multiprocessor_manager.Queue()
+        for counter in range(0, self._number_of_workers):
+            self._input_queues[counter].put((self._worker.worker_load_corpus_shard,
+                    (path, counter, self._number_of_workers), reply_queue))
+        for _ in range(0, self._number_of_workers):
+            possible_exception = self._handle_reply(*reply_queue.get())
+            if possible_exception != None:
+                self.close()
 
     def document_labels(self):
         with self._lock:
-            document_labels = self._document_labels
-        return sorted(document_labels)
+            return sorted(self._document_labels)
+
+    def worker_startup_timings(self):
+        """Returns a dictionary from worker labels to dictionaries describing how each worker
+            process started up, measured in seconds: *'process_start'* is the time from the
+            construction of this object until the process began to run, *'model_load'* the time
+            the process spent loading its own copy of the model, which it only does where
+            coreference resolution is active, and *'ready'* the time from the construction of
+            this object until the process was ready to receive requests.
+        """
+        reply_queue = self._multiprocessor_manager.Queue()
+        for counter in range(0, self._number_of_workers):
+            self._input_queues[counter].put((self._worker.worker_startup_times, (),
+                    reply_queue))
+        worker_startup_timings = {}
+        for _ in range(0, self._number_of_workers):
+            worker_label, startup_times = reply_queue.get()
+            possible_exception = self._handle_reply(worker_label, startup_times)
+            if possible_exception != None:
+                self.close()
+                return None
+            start_time, model_loaded_time, ready_time = startup_times
+            worker_startup_timings[worker_label] = {
+                    'process_start': start_time - self._worker_creation_time,
+                    'model_load': model_loaded_time - start_time,
+                    'ready': ready_time - self._worker_creation_time}
+        return worker_startup_timings
 
     def topic_match_documents_returning_dictionaries_against(self, text_to_match, *,
             maximum_activation_distance=75, relation_score=30, reverse_only_relation_score = 20,
@@ -683,8 +1429,13 @@ class Worker:
     """
 
     def listen(self, semantic_analyzer, structural_matcher, input_queue, worker_label):
-        semantic_analyzer.reload_model() # necessary to avoid neuralcoref MemoryError on Linux
+        global _worker_startup_times
+        start_time = time.time()
+        if semantic_analyzer.perform_coreference_resolution:
+            semantic_analyzer.reload_model() # necessary to avoid neuralcoref MemoryError on Linux
+        model_loaded_time = time.time()
         indexed_documents = {}
+        _worker_startup_times = [start_time, model_loaded_time, time.time()]
         while(True):
             method, args, reply_queue = input_queue.get()
             try:
@@ -699,19 +1450,70 @@ class Worker:
             reply_queue.put((worker_label, reply))
 
     def worker_parse_and_register_document(self, semantic_analyzer, structural_matcher,
-            indexed_documents, document_text, label):
-        doc = semantic_analyzer.parse(document_text)
+            indexed_documents, document_text, label, perform_coreference_resolution):
+        doc = semantic_analyzer.parse(document_text,
+                perform_coreference_resolution=perform_coreference_resolution)
         indexed_document = structural_matcher.index_document(doc)
         indexed_documents[label] = indexed_document
         return ' '.join(('Parsed and registered document', label))
 
     def worker_deserialize_and_register_document(self, semantic_analyzer, structural_matcher,
             indexed_documents, document, label):
-        doc = semantic_analyzer.from_serialized_string(document)
-        indexed_document = structural_matcher.index_document(doc)
+        doc, serialized_index = semantic_analyzer.from_serialized_string_with_index(document)
+        indexed_document = structural_matcher.reindex_document(doc, serialized_index)
         indexed_documents[label] = indexed_document
         return ' '.join(('Deserialized and registered document', label))
 
+    def worker_parse_and_register_document_file(self, semantic_analyzer, structural_matcher,
+            indexed_documents, path, label, perform_coreference_resolution):
+        with open(path, encoding='utf-8') as file:
+            document_text = file.read()
+        return self.worker_parse_and_register_document(semantic_analyzer, structural_matcher,
+                indexed_documents, document_text, label, perform_coreference_resolution)
+
+    def worker_deserialize_and_register_document_file(self, semantic_analyzer,
+            structural_matcher, indexed_documents, path, label):
+        with open(path, 'rb') as file:
+            document = file.read()
+        return self.worker_deserialize_and_register_document(semantic_analyzer,
+                structural_matcher, indexed_documents, document, label)
+
+    def worker_load_corpus_shard(self, semantic_analyzer, structural_matcher,
+            indexed_documents, path, shard_index, number_of_shards):
+        number_of_documents = 0
+        for labels, doc, serialized_index, content_hash in semantic_analyzer.read_corpus_bundle(
+                path, shard_index=shard_index, number_of_shards=number_of_shards):
+            indexed_document = structural_matcher.reindex_document(doc, serialized_index)
+            for label in labels:
+                indexed_documents[label] = indexed_document
+                number_of_documents += 1
+            if content_hash != None:
+                _worker_content_hashes_to_labels[content_hash] = labels[0]
+        return ' '.join(('Loaded', str(number_of_documents), 'documents from corpus bundle',
+                path))
+
+    def worker_startup_times(self, semantic_analyzer, structural_matcher, indexed_documents):
+        return _worker_startup_times
+
+    def worker_register_document_once(self, semantic_analyzer, structural_matcher,
+            indexed_documents, worker_method, content_hash, value, label, *additional_args):
+        """Registers a document using *worker_method* unless this worker has already registered
+            a document with *content_hash*, in which case the new label shares that document.
+        """
+        existing_label = _worker_content_hashes_to_labels.get(content_hash)
+        if existing_label != None and existing_label in indexed_documents:
+            return self.worker_register_duplicate_document(semantic_analyzer,
+                    structural_matcher, indexed_documents, existing_label, label)
+        reply = worker_method(semantic_analyzer, structural_matcher, indexed_documents, value,
+                label, *additional_args)
+        _worker_content_hashes_to_labels[content_hash] = label
+        return reply
+
+    def worker_register_duplicate_document(self, semantic_analyzer, structural_matcher,
+            indexed_documents, existing_label, label):
+        indexed_documents[label] = indexed_documents[existing_label]
+        return ' '.join(('Registered document', label, 'sharing document', existing_label))
+
     def worker_topic_match_documents_returning_dictionaries_against(self, semantic_analyzer,
             structural_matcher, indexed_documents, text_to_match,
             maximum_activation_distance, relation_score, reverse_only_relation_score,
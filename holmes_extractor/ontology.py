@@ -1,5 +1,6 @@
-import rdflib
-import urllib
+import hashlib
+import urllib.parse
+import msgpack
 from itertools import chain
 
 class Ontology:
@@ -35,6 +36,7 @@ class Ontology:
                  owl_synonym_type='http://www.w3.org/2002/07/owl#equivalentClass',
                  owl_hyponym_type='http://www.w3.org/2000/01/rdf-schema#subClassOf',
                  symmetric_matching=False):
+        import rdflib # deferred so that applications without ontologies do not load it
         self.path = ontology_path
         self._graph = rdflib.Graph()
         self._graph.load(ontology_path)
@@ -43,10 +45,62 @@ class Ontology:
         self._owl_type_link = owl_type_link
         self._owl_synonym_type = owl_synonym_type
         self._owl_hyponym_type = owl_hyponym_type
+        self._uri_refs = self._create_uri_refs()
         self._words, self._multiwords = self._get_words()
         self._match_dict = {}
         self.symmetric_matching=symmetric_matching
 
+    def to_bytes(self):
+        """Returns a byte representation of the loaded ontology, from which it can be recreated
+            using *from_bytes()* without the original ontology file being required. Dictionaries
+            generated for search phrase words are not included.
+        """
+        return msgpack.packb({
+                'path': self.path,
+                'owl_class_type': self._owl_class_type,
+                'owl_individual_type': self._owl_individual_type,
+                'owl_type_link': self._owl_type_link,
+                'owl_synonym_type': self._owl_synonym_type,
+                'owl_hyponym_type': self._owl_hyponym_type,
+                'symmetric_matching': self.symmetric_matching,
+                'graph': self._graph.serialize(format='nt', encoding='utf-8')},
+                use_bin_type=True)
+
+    @classmethod
+    def from_bytes(cls, serialized_ontology):
+        """Recreates an ontology from the output of *to_bytes()*."""
+        import rdflib # deferred so that applications without ontologies do not load it
+        serialized = msgpack.unpackb(serialized_ontology, raw=False)
+        ontology = cls.__new__(cls)
+        ontology.path = serialized['path']
+        ontology._graph = rdflib.Graph()
+        ontology._graph.parse(data=serialized['graph'].decode('utf-8'), format='nt')
+        ontology._owl_class_type = serialized['owl_class_type']
+        ontology._owl_individual_type = serialized['owl_individual_type']
+        ontology._owl_type_link = serialized['owl_type_link']
+        ontology._owl_synonym_type = serialized['owl_synonym_type']
+        ontology._owl_hyponym_type = serialized['owl_hyponym_type']
+        ontology._uri_refs = ontology._create_uri_refs()
+        ontology._words, ontology._multiwords = ontology._get_words()
+        ontology._match_dict = {}
+        ontology.symmetric_matching = serialized['symmetric_matching']
+        return ontology
+
+    def _create_uri_refs(self):
+        """Returns a dictionary from the names of the OWL type settings to the corresponding
+            *rdflib* terms, which are created once per object rather than on each lookup.
+        """
+        import rdflib # deferred so that applications without ontologies do not load it
+        return {name: rdflib.term.URIRef(getattr(self, ''.join(('_owl_', name)))) for name in
+                ('class_type', 'individual_type', 'type_link', 'synonym_type', 'hyponym_type')}
+
+    def __getattr__(self, name):
+        # objects deserialized from earlier versions lack the terms created on construction
+        if name == '_uri_refs':
+            self._uri_refs = self._create_uri_refs()
+            return self._uri_refs
+        raise AttributeError(name)
+
     class Entry:
         """Args:
 
@@ -80,6 +134,26 @@ class Ontology:
                             entry_set, entry_word, class_id, set(), 0, True, False,
                             self.symmetric_matching)
 
+    def dictionary_entries(self, search_phrase_word):
+        """Returns the dictionary generated for a search phrase word as a list of
+            *[word, depth, is_individual]* lists, or *None* if no dictionary has been generated
+            for the word.
+        """
+        entry_set = self._match_dict.get(search_phrase_word.lower())
+        if entry_set == None:
+            return None
+        return [[entry.word, entry.depth, entry.is_individual] for entry in entry_set]
+
+    def add_dictionary_entries(self, search_phrase_word, entries):
+        """Restores the dictionary for a search phrase word from a list returned by
+            *dictionary_entries()*, which avoids searching the ontology again. Has no effect
+            if a dictionary has already been generated for the word.
+        """
+        search_phrase_word = search_phrase_word.lower()
+        if search_phrase_word not in self._match_dict:
+            self._match_dict[search_phrase_word] = set(self.Entry(word, depth, is_individual)
+                    for word, depth, is_individual in entries)
+
     def contains(self, word):
         """Returns whether or not a word is present in the loaded ontology."""
         return word.lower() in self._words
@@ -88,6 +162,47 @@ class Ontology:
         """Returns whether or not a multiword is present in the loaded ontology."""
         return multiword.lower() in self._multiwords
 
+    def multiword_fingerprint(self):
+        """Returns a hash of the multiwords in the loaded ontology. Document indexes depend
+            on no other ontology information, so an index built using one ontology can be reused
+            with any ontology that has the same multiword fingerprint.
+        """
+        return hashlib.sha256('\0'.join(sorted(set(self._multiwords))).encode(
+                'utf-8')).hexdigest()
+
+    def content_fingerprint(self):
+        """Returns a hash of the triples in the loaded ontology and of the settings that
+            determine how they are interpreted, which identifies the ontology independently of
+            the path it was loaded from. Blank nodes, whose identifiers differ each time an
+            ontology is loaded, are all hashed as the same placeholder. The hash is calculated
+            once per object.
+        """
+        # objects deserialized from earlier versions do not have the attribute
+        content_fingerprint = self.__dict__.get('_content_fingerprint')
+        if content_fingerprint == None:
+            import rdflib # deferred so that applications without ontologies do not load it
+
+            def term_representation(term):
+                return '_:' if isinstance(term, rdflib.term.BNode) else term.n3()
+
+            content_hash = hashlib.sha256()
+            for part in chain((self._owl_class_type, self._owl_individual_type,
+                    self._owl_type_link, self._owl_synonym_type, self._owl_hyponym_type),
+                    sorted(' '.join(term_representation(term) for term in triple) for
+                    triple in self._graph)):
+                content_hash.update(part.encode('utf-8'))
+                content_hash.update(b'\0')
+            content_fingerprint = content_hash.hexdigest()
+            self._content_fingerprint = content_fingerprint
+        return content_fingerprint
+
+    def dictionaries(self):
+        """Returns a dictionary from each search phrase word for which a dictionary has been
+            generated to the entries returned for it by *dictionary_entries()*.
+        """
+        return {search_phrase_word: self.dictionary_entries(search_phrase_word) for
+                search_phrase_word in self._match_dict}
+
     def matches(self, search_phrase_word, candidate_word):
         """Returns whether or not *candidate_word* matches *search_phrase_word*.
 
@@ -113,13 +228,13 @@ class Ontology:
 
     def _get_classes(self):
         """Returns all classes from the loaded ontology."""
-        return self._graph.triples((None, rdflib.term.URIRef(self._owl_type_link),
-                rdflib.term.URIRef(self._owl_class_type)))
+        return self._graph.triples((None, self._uri_refs['type_link'],
+                self._uri_refs['class_type']))
 
     def _get_individuals(self):
         """Returns all classes from the loaded ontology."""
-        return self._graph.triples((None, rdflib.term.URIRef(self._owl_type_link),
-                rdflib.term.URIRef(self._owl_individual_type)))
+        return self._graph.triples((None, self._uri_refs['type_link'],
+                self._uri_refs['individual_type']))
 
     def _get_words(self):
         """Finds all words in the loaded ontology and returns multiwords in a separate list."""
@@ -159,30 +274,30 @@ class Ontology:
                 entry_set.add(self.Entry(working_entry_word, depth, is_individual))
             if not is_hypernym: # prevent recursive traversal of adjacent branches
                 for entry, type_link, metaclass_id in self._graph.triples((None,
-                        rdflib.term.URIRef(self._owl_hyponym_type), working_entry_url)):
+                        self._uri_refs['hyponym_type'], working_entry_url)):
                     self._recursive_add_to_dict(entry_set, word, entry, visited,
                             depth+1, False, False, symmetric)
                 for entry, type_link, metaclass_id in self._graph.triples((None,
-                        rdflib.term.URIRef(self._owl_type_link), working_entry_url)):
+                        self._uri_refs['type_link'], working_entry_url)):
                     self._recursive_add_to_dict(entry_set, word, entry, visited,
                             depth+1, True, False, symmetric)
             for entry, type_link, metaclass_id in self._graph.triples((None,
-                    rdflib.term.URIRef(self._owl_synonym_type), working_entry_url)):
+                    self._uri_refs['synonym_type'], working_entry_url)):
                 self._recursive_add_to_dict(entry_set, word, entry, visited,
                         depth, False, False, symmetric)
             for metaclass_id, type_link, entry in self._graph.triples((working_entry_url,
-                    rdflib.term.URIRef(self._owl_synonym_type), None)):
+                    self._uri_refs['synonym_type'], None)):
                 self._recursive_add_to_dict(entry_set, word, entry, visited,
                         depth, False, False, symmetric)
             if symmetric and depth <= 0:
                 for metaclass_id, type_link, entry in self._graph.triples((working_entry_url,
-                        rdflib.term.URIRef(self._owl_hyponym_type), None)):
+                        self._uri_refs['hyponym_type'], None)):
                     self._recursive_add_to_dict(entry_set, word, entry, visited,
                             depth-1, False, True, symmetric)
                 if is_individual:
                     for metaclass_id, type_link, entry in self._graph.triples((working_entry_url,
-                            rdflib.term.URIRef(self._owl_type_link), None)):
-                        if entry != rdflib.term.URIRef(self._owl_individual_type):
+                            self._uri_refs['type_link'], None)):
+                        if entry != self._uri_refs['individual_type']:
                             self._recursive_add_to_dict(entry_set, word, entry, visited,
                                     depth-1, False, True, symmetric)
                 # setting depth to a negative value ensures the hypernym
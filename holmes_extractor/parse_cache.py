@@ -0,0 +1,179 @@
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from threading import Lock
+
+class ParseCache:
+    """Caches the results of *SemanticAnalyzer.parse()* so that texts that have already been
+        parsed, e.g. repeated queries, do not have to be parsed again. Entries are keyed by a hash
+        of the model name and the text and are held in a bounded in-memory tier ordered by recency
+        of use and optionally in an unbounded on-disk tier. Each lookup returns a new document
+        decoded from the serialized representation, so callers are free to modify the documents
+        they receive. This class is threadsafe.
+
+    Parameters:
+
+    maximum_size -- the maximum number of parsed documents to hold in memory. Once this number
+        is reached, the least recently used entry is discarded whenever a new entry is added.
+    directory -- the directory within which parsed documents should additionally be stored on
+        disk, or *None* if there should be no on-disk tier.
+    """
+
+    def __init__(self, *, maximum_size=1000, directory=None):
+        if maximum_size < 1:
+            raise ValueError('maximum_size must be at least 1')
+        self.maximum_size = maximum_size
+        self.directory = directory
+        if directory != None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def key(self, model, perform_coreference_resolution, text, *, coreference_window_size=None):
+        """Returns the key under which the result of parsing *text* with the specified
+            configuration is stored.
+        """
+        return hashlib.sha256('\0'.join((model, str(bool(perform_coreference_resolution)),
+                str(coreference_window_size), text)).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.sep.join((self.directory, ''.join((key, '.holmes'))))
+
+    def get(self, key):
+        """Returns the serialized document stored for *key*, or *None* if there is none."""
+        with self._lock:
+            serialized_doc = self._entries.get(key)
+            if serialized_doc != None:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                return serialized_doc
+        if self.directory != None and os.path.isfile(self._path(key)):
+            with open(self._path(key), 'rb') as file:
+                serialized_doc = file.read()
+            self._put_in_memory(key, serialized_doc)
+            with self._lock:
+                self._disk_hits += 1
+            return serialized_doc
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key, serialized_doc):
+        """Stores a serialized document under *key*."""
+        self._put_in_memory(key, serialized_doc)
+        if self.directory != None:
+            # unique per write so that threads and processes storing the same key concurrently
+            # do not write to or move each other's temporary files
+            temporary_path = ''.join((self._path(key), '.', uuid.uuid4().hex, '.tmp'))
+            with open(temporary_path, 'wb') as file:
+                file.write(serialized_doc)
+            os.replace(temporary_path, self._path(key))
+
+    def _put_in_memory(self, key, serialized_doc):
+        with self._lock:
+            self._entries[key] = serialized_doc
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maximum_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all entries from the in-memory tier and resets the statistics. Entries in the
+            on-disk tier are retained.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._memory_hits = 0
+            self._disk_hits = 0
+            self._misses = 0
+
+    def statistics(self):
+        """Returns a dictionary containing the number of entries in memory and the numbers of
+            memory hits, disk hits and misses since the cache was created or last cleared.
+        """
+        with self._lock:
+            return {
+                    'entries_in_memory': len(self._entries),
+                    'memory_hits': self._memory_hits,
+                    'disk_hits': self._disk_hits,
+                    'misses': self._misses}
+
+class SentenceMemo:
+    """Holds the analyses of sentences that have already been parsed so that documents that
+        repeat the same sentences, e.g. boilerplate, only require the sentences not seen before
+        to be parsed. Each entry is the array representation of a parsed sentence together with
+        the serializable representations of its Holmes dictionaries, from which the sentence can
+        be inserted into a new document at any token offset. Entries are held in memory ordered
+        by recency of use. This class is threadsafe.
+
+    Parameters:
+
+    maximum_size -- the maximum number of sentences to hold. Once this number is reached, the
+        least recently used entry is discarded whenever a new entry is added.
+    """
+
+    def __init__(self, *, maximum_size=10000):
+        if maximum_size < 1:
+            raise ValueError('maximum_size must be at least 1')
+        self.maximum_size = maximum_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def get(self, sentence_text):
+        """Returns the entry stored for *sentence_text*, or *None* if there is none."""
+        with self._lock:
+            entry = self._entries.get(sentence_text)
+            if entry != None:
+                self._entries.move_to_end(sentence_text)
+                self._hits += 1
+            else:
+                self._misses += 1
+            return entry
+
+    def put(self, sentence_text, entry):
+        """Stores an entry for *sentence_text*. Entries must not be modified once stored."""
+        with self._lock:
+            self._entries[sentence_text] = entry
+            self._entries.move_to_end(sentence_text)
+            while len(self._entries) > self.maximum_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all entries and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def statistics(self):
+        """Returns a dictionary containing the number of sentences held and the numbers of hits
+            and misses since the memo was created or last cleared.
+        """
+        with self._lock:
+            return {
+                    'entries': len(self._entries),
+                    'hits': self._hits,
+                    'misses': self._misses}
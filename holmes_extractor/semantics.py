@@ -1,16 +1,40 @@
+import re
+import sys
 import spacy
-import neuralcoref
 from .errors import WrongModelDeserializationError, WrongVersionDeserializationError, \
         DocumentTooBigError
 from spacy.tokens import Token, Doc
+from spacy.language import Language
+from spacy.pipeline import Sentencizer
+from spacy.attrs import TAG, POS, LEMMA, DEP, HEAD, ENT_IOB, ENT_TYPE
+from spacy.parts_of_speech import IDS as POS_IDS
 from abc import ABC, abstractmethod
-import jsonpickle
-
-SERIALIZED_DOCUMENT_VERSION = 2
+from threading import Lock
+import msgpack
+import mmap
+import struct
+import time
+import zlib
+import numpy
+
+SERIALIZED_DOCUMENT_VERSION = 3
+# The version of the *jsonpickle*-based format used by earlier versions, which can still be read
+JSONPICKLE_SERIALIZED_DOCUMENT_VERSION = 2
+CORPUS_BUNDLE_VERSION = 1
+CORPUS_BUNDLE_MAGIC = b'HOLMESBUNDLE'
+
+def content_hash_shard_index(content_hash, number_of_shards):
+    """Returns the shard out of *number_of_shards* to which a document registered with the
+        hexadecimal *content_hash* belongs, so that documents with identical content are
+        always held together.
+    """
+    return int(content_hash[:16], 16) % number_of_shards
 
 class SemanticDependency:
     """A labelled semantic dependency between two tokens."""
 
+    __slots__ = ('parent_index', 'child_index', 'label', 'is_uncertain')
+
     def __init__(self, parent_index, child_index, label=None, is_uncertain=False):
         """Args:
 
@@ -34,7 +58,7 @@ class SemanticDependency:
                         str(parent_index))))
         self.parent_index = parent_index
         self.child_index = child_index
-        self.label = label
+        self.label = label if label == None else sys.intern(label)
         self.is_uncertain = is_uncertain
 
     def child_token(self, doc):
@@ -65,12 +89,14 @@ class SemanticDependency:
 class Mention:
     """ Simplified information about a coreference mention with respect to a specific token. """
 
+    __slots__ = ('root_index', 'indexes')
+
     def __init__(self, root_index, indexes):
         self.root_index = root_index
-        self.indexes = indexes
+        self.indexes = tuple(indexes)
 
     def __str__(self):
-        return ''.join(('[', str(self.root_index), '; ', str(self.indexes),
+        return ''.join(('[', str(self.root_index), '; ', str(list(self.indexes)),
                 ']'))
 
 class HolmesDictionary:
@@ -82,9 +108,18 @@ class HolmesDictionary:
     lemma -- the value returned from *._.holmes.lemma* for the token.
     """
 
+    # There is one Holmes dictionary per token, so doing without per-object dictionaries
+    # and sharing the lemma strings noticeably reduces the memory needed to hold large corpora.
+    # For the same reason, the edge attributes are lists only while a document is being
+    # analysed and are then replaced by tuples using *compact()*.
+    __slots__ = ('index', 'lemma', 'children', 'righthand_siblings',
+            'token_or_lefthand_sibling_index', 'is_involved_in_or_conjunction', 'is_negated',
+            'is_matchable', 'parent_dependencies', 'token_and_coreference_chain_indexes',
+            'mentions', 'mention_root_index')
+
     def __init__(self, index, lemma):
         self.index = index
-        self.lemma = lemma
+        self.lemma = sys.intern(lemma)
         self.children = [] # list of *SemanticDependency* objects where this token is the parent.
         self.righthand_siblings = [] # list of tokens to the right of this token that stand in a
         # conjunction relationship to this token and that share its semantic parents.
@@ -108,6 +143,20 @@ class HolmesDictionary:
         """if *True*, a match involving this token will itself be uncertain."""
         return self.is_involved_in_or_conjunction
 
+    def compact(self):
+        """Replaces the lists built up while the document was being analysed with tuples, which
+            occupy less memory and of which the empty ones are all shared. Called once the
+            analysis is complete, after which the edges of a token are no longer changed in place.
+        """
+        self.children = tuple(self.children)
+        self.righthand_siblings = tuple(self.righthand_siblings)
+        self.parent_dependencies = tuple(tuple(parent_dependency) for parent_dependency in
+                self.parent_dependencies)
+        if self.token_and_coreference_chain_indexes != None:
+            self.token_and_coreference_chain_indexes = \
+                    tuple(self.token_and_coreference_chain_indexes)
+        self.mentions = tuple(self.mentions)
+
     def loop_token_and_righthand_siblings(self, doc):
         """Convenience generator to loop through this token and any righthand siblings."""
         yield doc[self.index]
@@ -146,25 +195,119 @@ class HolmesDictionary:
             self.children, key=lambda dependency: dependency.child_index)
         return '; '.join(str(child) for child in children)
 
+    def to_serializable(self):
+        """Returns the information held in this dictionary as a list made up only of strings,
+            numbers, booleans, *None* and further lists, which can be serialized by *msgpack* and
+            passed between processes without any Holmes classes having to be reconstructed.
+        """
+        return [self.index, self.lemma,
+                [[dependency.parent_index, dependency.child_index, dependency.label,
+                dependency.is_uncertain] for dependency in self.children],
+                self.righthand_siblings, self.token_or_lefthand_sibling_index,
+                self.is_involved_in_or_conjunction, self.is_negated, self.is_matchable,
+                self.parent_dependencies, self.token_and_coreference_chain_indexes,
+                [[mention.root_index, list(mention.indexes)] for mention in self.mentions],
+                self.mention_root_index]
+
+    @staticmethod
+    def from_serializable(values, index_offset=0):
+        """Recreates a Holmes dictionary from a list returned by *to_serializable()*.
+
+        values -- the list returned by *to_serializable()*.
+        index_offset -- a number to add to all token indexes, which is used when the token is
+            being moved to a different position, e.g. when several documents are joined together.
+        """
+        def offset(index):
+            return index if index == None else index + index_offset
+
+        def offset_child(child_index):
+            # grammatical dependencies have negative child indexes
+            return child_index + index_offset if child_index >= 0 else \
+                    child_index - index_offset
+
+        holmes_dictionary = HolmesDictionary(values[0] + index_offset, values[1])
+        holmes_dictionary.children = [SemanticDependency(parent_index + index_offset,
+                offset_child(child_index), label, is_uncertain) for parent_index, child_index,
+                label, is_uncertain in values[2]]
+        holmes_dictionary.righthand_siblings = [index + index_offset for index in values[3]]
+        holmes_dictionary.token_or_lefthand_sibling_index = offset(values[4])
+        holmes_dictionary.is_involved_in_or_conjunction = values[5]
+        holmes_dictionary.is_negated = values[6]
+        holmes_dictionary.is_matchable = values[7]
+        holmes_dictionary.parent_dependencies = [[index + index_offset, label] for index, label
+                in values[8]]
+        if values[9] != None:
+            holmes_dictionary.token_and_coreference_chain_indexes = [index + index_offset for
+                    index in values[9]]
+        holmes_dictionary.mentions = [Mention(root_index + index_offset, (index + index_offset
+                for index in indexes)) for root_index, indexes in values[10]]
+        holmes_dictionary.mention_root_index = offset(values[11])
+        holmes_dictionary.compact()
+        return holmes_dictionary
+
 
 class SerializedHolmesDocument:
     """Consists of the spaCy represention returned by *get_bytes()* plus a jsonpickle representation
-        of each token's *SemanticDictionary*.
+        of each token's *SemanticDictionary*. Used by the serialization format of earlier
+        versions, which can still be read.
     """
 
     def __init__(self, serialized_spacy_document, dictionaries, model):
         self._serialized_spacy_document = serialized_spacy_document
         self._dictionaries = dictionaries
         self._model = model
-        self._version = SERIALIZED_DOCUMENT_VERSION
+        self._version = JSONPICKLE_SERIALIZED_DOCUMENT_VERSION
 
     def holmes_document(self, semantic_analyzer):
         doc = Doc(semantic_analyzer.nlp.vocab).from_bytes(
             self._serialized_spacy_document)
         for token in doc:
             token._.holmes = self._dictionaries[token.i]
+            token._.holmes.compact()
         return doc
 
+class HolmesPipelineComponent:
+    """Performs the Holmes semantic analysis as a component within a spaCy pipeline, e.g.
+
+        *nlp.add_pipe(HolmesPipelineComponent(semantic_analyzer), name='holmes', last=True)*
+
+        The component is also registered with spaCy under the name *'holmes'* once
+        *holmes_extractor* has been imported, so that it can be created using
+        *nlp.create_pipe('holmes')* and built by *spacy.load()* for models whose pipeline
+        includes it. A component created in this way performs the analysis using a new
+        *SemanticAnalyzer* that shares the *Language* object of the pipeline; the configuration
+        entries *perform_coreference_resolution* and *debug* are passed on to the analyzer.
+
+        Where coreference resolution is active for the semantic analyzer, the component performs
+        it on each document before the Holmes analysis, so that documents produced by the
+        pipeline hold the same information as documents parsed by the analyzer itself. Documents
+        produced by the pipeline can be converted to and from a byte representation that
+        survives process boundaries using *SemanticAnalyzer.holmes_doc_to_bytes()* and
+        *SemanticAnalyzer.holmes_doc_from_bytes()*.
+
+    semantic_analyzer -- the *SemanticAnalyzer* whose configuration and language-specific logic
+        are to be used.
+    """
+
+    name = 'holmes'
+
+    def __init__(self, semantic_analyzer):
+        self.semantic_analyzer = semantic_analyzer
+
+    def __call__(self, doc):
+        return self.semantic_analyzer.holmes_parse_external_doc(doc)
+
+def _create_holmes_pipeline_component(nlp, perform_coreference_resolution=None, debug=False,
+        **config):
+    """The spaCy factory for *HolmesPipelineComponent*. Further configuration entries supplied
+        by spaCy, e.g. *vocab*, are ignored.
+    """
+    model = '_'.join((nlp.meta['lang'], nlp.meta['name']))
+    return HolmesPipelineComponent(SemanticAnalyzerFactory().semantic_analyzer(model=model,
+            perform_coreference_resolution=perform_coreference_resolution, debug=debug, nlp=nlp))
+
+Language.factories[HolmesPipelineComponent.name] = _create_holmes_pipeline_component
+
 class PhraseletTemplate:
     """A template for a phraselet used in topic matching.
 
@@ -211,14 +354,16 @@ class SemanticAnalyzerFactory():
         if additional *SemanticAnalyzer* implementations are added for new languages.
     """
 
-    def semantic_analyzer(self, *, model, perform_coreference_resolution, debug=False):
+    def semantic_analyzer(self, *, model, perform_coreference_resolution, debug=False, nlp=None):
         language = model[0:2]
         if language == 'en':
             return EnglishSemanticAnalyzer(model=model,
-                    perform_coreference_resolution=perform_coreference_resolution, debug=debug)
+                    perform_coreference_resolution=perform_coreference_resolution, debug=debug,
+                    nlp=nlp)
         elif language == 'de':
             return GermanSemanticAnalyzer(model=model,
-                    perform_coreference_resolution=perform_coreference_resolution, debug=debug)
+                    perform_coreference_resolution=perform_coreference_resolution, debug=debug,
+                    nlp=nlp)
         else:
             raise ValueError(
                 ' '.join(['No semantic analyzer for model', language]))
@@ -233,7 +378,7 @@ class SemanticAnalyzer(ABC):
         implementation where they can be illustrated with direct examples.
     """
 
-    def __init__(self, *, model, perform_coreference_resolution, debug):
+    def __init__(self, *, model, perform_coreference_resolution, debug, nlp=None):
         """Args:
 
         model -- the name of the spaCy model
@@ -241,74 +386,613 @@ class SemanticAnalyzer(ABC):
                 *None* if neuralcoref should be added to the pipe if coreference resolution is
                 available for the model
         debug -- *True* if the object should print a representation of each parsed document
+        nlp -- a spaCy *Language* object for *model* that should be used rather than loading
+                the model, or *None* if the model should be loaded
         """
-        self.nlp = spacy.load(model)
+        self.nlp = spacy.load(model) if nlp == None else nlp
         if perform_coreference_resolution == None and self.model_supports_coreference_resolution():
             perform_coreference_resolution = True
         if perform_coreference_resolution:
-            neuralcoref.add_to_pipe(self.nlp)
+            import neuralcoref # deferred to avoid the import cost when it is not required
+            # run separately from the pipeline so that it can be applied per document or window
+            self._coreference_resolver = neuralcoref.NeuralCoref(self.nlp.vocab)
         self.model = model
         self.perform_coreference_resolution = perform_coreference_resolution
         self.debug = debug
+        self._holmes_parse_stages = self._create_holmes_parse_stages()
+        # guards the stage timings, which are updated by every thread that parses documents
+        self._holmes_parse_stage_timings_lock = Lock()
+        self.reset_holmes_parse_stage_timings()
+        self._phraselet_template_doc_parts = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_holmes_parse_stage_timings_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._holmes_parse_stage_timings_lock = Lock()
 
     Token.set_extension('holmes', default='')
 
     def reload_model(self):
         spacy.load(self.model)
 
-    def parse(self, text):
+    parse_cache = None # a *ParseCache* in front of *parse()*, or *None* if there is no cache
+
+    # the number of sentences in each window over which coreference is resolved, or *None* if
+    # coreference is resolved over whole documents
+    coreference_window_size = None
+
+    def parse(self, text, *, perform_coreference_resolution=None):
         """Performs a full spaCy and Holmes parse on a string.
+
+        Args:
+
+        text -- the text to parse.
+        perform_coreference_resolution -- *False* if coreference resolution should be skipped
+            for this text, or *None* if it should be performed if it is active for this object.
         """
-        spacy_doc = self.spacy_parse(text)
+        perform_coreference_resolution = self._resolve_coreference_resolution_option(
+                perform_coreference_resolution)
+        if self.parse_cache != None:
+            key = self.parse_cache.key(self.model, perform_coreference_resolution, text,
+                    coreference_window_size=self.coreference_window_size if
+                    perform_coreference_resolution else None)
+            serialized_doc = self.parse_cache.get(key)
+            if serialized_doc != None:
+                try:
+                    return self.holmes_doc_from_bytes(serialized_doc)
+                except WrongVersionDeserializationError:
+                    pass # written by an earlier version, so parsed and cached again
+        spacy_doc = self.spacy_parse(text,
+                perform_coreference_resolution=perform_coreference_resolution)
         holmes_doc = self.holmes_parse(spacy_doc)
+        if self.parse_cache != None:
+            self.parse_cache.put(key, self.holmes_doc_to_bytes(holmes_doc))
         return holmes_doc
 
     _maximum_document_size = 1000000
 
-    def spacy_parse(self, text):
-        """Performs a standard spaCy parse on a string.
+    def _resolve_coreference_resolution_option(self, perform_coreference_resolution):
+        if perform_coreference_resolution == None:
+            return bool(self.perform_coreference_resolution)
+        if perform_coreference_resolution and not self.perform_coreference_resolution:
+            raise ValueError(
+                    'Coreference resolution is not active: perform_coreference_resolution may not be True')
+        return perform_coreference_resolution
+
+    def spacy_parse(self, text, *, perform_coreference_resolution=None):
+        """Performs a standard spaCy parse on a string followed by coreference resolution where
+            this is active and has not been switched off for this text.
+        """
+        self._check_document_size(text)
+        doc = self.nlp(text)
+        self._add_coreference_clusters(doc, self._resolve_coreference_resolution_option(
+                perform_coreference_resolution))
+        return doc
+
+    def lazy_spacy_parse(self, text):
+        """Performs a spaCy parse on a string that runs all pipeline components apart from the
+            dependency parser, which can be run later using *complete_lazy_parse()*.
+        """
+        self._check_document_size(text)
+        return self.nlp(text, disable=['parser'])
+
+    def lazy_spacy_parse_documents(self, texts_and_contexts, *, batch_size):
+        """Performs spaCy parses that run all pipeline components apart from the dependency
+            parser on a stream of texts using *nlp.pipe()*. Returns a generator of
+            *(doc, context)* tuples.
+        """
+        def checked_texts_and_contexts():
+            for text, context in texts_and_contexts:
+                self._check_document_size(text)
+                yield text, context
+
+        return self.nlp.pipe(checked_texts_and_contexts(), batch_size=batch_size,
+                as_tuples=True, disable=['parser'])
+
+    def complete_lazy_parse(self, spacy_doc, *, perform_coreference_resolution=None):
+        """Runs the dependency parser on a document returned from *lazy_spacy_parse()*,
+            followed by coreference resolution where this is active and has not been switched
+            off and a Holmes parse.
+        """
+        self.nlp.get_pipe('parser')(spacy_doc)
+        return self.holmes_parse_external_doc(spacy_doc,
+                perform_coreference_resolution=perform_coreference_resolution)
+
+    # The number of tokens after a verb within which a particle is assumed to be able to
+    # belong to it when words are collected from documents that have not been parsed yet
+    _lazy_particle_window = 10
+
+    def lazy_candidate_words(self, spacy_doc):
+        """Returns a set containing the words a document returned from *lazy_spacy_parse()*
+            is expected to be indexed under once it has been fully parsed: lemmas that depend on
+            the dependency parse are approximated. Multiwords are not included, but are
+            represented by the words they consist of.
+        """
+        candidate_words = set()
+        for token in spacy_doc:
+            candidate_words.add(self._holmes_lemma(token)) # no children before parsing
+            candidate_words.add(token.lemma_.lower())
+            candidate_words.add(token.text.lower())
+            if token.ent_type_ != '':
+                candidate_words.add(''.join(('ENTITY', token.ent_type_)))
+        candidate_words.update(self._lazy_candidate_compound_lemmas(spacy_doc))
+        return candidate_words
+
+    # the key within *Doc.user_data* under which coreference clusters are passed from
+    # *spacy_parse()* to *holmes_parse()*
+    _coreference_clusters_key = 'holmes_coreference_clusters'
+
+    def _add_coreference_clusters(self, doc, perform_coreference_resolution):
+        """Resolves coreference within *doc* if *perform_coreference_resolution* is *True*
+            and records the resulting clusters for use by *holmes_parse()*. Where
+            *coreference_window_size* is set, coreference is resolved separately within windows
+            of that number of sentences, each window overlapping the previous window by half its
+            size, and clusters from different windows that share a mention are merged.
+        """
+        if not self.perform_coreference_resolution:
+            return
+        mention_clusters = []
+        if perform_coreference_resolution:
+            if self.coreference_window_size != None:
+                sentences = list(doc.sents)
+            if self.coreference_window_size == None or \
+                    len(sentences) <= self.coreference_window_size:
+                self._coreference_resolver(doc)
+                if doc._.has_coref:
+                    mention_clusters = [[(span.start, span.end) for span in cluster] for
+                            cluster in doc._.coref_clusters]
+            else:
+                step = max(1, self.coreference_window_size // 2)
+                for first_sentence_index in range(0, len(sentences), step):
+                    last_sentence_index = min(first_sentence_index +
+                            self.coreference_window_size, len(sentences)) - 1
+                    window_start = sentences[first_sentence_index].start
+                    window_doc = self._coreference_resolver(doc[window_start:
+                            sentences[last_sentence_index].end].as_doc())
+                    if window_doc._.has_coref:
+                        mention_clusters.extend([[(span.start + window_start,
+                                span.end + window_start) for span in cluster] for cluster in
+                                window_doc._.coref_clusters])
+                    if last_sentence_index == len(sentences) - 1:
+                        break
+        # merge clusters that share a mention, which occurs where windows overlap
+        cluster_of_mention = {}
+        for mention_cluster in mention_clusters:
+            merged_cluster = set(mention_cluster)
+            for mention in mention_cluster:
+                if mention in cluster_of_mention:
+                    merged_cluster.update(cluster_of_mention[mention])
+            for mention in merged_cluster:
+                cluster_of_mention[mention] = merged_cluster
+        clusters_by_token_index = {}
+        added_cluster_ids = set()
+        for mention_cluster in mention_clusters:
+            merged_cluster = cluster_of_mention[mention_cluster[0]]
+            if id(merged_cluster) in added_cluster_ids:
+                continue
+            added_cluster_ids.add(id(merged_cluster))
+            merged_cluster = sorted(merged_cluster)
+            cluster = [doc[start:end] for start, end in merged_cluster]
+            for token_index in sorted(set(index for start, end in merged_cluster for index in
+                    range(start, end))):
+                clusters_by_token_index.setdefault(token_index, []).append(cluster)
+        doc.user_data[self._coreference_clusters_key] = clusters_by_token_index
+
+    def _coreference_clusters_containing(self, token):
+        """Returns the coreference clusters containing *token*, each a list of mention spans
+            in document order. Documents produced outside *spacy_parse()* by a pipeline
+            containing neuralcoref are also supported.
+        """
+        clusters_by_token_index = token.doc.user_data.get(self._coreference_clusters_key)
+        if clusters_by_token_index != None:
+            return clusters_by_token_index.get(token.i, [])
+        if Doc.has_extension('has_coref') and token.doc._.has_coref and token._.in_coref:
+            return token._.coref_clusters
+        return []
+
+    # The boundaries at which oversized texts are split, in order of preference: paragraphs,
+    # sentences, any whitespace
+    _chunk_boundary_patterns = (r'\n[ \t]*\n\s*', r'[.!?][\'")\]]*\s+', r'\s+')
+
+    def _split_into_chunks(self, text, maximum_chunk_size):
+        """Generates consecutive chunks of *text* no longer than *maximum_chunk_size* that
+            together make up *text*. Chunks end at paragraph boundaries wherever possible, and
+            otherwise at sentence boundaries or at whitespace.
+        """
+
+        def pieces(text, pattern_index):
+            if len(text) <= maximum_chunk_size:
+                yield text
+            elif pattern_index == len(self._chunk_boundary_patterns):
+                for start in range(0, len(text), maximum_chunk_size):
+                    yield text[start:start + maximum_chunk_size]
+            else:
+                start = 0
+                for match in re.finditer(self._chunk_boundary_patterns[pattern_index], text):
+                    if match.end() > start:
+                        yield from pieces(text[start:match.end()], pattern_index + 1)
+                        start = match.end()
+                if start < len(text):
+                    yield from pieces(text[start:], pattern_index + 1)
+
+        chunk_pieces = []
+        chunk_length = 0
+        for piece in pieces(text, 0):
+            if chunk_length + len(piece) > maximum_chunk_size and chunk_length > 0:
+                yield ''.join(chunk_pieces)
+                chunk_pieces = []
+                chunk_length = 0
+            chunk_pieces.append(piece)
+            chunk_length += len(piece)
+        if chunk_length > 0:
+            yield ''.join(chunk_pieces)
+
+    def parse_in_chunks(self, text, *, maximum_chunk_size=None,
+            perform_coreference_resolution=None):
+        """Performs a full spaCy and Holmes parse on a string that may be longer than the
+            maximum document size. The text is split at paragraph boundaries, or where
+            paragraphs are themselves too long at sentence boundaries, into chunks that are parsed
+            one at a time and then joined into a single document whose token indexes and
+            character offsets refer to the original text. Only the array representation of
+            each parsed chunk is retained until the document has been assembled. Relationships,
+            including coreference, are not recognized across chunk boundaries.
+
+        Args:
+
+        text -- the text to parse.
+        maximum_chunk_size -- the maximum number of characters in each chunk. Defaults to the
+            maximum document size.
+        perform_coreference_resolution -- *False* if coreference resolution should be skipped
+            for this text, or *None* if it should be performed if it is active for this object.
+        """
+        if maximum_chunk_size == None:
+            maximum_chunk_size = self._maximum_document_size
+        if len(text) <= maximum_chunk_size:
+            return self.parse(text,
+                    perform_coreference_resolution=perform_coreference_resolution)
+        words = []
+        spaces = []
+        arrays = []
+        dictionaries = []
+        for chunk in self._split_into_chunks(text, maximum_chunk_size):
+            chunk_doc = self.parse(chunk,
+                    perform_coreference_resolution=perform_coreference_resolution)
+            index_offset = len(words)
+            words.extend(token.text for token in chunk_doc)
+            spaces.extend(token.whitespace_ != '' for token in chunk_doc)
+            arrays.append(chunk_doc.to_array(self._document_attributes))
+            dictionaries.extend(HolmesDictionary.from_serializable(
+                    token._.holmes.to_serializable(), index_offset) for token in chunk_doc)
+        return self._holmes_doc_from_parts(words, spaces, numpy.concatenate(arrays),
+                dictionaries)
+
+    sentence_memo = None # a *SentenceMemo* used by *parse_with_sentence_memo()*
+
+    def _split_into_sentences(self, text):
+        """Returns a list of consecutive strings that together make up *text* and each contain
+            a single sentence followed by any whitespace. Sentence boundaries are determined
+            using punctuation alone so that the parser does not have to be run.
+        """
+        sentence_starts = [sentence.start_char for sentence in
+                Sentencizer()(self.nlp.make_doc(text)).sents][1:]
+        return [text[start:end] for start, end in zip([0] + sentence_starts,
+                sentence_starts + [len(text)])]
+
+    def parse_with_sentence_memo(self, text, *, allow_oversized_document=False):
+        """Performs a full spaCy and Holmes parse on a string sentence by sentence, reusing the
+            analysis of any sentence that has already been parsed and is held in
+            *sentence_memo*. The analyses of the individual sentences are joined into a single
+            document whose token indexes and character offsets refer to the original text.
+            Because each sentence is analysed independently, this method may only be used
+            where coreference resolution is not being performed.
+
+        Args:
+
+        text -- the text to parse.
+        allow_oversized_document -- if *True*, *text* may exceed the maximum document size as
+            long as none of its sentences does.
+        """
+        if self.perform_coreference_resolution:
+            raise ValueError(
+                    'Sentence memoization is not supported with coreference resolution')
+        if not allow_oversized_document:
+            self._check_document_size(text)
+        words = []
+        spaces = []
+        arrays = []
+        dictionaries = []
+        for sentence_text in self._split_into_sentences(text):
+            # A single trailing space does not affect the analysis and is left out of the memo
+            # key so that a sentence ending a document matches the same sentence elsewhere
+            memo_key = sentence_text.rstrip()
+            if len(memo_key) == 0 or sentence_text[len(memo_key):] not in ('', ' '):
+                memo_key = sentence_text
+            entry = self.sentence_memo.get(memo_key)
+            if entry == None:
+                entry = self._doc_parts(self.holmes_parse(self.spacy_parse(memo_key)))
+                self.sentence_memo.put(memo_key, entry)
+            sentence_words, sentence_spaces, sentence_array, sentence_dictionaries = entry
+            index_offset = len(words)
+            words.extend(sentence_words)
+            spaces.extend(sentence_spaces)
+            if len(memo_key) < len(sentence_text):
+                spaces[-1] = True
+            arrays.append(sentence_array)
+            dictionaries.extend(HolmesDictionary.from_serializable(values, index_offset)
+                    for values in sentence_dictionaries)
+        if len(arrays) == 0:
+            return self.parse(text)
+        return self._holmes_doc_from_parts(words, spaces, numpy.concatenate(arrays),
+                dictionaries)
+
+    # The spaCy token attributes that are transferred when Holmes documents are assembled
+    # from their parts
+    _document_attributes = [TAG, POS, LEMMA, DEP, HEAD, ENT_IOB, ENT_TYPE]
+
+    def _doc_parts(self, holmes_doc):
+        """Returns the words, the whitespace flags of the words, the array of
+            *_document_attributes* and the serializable representations of the Holmes
+            dictionaries of a Holmes document, from which copies of the document can be
+            assembled without reparsing.
+        """
+        return ([token.text for token in holmes_doc],
+                [token.whitespace_ != '' for token in holmes_doc],
+                holmes_doc.to_array(self._document_attributes),
+                [token._.holmes.to_serializable() for token in holmes_doc])
+
+    def _holmes_doc_from_parts(self, words, spaces, attribute_array, dictionaries):
+        """Assembles a Holmes document from its words, the whitespace flags of the words, a
+            two-dimensional array with values for *_document_attributes* as returned from
+            *Doc.to_array()*, and a Holmes dictionary for each token.
+        """
+        doc = Doc(self.nlp.vocab, words=words, spaces=spaces)
+        doc.from_array(self._document_attributes, attribute_array)
+        for token in doc:
+            token._.holmes = dictionaries[token.i]
+        return doc
+
+    def spacy_docs_from_conllu(self, conllu_text):
+        """Builds spaCy documents from text in the CoNLL-U format that has already been tokenized,
+            tagged and parsed, e.g. by an external service, without running the spaCy pipeline.
+            Returns a generator of *(document_id, doc)* tuples, where *document_id* is taken
+            from a preceding *# newdoc id = ...* comment or is *None*. Sentences that are not
+            separated by *# newdoc* comments form a single document.
+
+        The dependency labels and fine-grained tags must follow the scheme of the model used by
+            this object. Multiword token ranges and empty nodes are ignored; *SpaceAfter=No*
+            and BIO named-entity annotations of the form *NER=B-PERSON* are read from the MISC
+            column.
+        """
+
+        def build_doc(rows):
+            doc = Doc(self.nlp.vocab, words=[row[0] for row in rows],
+                    spaces=[row[1] for row in rows])
+            doc.from_array(self._document_attributes, numpy.array([row[2:] for row in rows],
+                    dtype='uint64'))
+            return doc
+
+        strings = self.nlp.vocab.strings
+        document_id = None
+        rows = []
+        sentence_start = 0
+        for line in conllu_text.splitlines():
+            line = line.strip()
+            if line.startswith('#'):
+                if line[1:].strip().startswith('newdoc'):
+                    if len(rows) > 0:
+                        yield document_id, build_doc(rows)
+                        rows = []
+                    _, _, document_id = line.partition('=')
+                    document_id = document_id.strip() if document_id != '' else None
+                continue
+            if line == '':
+                sentence_start = len(rows)
+                continue
+            fields = line.split('\t')
+            if '-' in fields[0] or '.' in fields[0]:
+                continue
+            index = sentence_start + int(fields[0]) - 1
+            misc = dict(entry.partition('=')[::2] for entry in fields[9].split('|'))
+            entity_iob, entity_type = 2, 0 # outside any entity
+            entity_annotation = misc.get('NER', 'O')
+            if entity_annotation[:2] in ('B-', 'I-'):
+                entity_iob = 3 if entity_annotation.startswith('B') else 1
+                entity_type = strings.add(entity_annotation[2:])
+            dependency_label = 'ROOT' if fields[7].lower() == 'root' else fields[7]
+            head_index = index if fields[6] == '0' else sentence_start + int(fields[6]) - 1
+            rows.append((fields[1], misc.get('SpaceAfter') != 'No', strings.add(fields[4]),
+                    POS_IDS[fields[3]], strings.add(fields[2]), strings.add(dependency_label),
+                    # relative head indexes are stored as unsigned values like in Doc.to_array()
+                    (head_index - index) % 2**64, entity_iob, entity_type))
+        if len(rows) > 0:
+            yield document_id, build_doc(rows)
+
+    def spacy_doc_from_bytes(self, serialized_spacy_doc):
+        """Returns a spaCy document restored from the output of *Doc.to_bytes()*, e.g. as
+            produced by an external service using the same model as this object.
+        """
+        return Doc(self.nlp.vocab).from_bytes(serialized_spacy_doc)
+
+    def holmes_parse_external_doc(self, spacy_doc, *, perform_coreference_resolution=None):
+        """Performs coreference resolution where this is active and has not been switched off,
+            followed by a Holmes parse, on a spaCy document whose text has been parsed
+            elsewhere.
         """
+        self._add_coreference_clusters(spacy_doc, self._resolve_coreference_resolution_option(
+                perform_coreference_resolution))
+        return self.holmes_parse(spacy_doc)
+
+    def _check_document_size(self, text):
         if len(text) > self._maximum_document_size:
             raise DocumentTooBigError(' '.join(('size:', str(len(text)), 'max:',
                     str(self._maximum_document_size))))
-        return self.nlp(text)
+
+    def spacy_parse_documents(self, texts_and_contexts, *, batch_size,
+            perform_coreference_resolution=None):
+        """Performs standard spaCy parses on a stream of texts using *nlp.pipe()*, which
+            processes the texts in batches, each followed by coreference resolution where this
+            is active and has not been switched off. Returns a generator of *(doc, context)*
+            tuples.
+
+        Args:
+
+        texts_and_contexts -- an iterable of *(text, context)* tuples. The contexts are passed
+            through unchanged, e.g. to identify the documents.
+        batch_size -- the number of texts spaCy should buffer and process together.
+        perform_coreference_resolution -- *False* if coreference resolution should be skipped
+            for these texts, or *None* if it should be performed if it is active for this object.
+        """
+        def checked_texts_and_contexts():
+            for text, context in texts_and_contexts:
+                self._check_document_size(text)
+                yield text, context
+
+        perform_coreference_resolution = self._resolve_coreference_resolution_option(
+                perform_coreference_resolution)
+        for doc, context in self.nlp.pipe(checked_texts_and_contexts(), batch_size=batch_size,
+                as_tuples=True):
+            self._add_coreference_clusters(doc, perform_coreference_resolution)
+            yield doc, context
+
+    def parse_documents(self, texts_and_contexts, *, batch_size,
+            perform_coreference_resolution=None):
+        """Performs full spaCy and Holmes parses on a stream of texts, streaming the spaCy
+            documents as they are produced by *nlp.pipe()* through *holmes_parse()*. Returns a
+            generator of *(doc, context)* tuples.
+
+        Args:
+
+        texts_and_contexts -- an iterable of *(text, context)* tuples. The contexts are passed
+            through unchanged, e.g. to identify the documents.
+        batch_size -- the number of texts spaCy should buffer and process together.
+        perform_coreference_resolution -- *False* if coreference resolution should be skipped
+            for these texts, or *None* if it should be performed if it is active for this object.
+        """
+        for spacy_doc, context in self.spacy_parse_documents(texts_and_contexts,
+                batch_size=batch_size,
+                perform_coreference_resolution=perform_coreference_resolution):
+            yield self.holmes_parse(spacy_doc), context
 
     def holmes_parse(self, spacy_doc):
         """Adds the Holmes-specific information to each token within a spaCy document.
+
+        The information is added by the stages returned by *holmes_parse_stages()*, each of
+            which loops once through the document.
         """
+        stage_timings = []
+        for stage_name, token_functions in self._holmes_parse_stages:
+            start_time = time.perf_counter()
+            for token in spacy_doc:
+                for token_function in token_functions:
+                    token_function(token)
+            stage_timings.append((stage_name, time.perf_counter() - start_time))
+        spacy_doc.user_data.pop(self._coreference_clusters_key, None)
         for token in spacy_doc:
-            token._.set('holmes', HolmesDictionary(token.i, self._holmes_lemma(token)))
-        for token in spacy_doc:
-            self._set_negation(token)
-        for token in spacy_doc:
-            self._initialize_semantic_dependencies(token)
-        for token in spacy_doc:
-            self._mark_if_righthand_sibling(token)
-            token._.holmes.token_or_lefthand_sibling_index = self._lefthand_sibling_recursively(
-                    token)
-        for token in spacy_doc:
-            self._copy_any_sibling_info(token)
-        for token in spacy_doc:
-            self._set_coreference_information(token)
-        for token in spacy_doc:
-            self._set_matchability(token)
-        for token in spacy_doc:
-            self._correct_auxiliaries_and_passives(token)
-        for token in spacy_doc:
-            self._copy_any_sibling_info(token)
-        for token in spacy_doc:
-            self._normalize_predicative_adjectives(token)
-        for token in spacy_doc:
-            self._handle_relative_constructions(token)
-        for token in spacy_doc:
-            self._create_additional_preposition_phrase_semantic_dependencies(token)
-        for token in spacy_doc:
-            self._perform_language_specific_tasks(token)
-        for token in spacy_doc:
-            self._create_parent_dependencies(token)
+            token._.holmes.compact()
+        with self._holmes_parse_stage_timings_lock:
+            for stage_name, seconds in stage_timings:
+                self._holmes_parse_stage_timings[stage_name] += seconds
+            self._holmes_parse_document_count += 1
         self.debug_structures(spacy_doc)
         return spacy_doc
 
+    def _create_holmes_parse_stages(self):
+        """Returns a list of *(stage_name, token_functions)* tuples specifying the stages that
+            make up *holmes_parse()* for the current configuration. Within each stage, the token
+            functions are called in order for each token before moving on to the next token, so
+            functions may only share a stage if no function reads information that another
+            function in the same stage writes to a different token.
+        """
+        if self.perform_coreference_resolution:
+            sibling_and_coreference_functions = (self._copy_any_sibling_info,
+                    self._set_coreference_information, self._set_matchability)
+            dictionary_functions = (self._create_holmes_dictionary,)
+        else:
+            # the coreference bookkeeping reduces to each token forming its own chain
+            sibling_and_coreference_functions = (self._copy_any_sibling_info,
+                    self._set_matchability)
+            dictionary_functions = (self._create_holmes_dictionary,
+                    self._set_token_as_own_coreference_chain)
+        return [
+                # lemmas are read from other tokens by most subsequent stages
+                ('dictionaries', dictionary_functions),
+                # righthand siblings are read from other tokens by the following stage
+                ('initial_structure', (self._set_negation,
+                        self._initialize_semantic_dependencies, self._mark_if_righthand_sibling,
+                        self._set_lefthand_sibling_index)),
+                # children are read from other tokens by the following stage
+                ('sibling_information_and_coreference', sibling_and_coreference_functions),
+                ('auxiliaries_and_passives', (self._correct_auxiliaries_and_passives,)),
+                ('corrected_sibling_information', (self._copy_any_sibling_info,)),
+                ('predicative_adjectives', (self._normalize_predicative_adjectives,)),
+                ('relative_constructions', (self._handle_relative_constructions,)),
+                ('preposition_phrases',
+                        (self._create_additional_preposition_phrase_semantic_dependencies,)),
+                ('language_specific_tasks', (self._perform_language_specific_tasks,)),
+                ('parent_dependencies', (self._create_parent_dependencies,))]
+
+    def holmes_parse_stages(self):
+        """Returns the names of the stages that make up *holmes_parse()* in the order in which
+            they are performed.
+        """
+        return [stage_name for stage_name, _ in self._holmes_parse_stages]
+
+    def holmes_parse_stage_timings(self):
+        """Returns a dictionary from the names of the stages that make up *holmes_parse()* to
+            the total wall-clock time in seconds spent within each stage since this object was
+            created or the timings were last reset. The entry with the key *'documents'* contains
+            the number of documents that have been processed in this time. Where documents are
+            parsed on several threads at once, the times spent by all the threads are added
+            together.
+        """
+        with self._holmes_parse_stage_timings_lock:
+            stage_timings = dict(self._holmes_parse_stage_timings)
+            stage_timings['documents'] = self._holmes_parse_document_count
+        return stage_timings
+
+    def reset_holmes_parse_stage_timings(self):
+        with self._holmes_parse_stage_timings_lock:
+            self._holmes_parse_stage_timings = {stage_name: 0.0 for stage_name, _ in
+                    self._holmes_parse_stages}
+            self._holmes_parse_document_count = 0
+
+    def _create_holmes_dictionary(self, token):
+        token._.set('holmes', HolmesDictionary(token.i, self._holmes_lemma(token)))
+
+    def _set_token_as_own_coreference_chain(self, token):
+        token._.holmes.token_and_coreference_chain_indexes = [token.i]
+
+    def _set_lefthand_sibling_index(self, token):
+        token._.holmes.token_or_lefthand_sibling_index = self._lefthand_sibling_recursively(
+                token)
+
+    def phraselet_template_doc(self, phraselet_template):
+        """Returns a new parsed copy of the template sentence of *phraselet_template* that the
+            caller is free to modify. Each template sentence is only parsed once per object,
+            after which copies are assembled from the stored parts of the parsed sentence.
+        """
+        parts = self._phraselet_template_doc_parts.get(phraselet_template.template_sentence)
+        if parts == None:
+            parts = self._doc_parts(self.parse(phraselet_template.template_sentence))
+            self._phraselet_template_doc_parts[phraselet_template.template_sentence] = parts
+        words, spaces, attribute_array, dictionaries = parts
+        return self._holmes_doc_from_parts(words, spaces, attribute_array,
+                [HolmesDictionary.from_serializable(values) for values in dictionaries])
+
+    def add_phraselet_template_doc(self, phraselet_template, holmes_doc):
+        """Supplies a previously parsed template sentence for *phraselet_template*, e.g. one
+            stored with a supervised topic classifier model, so that *phraselet_template_doc()*
+            does not have to parse the template sentence. Has no effect if the template
+            sentence is already held.
+        """
+        if phraselet_template.template_sentence not in self._phraselet_template_doc_parts:
+            self._phraselet_template_doc_parts[phraselet_template.template_sentence] = \
+                    self._doc_parts(holmes_doc)
+
     def model_supports_embeddings(self):
         return self.nlp.meta['vectors']['vectors'] > 0
 
@@ -351,24 +1035,420 @@ class SemanticAnalyzer(ABC):
                         token._.holmes.righthand_siblings, negation_string,
                         uncertainty_string, matchability_string, coreference_string)
 
-    def to_serialized_string(self, spacy_doc):
-        dictionaries = []
-        for token in spacy_doc:
-            dictionaries.append(token._.holmes)
-            token._.holmes = None
-        serialized_document = SerializedHolmesDocument(
-            spacy_doc.to_bytes(), dictionaries, self.model)
-        for token in spacy_doc:
-            token._.holmes = dictionaries[token.i]
-        return jsonpickle.encode(serialized_document)
+    def to_serialized_string(self, spacy_doc, *, compress=False, index=None):
+        """Returns a binary representation of a Holmes document that can be persisted to a
+            file. See *holmes_doc_to_bytes()*.
+        """
+        return self.holmes_doc_to_bytes(spacy_doc, compress=compress, index=index)
 
     def from_serialized_string(self, serialized_spacy_doc):
-        serialized_document = jsonpickle.decode(serialized_spacy_doc)
-        if serialized_document._model != self.model:
-            raise WrongModelDeserializationError(serialized_document._model)
-        if serialized_document._version != SERIALIZED_DOCUMENT_VERSION:
-            raise WrongVersionDeserializationError(serialized_document._version)
-        return serialized_document.holmes_document(self)
+        """Recreates a Holmes document from the output of *to_serialized_string()*. Documents
+            serialized using the *jsonpickle*-based format of earlier versions, which were
+            strings rather than bytes, can also still be read.
+        """
+        return self.from_serialized_string_with_index(serialized_spacy_doc)[0]
+
+    def from_serialized_string_with_index(self, serialized_spacy_doc):
+        """Returns a tuple of the Holmes document recreated from the output of
+            *to_serialized_string()* and the index stored with it, or *None* if no index was
+            stored.
+        """
+        if isinstance(serialized_spacy_doc, str):
+            import jsonpickle # deferred to avoid the import cost for other uses
+            serialized_document = jsonpickle.decode(serialized_spacy_doc)
+            if serialized_document._model != self.model:
+                raise WrongModelDeserializationError(serialized_document._model)
+            if serialized_document._version != JSONPICKLE_SERIALIZED_DOCUMENT_VERSION:
+                raise WrongVersionDeserializationError(serialized_document._version)
+            return serialized_document.holmes_document(self), None
+        return self.holmes_doc_and_index_from_bytes(serialized_spacy_doc)
+
+    def pipeline_component(self):
+        """Returns a new spaCy pipeline component that performs the Holmes semantic analysis
+            using this object.
+        """
+        return HolmesPipelineComponent(self)
+
+    def holmes_doc_to_bytes(self, holmes_doc, *, compress=False, index=None):
+        """Returns a byte representation of a Holmes document. The per-token Holmes
+            information is stored column by column in arrays rather than token by token, which
+            keeps the representation small and quick to decode. Unlike the output of
+            *Doc.to_bytes()*, which cannot contain *HolmesDictionary* objects, the
+            representation can also be passed between processes without pickling.
+
+        Args:
+
+        holmes_doc -- the Holmes document.
+        compress -- if *True*, the representation is additionally compressed using *zlib*.
+        index -- optionally, a *(fingerprint, words_to_token_indexes_dict)* tuple holding the
+            index built for the document by a *StructuralMatcher*, which is stored with the
+            document so that it does not have to be built again when the document is read.
+        """
+        serialized_document = {
+                'spacy_document': holmes_doc.to_bytes(exclude=['user_data']),
+                'columns': self._holmes_dictionary_columns(holmes_doc)}
+        if index != None:
+            serialized_document['index'] = self._index_columns(*index)
+        payload = msgpack.packb(serialized_document, use_bin_type=True)
+        if compress:
+            payload = zlib.compress(payload)
+        return msgpack.packb({
+                'model': self.model,
+                'version': SERIALIZED_DOCUMENT_VERSION,
+                'compressed': compress,
+                'payload': payload}, use_bin_type=True)
+
+    def holmes_doc_from_bytes(self, serialized_holmes_doc):
+        """Recreates a Holmes document from the output of *holmes_doc_to_bytes()*."""
+        return self.holmes_doc_and_index_from_bytes(serialized_holmes_doc)[0]
+
+    def holmes_doc_and_index_from_bytes(self, serialized_holmes_doc):
+        """Returns a tuple of the Holmes document recreated from the output of
+            *holmes_doc_to_bytes()* and the *(fingerprint, words_to_token_indexes_dict)* tuple
+            stored with it, or *None* if no index was stored.
+        """
+        envelope = msgpack.unpackb(serialized_holmes_doc, raw=False)
+        if envelope['model'] != self.model:
+            raise WrongModelDeserializationError(envelope['model'])
+        if envelope['version'] != SERIALIZED_DOCUMENT_VERSION:
+            raise WrongVersionDeserializationError(envelope['version'])
+        payload = envelope['payload']
+        if envelope['compressed']:
+            payload = zlib.decompress(payload)
+        serialized_document = msgpack.unpackb(payload, raw=False)
+        doc = Doc(self.nlp.vocab).from_bytes(serialized_document['spacy_document'],
+                exclude=['user_data'])
+        for token, holmes_dictionary in zip(doc, self._holmes_dictionaries_from_columns(
+                serialized_document['columns'])):
+            token._.holmes = holmes_dictionary
+        if 'index' in serialized_document:
+            return doc, self._index_from_columns(serialized_document['index'])
+        return doc, None
+
+    def _index_columns(self, fingerprint, words_to_token_indexes_dict):
+        """Returns a dictionary holding a document index in the form used by
+            *holmes_doc_to_bytes()*: the words, the number of token indexes for each word and the
+            flattened token indexes as a little-endian 32-bit array.
+        """
+        return {
+                'fingerprint': fingerprint,
+                'words': list(words_to_token_indexes_dict.keys()),
+                'counts': numpy.array([len(token_indexes) for token_indexes in
+                        words_to_token_indexes_dict.values()], dtype='<i4').tobytes(),
+                'token_indexes': numpy.array([token_index for token_indexes in
+                        words_to_token_indexes_dict.values() for token_index in token_indexes],
+                        dtype='<i4').tobytes()}
+
+    def _index_from_columns(self, index_columns):
+        """Returns the *(fingerprint, words_to_token_indexes_dict)* tuple stored in a
+            dictionary returned from *_index_columns()*.
+        """
+        token_indexes = numpy.frombuffer(index_columns['token_indexes'], dtype='<i4').tolist()
+        words_to_token_indexes_dict = {}
+        position = 0
+        for word, count in zip(index_columns['words'], numpy.frombuffer(index_columns['counts'],
+                dtype='<i4').tolist()):
+            words_to_token_indexes_dict[word] = token_indexes[position:position + count]
+            position += count
+        return index_columns['fingerprint'], words_to_token_indexes_dict
+
+    def _holmes_dictionary_columns(self, holmes_doc):
+        """Returns a dictionary from column names to the values of the Holmes dictionaries of
+            the tokens in *holmes_doc*. Integer columns are stored as little-endian 32-bit
+            arrays, with -1 standing for *None* where a value is optional. Lists held by each
+            token are flattened into a values column and a column with the number of values
+            belonging to each token. Dependency labels are replaced by indexes into a label
+            table.
+        """
+        labels = []
+        labels_to_ids = {}
+
+        def label_id(label):
+            if label not in labels_to_ids:
+                labels_to_ids[label] = len(labels)
+                labels.append(label)
+            return labels_to_ids[label]
+
+        def optional(value):
+            return -1 if value == None else int(value)
+
+        def column(values, dtype='<i4'):
+            return numpy.array(values, dtype=dtype).tobytes()
+
+        columns = {name: [] for name in (
+                'children_counts', 'children_parent_indexes', 'children_child_indexes',
+                'children_label_ids', 'children_uncertain', 'righthand_sibling_counts',
+                'righthand_siblings', 'lefthand_sibling_indexes', 'or_conjunction', 'negated',
+                'matchable', 'parent_dependency_counts', 'parent_dependency_indexes',
+                'parent_dependency_label_ids', 'coreference_chain_counts',
+                'coreference_chain_indexes', 'mention_counts', 'mention_root_indexes',
+                'mention_index_counts', 'mention_indexes', 'mention_root_index')}
+        lemmas = []
+        for token in holmes_doc:
+            holmes_dictionary = token._.holmes
+            lemmas.append(holmes_dictionary.lemma)
+            columns['children_counts'].append(len(holmes_dictionary.children))
+            for dependency in holmes_dictionary.children:
+                columns['children_parent_indexes'].append(dependency.parent_index)
+                columns['children_child_indexes'].append(dependency.child_index)
+                columns['children_label_ids'].append(label_id(dependency.label))
+                columns['children_uncertain'].append(dependency.is_uncertain)
+            columns['righthand_sibling_counts'].append(len(holmes_dictionary.righthand_siblings))
+            columns['righthand_siblings'].extend(holmes_dictionary.righthand_siblings)
+            columns['lefthand_sibling_indexes'].append(optional(
+                    holmes_dictionary.token_or_lefthand_sibling_index))
+            columns['or_conjunction'].append(holmes_dictionary.is_involved_in_or_conjunction)
+            columns['negated'].append(optional(holmes_dictionary.is_negated))
+            columns['matchable'].append(optional(holmes_dictionary.is_matchable))
+            columns['parent_dependency_counts'].append(
+                    len(holmes_dictionary.parent_dependencies))
+            for index, label in holmes_dictionary.parent_dependencies:
+                columns['parent_dependency_indexes'].append(index)
+                columns['parent_dependency_label_ids'].append(label_id(label))
+            if holmes_dictionary.token_and_coreference_chain_indexes == None:
+                columns['coreference_chain_counts'].append(-1)
+            else:
+                columns['coreference_chain_counts'].append(
+                        len(holmes_dictionary.token_and_coreference_chain_indexes))
+                columns['coreference_chain_indexes'].extend(
+                        holmes_dictionary.token_and_coreference_chain_indexes)
+            columns['mention_counts'].append(len(holmes_dictionary.mentions))
+            for mention in holmes_dictionary.mentions:
+                columns['mention_root_indexes'].append(mention.root_index)
+                columns['mention_index_counts'].append(len(mention.indexes))
+                columns['mention_indexes'].extend(mention.indexes)
+            columns['mention_root_index'].append(optional(holmes_dictionary.mention_root_index))
+        serializable_columns = {name: column(values, '<i1' if name in ('children_uncertain',
+                'or_conjunction', 'negated', 'matchable') else '<i4')
+                for name, values in columns.items()}
+        serializable_columns['lemmas'] = lemmas
+        serializable_columns['labels'] = labels
+        return serializable_columns
+
+    def _holmes_dictionaries_from_columns(self, serializable_columns):
+        """Generator over the Holmes dictionaries stored in columns returned from
+            *_holmes_dictionary_columns()*.
+        """
+        columns = {name: numpy.frombuffer(values, dtype='<i1' if name in ('children_uncertain',
+                'or_conjunction', 'negated', 'matchable') else '<i4').tolist()
+                for name, values in serializable_columns.items()
+                if name not in ('lemmas', 'labels')}
+        labels = serializable_columns['labels']
+
+        def optional(value):
+            return None if value == -1 else value
+
+        def optional_boolean(value):
+            return None if value == -1 else value == 1
+
+        # positions reached within the flattened values columns
+        child_position = sibling_position = parent_dependency_position = 0
+        coreference_position = mention_position = mention_index_position = 0
+        for index, lemma in enumerate(serializable_columns['lemmas']):
+            holmes_dictionary = HolmesDictionary(index, lemma)
+            next_position = child_position + columns['children_counts'][index]
+            holmes_dictionary.children = [SemanticDependency(parent_index, child_index,
+                    labels[label_id], is_uncertain == 1) for parent_index, child_index,
+                    label_id, is_uncertain in zip(
+                    columns['children_parent_indexes'][child_position:next_position],
+                    columns['children_child_indexes'][child_position:next_position],
+                    columns['children_label_ids'][child_position:next_position],
+                    columns['children_uncertain'][child_position:next_position])]
+            child_position = next_position
+            next_position = sibling_position + columns['righthand_sibling_counts'][index]
+            holmes_dictionary.righthand_siblings = \
+                    columns['righthand_siblings'][sibling_position:next_position]
+            sibling_position = next_position
+            holmes_dictionary.token_or_lefthand_sibling_index = optional(
+                    columns['lefthand_sibling_indexes'][index])
+            holmes_dictionary.is_involved_in_or_conjunction = \
+                    columns['or_conjunction'][index] == 1
+            holmes_dictionary.is_negated = optional_boolean(columns['negated'][index])
+            holmes_dictionary.is_matchable = optional_boolean(columns['matchable'][index])
+            next_position = parent_dependency_position + \
+                    columns['parent_dependency_counts'][index]
+            holmes_dictionary.parent_dependencies = [[parent_index, labels[label_id]] for
+                    parent_index, label_id in zip(
+                    columns['parent_dependency_indexes'][
+                    parent_dependency_position:next_position],
+                    columns['parent_dependency_label_ids'][
+                    parent_dependency_position:next_position])]
+            parent_dependency_position = next_position
+            coreference_chain_count = columns['coreference_chain_counts'][index]
+            if coreference_chain_count >= 0:
+                next_position = coreference_position + coreference_chain_count
+                holmes_dictionary.token_and_coreference_chain_indexes = \
+                        columns['coreference_chain_indexes'][coreference_position:next_position]
+                coreference_position = next_position
+            mentions = []
+            for _ in range(columns['mention_counts'][index]):
+                next_position = mention_index_position + \
+                        columns['mention_index_counts'][mention_position]
+                mentions.append(Mention(columns['mention_root_indexes'][mention_position],
+                        columns['mention_indexes'][mention_index_position:next_position]))
+                mention_position += 1
+                mention_index_position = next_position
+            holmes_dictionary.mentions = mentions
+            holmes_dictionary.mention_root_index = optional(columns['mention_root_index'][index])
+            holmes_dictionary.compact()
+            yield holmes_dictionary
+
+    def write_corpus_bundle(self, path, labels_and_docs):
+        """Writes Holmes documents into a single bundle file that can be read using
+            *read_corpus_bundle()*. The strings used by the documents are stored once in a
+            shared string table, and the file ends with an offset table from which individual
+            documents can be located without the rest of the file being decoded.
+
+        Args:
+
+        path -- the path of the bundle file.
+        labels_and_docs -- an iterable of *(label, doc, index, content_hash)* tuples, where
+            *index* is either *None* or a *(fingerprint, words_to_token_indexes_dict)* tuple as
+            accepted by *holmes_doc_to_bytes()* and *content_hash* is either *None* or the hash
+            under which the document was registered, which is stored in the offset table so
+            that documents registered later with identical content can share the document once
+            it has been loaded. A document object supplied with several labels is only written
+            once.
+        """
+        strings = []
+        strings_to_ids = {}
+
+        def string_id(string):
+            if string not in strings_to_ids:
+                strings_to_ids[string] = len(strings)
+                strings.append(string)
+            return strings_to_ids[string]
+
+        def string_id_column(strings):
+            return numpy.array([string_id(string) for string in strings], dtype='<i4').tobytes()
+
+        # Dict from document object ids to the documents and the offsets and lengths of their
+        # entries. The documents are held to prevent their ids being reused.
+        doc_ids_to_entries = {}
+        document_entries = []
+        labels_to_content_hashes = {}
+        with open(path, 'wb') as file:
+            file.write(CORPUS_BUNDLE_MAGIC)
+            for label, doc, index, content_hash in labels_and_docs:
+                if id(doc) not in doc_ids_to_entries:
+                    for token in doc: # the strings the attribute array refers to by hash
+                        for string in (token.tag_, token.lemma_, token.dep_, token.ent_type_):
+                            string_id(string)
+                    columns = self._holmes_dictionary_columns(doc)
+                    columns['lemmas'] = string_id_column(columns['lemmas'])
+                    columns['labels'] = string_id_column(columns['labels'])
+                    entry = {
+                            'words': string_id_column(token.text for token in doc),
+                            'spaces': numpy.array([token.whitespace_ != '' for token in doc],
+                                    dtype='<i1').tobytes(),
+                            'attributes': doc.to_array(self._document_attributes).astype(
+                                    '<u8').tobytes(),
+                            'columns': columns}
+                    if index != None:
+                        entry['index'] = self._index_columns(*index)
+                        entry['index']['words'] = string_id_column(entry['index']['words'])
+                    entry = msgpack.packb(entry, use_bin_type=True)
+                    doc_ids_to_entries[id(doc)] = (doc, file.tell(), len(entry))
+                    file.write(entry)
+                _, offset, length = doc_ids_to_entries[id(doc)]
+                document_entries.append([label, offset, length])
+                if content_hash != None:
+                    labels_to_content_hashes[label] = content_hash
+            index_offset = file.tell()
+            # the content hashes are held in an entry of their own so that bundles written by
+            # earlier versions, which lack it, can still be read
+            file.write(msgpack.packb({
+                    'model': self.model,
+                    'version': CORPUS_BUNDLE_VERSION,
+                    'strings': strings,
+                    'documents': document_entries,
+                    'content_hashes': labels_to_content_hashes}, use_bin_type=True))
+            file.write(struct.pack('<Q', index_offset))
+
+    def _read_corpus_bundle_index(self, path, mapped_file):
+        if mapped_file[:len(CORPUS_BUNDLE_MAGIC)] != CORPUS_BUNDLE_MAGIC:
+            raise ValueError(' '.join((path, 'is not a Holmes corpus bundle')))
+        index_offset = struct.unpack('<Q', mapped_file[-8:])[0]
+        index = msgpack.unpackb(mapped_file[index_offset:-8], raw=False)
+        if index['model'] != self.model:
+            raise WrongModelDeserializationError(index['model'])
+        if index['version'] != CORPUS_BUNDLE_VERSION:
+            raise WrongVersionDeserializationError(index['version'])
+        return index
+
+    def _corpus_bundle_shard(self, index, shard_index, number_of_shards):
+        """Returns a list of *(offset, length, labels, content_hash)* tuples for the documents
+            in a bundle that belong to shard *shard_index* out of *number_of_shards*, where
+            *content_hash* is *None* if no content hash was stored for the document. Documents
+            shared by several labels are assigned to shards as a whole, and documents with
+            content hashes are assigned to the shards returned by *content_hash_shard_index()*.
+        """
+        labels_to_content_hashes = index.get('content_hashes', {})
+        offsets_to_entries = {}
+        for label, offset, length in index['documents']:
+            if offset not in offsets_to_entries:
+                offsets_to_entries[offset] = (offset, length, [],
+                        labels_to_content_hashes.get(label))
+            offsets_to_entries[offset][2].append(label)
+
+        def shard_index_of_entry(counter, entry):
+            if entry[3] == None:
+                return counter % number_of_shards
+            return content_hash_shard_index(entry[3], number_of_shards)
+
+        return [entry for counter, entry in enumerate(offsets_to_entries.values()) if
+                shard_index_of_entry(counter, entry) == shard_index]
+
+    def read_corpus_bundle_labels(self, path, *, shard_index=0, number_of_shards=1):
+        """Returns the labels of the documents in a bundle written using
+            *write_corpus_bundle()* that belong to shard *shard_index* out of
+            *number_of_shards*, reading only the offset table.
+        """
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                index = self._read_corpus_bundle_index(path, mapped_file)
+        return [label for _, _, labels, _ in self._corpus_bundle_shard(index, shard_index,
+                number_of_shards) for label in labels]
+
+    def read_corpus_bundle(self, path, *, shard_index=0, number_of_shards=1):
+        """Generator over *(labels, doc, index, content_hash)* tuples for the documents in a
+            bundle written using *write_corpus_bundle()*, where *labels* is the list of labels
+            the document was written with, *index* is the
+            *(fingerprint, words_to_token_indexes_dict)* tuple written with the document or
+            *None* and *content_hash* is the content hash written with the document or *None*.
+            The file is memory-mapped and only the documents belonging to shard *shard_index*
+            out of *number_of_shards* are decoded, e.g. so that each of several processes can
+            load a different part of the same bundle.
+        """
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                index = self._read_corpus_bundle_index(path, mapped_file)
+                strings = index['strings']
+                for string in strings:
+                    self.nlp.vocab.strings.add(string)
+
+                def strings_from_ids(column):
+                    return [strings[string_id] for string_id in
+                            numpy.frombuffer(column, dtype='<i4').tolist()]
+
+                for offset, length, labels, content_hash in self._corpus_bundle_shard(index,
+                        shard_index, number_of_shards):
+                    entry = msgpack.unpackb(mapped_file[offset:offset + length], raw=False)
+                    words = strings_from_ids(entry['words'])
+                    columns = entry['columns']
+                    columns['lemmas'] = strings_from_ids(columns['lemmas'])
+                    columns['labels'] = strings_from_ids(columns['labels'])
+                    index = None
+                    if 'index' in entry:
+                        entry['index']['words'] = strings_from_ids(entry['index']['words'])
+                        index = self._index_from_columns(entry['index'])
+                    yield labels, self._holmes_doc_from_parts(words,
+                            [space == 1 for space in numpy.frombuffer(entry['spaces'],
+                            dtype='<i1').tolist()],
+                            numpy.frombuffer(entry['attributes'], dtype='<u8').reshape(
+                            (len(words), len(self._document_attributes))).copy(),
+                            list(self._holmes_dictionaries_from_columns(columns))), index, \
+                            content_hash
 
     def get_dependent_phrase(self, token):
         "Return the dependent phrase of a token. Used in building match dictionaries"
@@ -393,10 +1473,9 @@ class SemanticAnalyzer(ABC):
 
     def _set_coreference_information(self, token):
         token._.holmes.token_and_coreference_chain_indexes = [token.i]
-        if not self.perform_coreference_resolution or not token.doc._.has_coref or not \
-                token._.in_coref:
+        if not self.perform_coreference_resolution:
             return
-        for cluster in token._.coref_clusters:
+        for cluster in self._coreference_clusters_containing(token):
             counter = 0
             this_token_mention_index = -1
             for span in cluster:
@@ -539,6 +1618,13 @@ class SemanticAnalyzer(ABC):
     def _holmes_lemma(self, token):
         pass
 
+    @abstractmethod
+    def _lazy_candidate_compound_lemmas(self, spacy_doc):
+        """Returns the lemmas *_holmes_lemma()* might assign on the basis of dependencies to
+            tokens within a document that has not yet been dependency-parsed.
+        """
+        pass
+
     def _initialize_semantic_dependencies(self, token):
         for child in (child for child in token.children if child.dep_ != 'punct' and child.tag_
                 not in self._semantic_dependency_excluded_tags):
@@ -1117,6 +2203,12 @@ class EnglishSemanticAnalyzer(SemanticAnalyzer):
                     return ' '.join([token.lemma_.lower(), child.lemma_.lower()])
         return token.lemma_.lower()
 
+    def _lazy_candidate_compound_lemmas(self, spacy_doc):
+        for token in (token for token in spacy_doc if token.tag_ == 'RP'):
+            for verb in (verb for verb in spacy_doc[max(token.i - self._lazy_particle_window,
+                    0):token.i] if verb.pos_ == 'VERB'):
+                yield ' '.join([verb.lemma_.lower(), token.lemma_.lower()])
+
     def _perform_language_specific_tasks(self, token):
 
         # Because phrasal verbs are conflated into a single lemma, remove the dependency
@@ -1534,6 +2626,15 @@ class GermanSemanticAnalyzer(SemanticAnalyzer):
             return token.lemma_.lower().rstrip('e')
         return token.lemma_.lower()
 
+    def _lazy_candidate_compound_lemmas(self, spacy_doc):
+        for token in (token for token in spacy_doc if token.tag_ == 'PTKVZ'):
+            particle_lemma = token.lemma_.lower()
+            if particle_lemma == 'einen':
+                particle_lemma = 'ein'
+            for verb in (verb for verb in spacy_doc[max(token.i - self._lazy_particle_window,
+                    0):token.i] if verb.pos_ in ('VERB','AUX')):
+                yield ''.join([particle_lemma, verb.lemma_.lower()])
+
     def _perform_language_specific_tasks(self, token):
 
         # Because separable verbs are conflated into a single lemma, remove the dependency
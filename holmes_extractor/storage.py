@@ -0,0 +1,211 @@
+import os
+import struct
+import uuid
+import msgpack
+from collections import OrderedDict
+from threading import Lock
+
+SNAPSHOT_LOG_MAGIC = b'HOLMESLOG\x01'
+
+class DocumentStore:
+    """Holds the serialized representations of registered documents on disk so that only the
+        indexes of the documents need to be kept in memory. A document is materialized from
+        disk when it is required, and materialized documents are held in memory ordered by
+        recency of use until the total size of their serialized representations exceeds a
+        memory budget, whereupon the least recently used documents are evicted. Each stored
+        document is removed from disk when the object that registered it is discarded. This
+        class is threadsafe.
+
+    Parameters:
+
+    directory -- the directory within which serialized documents are stored.
+    memory_budget -- the maximum total size in bytes of the serialized representations of the
+        documents held materialized in memory. A materialized document occupies several times
+        the size of its serialized representation. The most recently used document is always
+        held, even if it exceeds the budget on its own.
+    """
+
+    def __init__(self, *, directory, memory_budget=100000000):
+        if memory_budget < 1:
+            raise ValueError('memory_budget must be at least 1')
+        self.directory = directory
+        self.memory_budget = memory_budget
+        os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict() # from keys to *(document, size)* tuples
+        self._bytes_in_memory = 0
+        self._lock = Lock()
+        self._hits = 0
+        self._loads = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def _path(self, key):
+        return os.sep.join((self.directory, ''.join((key, '.holmes'))))
+
+    def put(self, serialized_doc):
+        """Writes a serialized document to disk and returns the key under which it is stored."""
+        key = uuid.uuid4().hex
+        temporary_path = ''.join((self._path(key), '.tmp'))
+        with open(temporary_path, 'wb') as file:
+            file.write(serialized_doc)
+        os.replace(temporary_path, self._path(key))
+        return key
+
+    def get(self, key, materialize_function):
+        """Returns the document stored under *key*, materializing it from its serialized
+            representation using *materialize_function* if it is not held in memory.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry != None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+        with open(self._path(key), 'rb') as file:
+            serialized_doc = file.read()
+        doc = materialize_function(serialized_doc)
+        with self._lock:
+            self._loads += 1
+            if key in self._entries: # materialized concurrently by another thread
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            self._entries[key] = (doc, len(serialized_doc))
+            self._bytes_in_memory += len(serialized_doc)
+            while self._bytes_in_memory > self.memory_budget and len(self._entries) > 1:
+                _, (_, size) = self._entries.popitem(last=False)
+                self._bytes_in_memory -= size
+        return doc
+
+    def remove(self, key):
+        """Removes the document stored under *key* from memory and from disk."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry != None:
+                self._bytes_in_memory -= entry[1]
+        if os.path.isfile(self._path(key)):
+            os.remove(self._path(key))
+
+    def clear(self):
+        """Evicts all materialized documents from memory and resets the statistics. Documents
+            stored on disk are retained.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes_in_memory = 0
+            self._hits = 0
+            self._loads = 0
+
+    def statistics(self):
+        """Returns a dictionary containing the number of documents held in memory, the total
+            size of their serialized representations, and the numbers of hits and of loads from
+            disk since the store was created or last cleared.
+        """
+        with self._lock:
+            return {
+                    'documents_in_memory': len(self._entries),
+                    'bytes_in_memory': self._bytes_in_memory,
+                    'hits': self._hits,
+                    'loads': self._loads}
+
+class SnapshotDirectory:
+    """Manages the files of a corpus snapshot within a directory: a base corpus bundle together
+        with an append-only log of the changes made to the corpus since the bundle was written.
+        A file named *CURRENT* holds the id of the current base bundle and log and is replaced
+        atomically when a new base bundle is written, so that an interrupted write never leaves
+        the directory without a complete snapshot. Each log record is prefixed with its length,
+        and a trailing record left incomplete by an interrupted write is ignored when the log is
+        read.
+
+    Parameters:
+
+    directory -- the directory within which the snapshot files are stored.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+
+    def _path(self, name):
+        return os.sep.join((self.directory, name))
+
+    def base_path(self, snapshot_id):
+        return self._path(''.join((snapshot_id, '.holmes')))
+
+    def log_path(self, snapshot_id):
+        return self._path(''.join((snapshot_id, '.log')))
+
+    def current_id(self):
+        """Returns the id of the current snapshot, or *None* if the directory contains no
+            snapshot.
+        """
+        if not os.path.isfile(self._path('CURRENT')):
+            return None
+        with open(self._path('CURRENT'), encoding='utf-8') as file:
+            return file.read().strip()
+
+    def new_id(self):
+        """Returns an id for a new base bundle, creating the directory if necessary."""
+        os.makedirs(self.directory, exist_ok=True)
+        return uuid.uuid4().hex
+
+    def make_current(self, snapshot_id):
+        """Creates an empty log for *snapshot_id*, whose base bundle must already have been
+            written, makes it the current snapshot and removes the files of the previous
+            snapshot. Returns the size of the new log.
+        """
+        previous_id = self.current_id()
+        with open(self.log_path(snapshot_id), 'wb') as file:
+            file.write(SNAPSHOT_LOG_MAGIC)
+            file.flush()
+            os.fsync(file.fileno())
+        temporary_path = self._path('CURRENT.tmp')
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            file.write(snapshot_id)
+        os.replace(temporary_path, self._path('CURRENT'))
+        if previous_id != None and previous_id != snapshot_id:
+            for path in (self.base_path(previous_id), self.log_path(previous_id)):
+                if os.path.isfile(path):
+                    os.remove(path)
+        return len(SNAPSHOT_LOG_MAGIC)
+
+    def append(self, snapshot_id, record):
+        """Appends *record* to the log of *snapshot_id* and returns the new size of the log. If
+            the record cannot be written completely, the log is restored to its previous size.
+        """
+        payload = msgpack.packb(record, use_bin_type=True)
+        with open(self.log_path(snapshot_id), 'r+b') as file:
+            size = file.seek(0, os.SEEK_END)
+            try:
+                file.write(struct.pack('<Q', len(payload)))
+                file.write(payload)
+                file.flush()
+                os.fsync(file.fileno())
+            except:
+                file.truncate(size)
+                raise
+            return file.tell()
+
+    def records(self, snapshot_id):
+        """Yields *(record, end_offset)* tuples for the complete records in the log of
+            *snapshot_id*, where *end_offset* is the size of the log up to and including the
+            record.
+        """
+        with open(self.log_path(snapshot_id), 'rb') as file:
+            if file.read(len(SNAPSHOT_LOG_MAGIC)) != SNAPSHOT_LOG_MAGIC:
+                raise ValueError(' '.join((self.log_path(snapshot_id),
+                        'is not a Holmes snapshot log')))
+            while True:
+                length = file.read(8)
+                if len(length) < 8:
+                    return
+                length = struct.unpack('<Q', length)[0]
+                payload = file.read(length)
+                if len(payload) < length:
+                    return
+                yield msgpack.unpackb(payload, raw=False), file.tell()
@@ -1,14 +1,20 @@
 import copy
+import sys
+import weakref
+import msgpack
 from .errors import *
 from .semantics import SemanticDependency
 from threading import Lock
 
+SERIALIZED_SEARCH_PHRASES_VERSION = 1
+
 class WordMatch:
     """A match between a searched phrase word and a document word.
 
     Properties:
 
-    search_phrase_token -- the spaCy token from the search phrase.
+    search_phrase_token -- the spaCy token from the search phrase, or a lightweight token
+        offering the same attributes where the search phrase is a topic match phraselet.
     search_phrase_word -- the word that matched from the search phrase.
     document_token -- the spaCy token from the document.
     first_document_token -- the first token that matched from the document, which will equal
@@ -109,6 +115,7 @@ class Match:
         match_to_return.is_negated = self.is_negated
         match_to_return.is_uncertain = self.is_uncertain
         match_to_return.index_within_document = self.index_within_document
+        match_to_return.overall_similarity_measure = self.overall_similarity_measure
         return match_to_return
 
 class SerializedPhraselet:
@@ -153,8 +160,23 @@ class ThreadsafeContainer:
 
     def __init__(self):
         self._search_phrases = []
-        # Dict from document labels to IndexedDocument objects
+        # Dict from document labels to IndexedDocument objects. Documents with identical
+        # content share a single IndexedDocument object.
         self._indexed_documents = {}
+        # Dict from content hashes to the labels of the documents registered with them
+        self._content_hashes_to_labels = {}
+        # Dict from document labels to the content hashes they were registered with
+        self._labels_to_content_hashes = {}
+        # Corpus-wide postings index: dict from words to the labels of the documents that
+        # contain them or, for documents not yet parsed, may contain them
+        self._postings = {}
+        # Dict from document labels to tuples of the number recording the order in which each
+        # document was registered and the words under which it was added to the postings
+        self._labels_to_postings_entries = {}
+        self._next_sequence_number = 0
+        # Set of the labels of documents registered or removed since change tracking was last
+        # started, or *None* if changes are not being tracked
+        self._changed_labels = None
         self._lock = Lock()
 
     def remove_all_search_phrases(self):
@@ -176,19 +198,125 @@ class ThreadsafeContainer:
                     self._search_phrases]))
         return search_phrase_labels
 
-    def register_document(self, indexed_document, label):
+    def register_document(self, indexed_document, label, content_hash=None):
+        """Registers *indexed_document* under *label*. If *content_hash* is not *None*,
+            documents registered later with the same content hash can share *indexed_document*.
+        """
+        with self._lock:
+            if label in self._indexed_documents.keys():
+                raise DuplicateDocumentError(label)
+            self._indexed_documents[label] = indexed_document
+            if content_hash != None:
+                self._content_hashes_to_labels.setdefault(content_hash, []).append(label)
+                self._labels_to_content_hashes[label] = content_hash
+            self._add_postings(indexed_document, label)
+            if self._changed_labels != None:
+                self._changed_labels.add(label)
+
+    def register_duplicate_document(self, label, content_hash):
+        """Registers under *label* the indexed document that was registered with
+            *content_hash* and returns it, or returns *None* if no document with *content_hash*
+            is registered.
+        """
         with self._lock:
+            if content_hash not in self._content_hashes_to_labels:
+                return None
             if label in self._indexed_documents.keys():
                 raise DuplicateDocumentError(label)
+            labels = self._content_hashes_to_labels[content_hash]
+            indexed_document = self._indexed_documents[labels[0]]
             self._indexed_documents[label] = indexed_document
+            labels.append(label)
+            self._labels_to_content_hashes[label] = content_hash
+            self._add_postings(indexed_document, label)
+            if self._changed_labels != None:
+                self._changed_labels.add(label)
+            return indexed_document
+
+    def _add_postings(self, indexed_document, label):
+        words = indexed_document.candidate_words
+        if words == None:
+            words = indexed_document.words_to_token_indexes_dict.keys()
+        for word in words:
+            self._postings.setdefault(word, set()).add(label)
+        self._labels_to_postings_entries[label] = (self._next_sequence_number, words)
+        self._next_sequence_number += 1
+
+    def _remove_postings(self, label):
+        _, words = self._labels_to_postings_entries.pop(label)
+        for word in words:
+            labels = self._postings[word]
+            labels.discard(label)
+            if len(labels) == 0:
+                self._postings.pop(word)
+
+    def document_labels_containing(self, words):
+        """Returns a list of the labels of the registered documents that contain or may
+            contain any of *words* in the order in which the documents were registered. A
+            multiword is taken to be contained by documents containing all its component words.
+        """
+        with self._lock:
+            labels = set()
+            for word in words:
+                labels.update(self._postings.get(word, ()))
+                if ' ' in word:
+                    parts = word.split()
+                    part_labels = set(self._postings.get(parts[0], ()))
+                    for part in parts[1:]:
+                        part_labels.intersection_update(self._postings.get(part, ()))
+                    labels.update(part_labels)
+            return sorted(labels, key=lambda label: self._labels_to_postings_entries[label][0])
+
+    def contains_content_hash(self, content_hash):
+        with self._lock:
+            return content_hash in self._content_hashes_to_labels
 
     def remove_document(self, label):
         with self._lock:
             self._indexed_documents.pop(label)
+            self._remove_postings(label)
+            content_hash = self._labels_to_content_hashes.pop(label, None)
+            if content_hash != None:
+                labels = self._content_hashes_to_labels[content_hash]
+                labels.remove(label)
+                if len(labels) == 0:
+                    self._content_hashes_to_labels.pop(content_hash)
+            if self._changed_labels != None:
+                self._changed_labels.add(label)
 
     def remove_all_documents(self):
         with self._lock:
+            if self._changed_labels != None:
+                self._changed_labels.update(self._indexed_documents.keys())
             self._indexed_documents = {}
+            self._content_hashes_to_labels = {}
+            self._labels_to_content_hashes = {}
+            self._postings = {}
+            self._labels_to_postings_entries = {}
+
+    def track_changes(self, changed_labels=()):
+        """Starts recording the labels of documents that are registered or removed, discarding
+            any labels already recorded. *changed_labels* are recorded as already changed.
+        """
+        with self._lock:
+            self._changed_labels = set(changed_labels)
+
+    def take_changed_labels(self):
+        """Returns the set of labels recorded since changes were last tracked or taken and
+            starts a new empty set.
+        """
+        with self._lock:
+            changed_labels = self._changed_labels
+            self._changed_labels = set()
+        return changed_labels
+
+    def restore_changed_labels(self, changed_labels):
+        """Records labels returned by *take_changed_labels()* as changed again, e.g. because the
+            changes could not be persisted.
+        """
+        with self._lock:
+            if self._changed_labels != None:
+                self._changed_labels.update(changed_labels)
 
     def document_labels(self):
         """Returns a list of the labels of the currently registered documents."""
@@ -205,10 +333,21 @@ class ThreadsafeContainer:
                 document = None
         return document
 
+    def get_indexed_document(self, label):
+        with self._lock:
+            return self._indexed_documents.get(label)
+
     def get_indexed_documents(self):
         with self._lock:
             return self._indexed_documents.copy()
 
+    def get_content_hashes(self):
+        """Returns a dictionary from the labels of documents registered with content hashes to
+            the content hashes.
+        """
+        with self._lock:
+            return self._labels_to_content_hashes.copy()
+
     def get_search_phrases(self):
         with self._lock:
             return self._search_phrases.copy()
@@ -238,6 +377,13 @@ class StructuralMatcher:
         self.embedding_based_matching_on_root_words = embedding_based_matching_on_root_words
         self.perform_coreference_resolution = perform_coreference_resolution
 
+    @property
+    def index_fingerprint(self):
+        """Identifies the ontology information document indexes depend on. Evaluated on each
+            access because a supervised topic classifier may replace the ontology.
+        """
+        return None if self.ontology == None else self.ontology.multiword_fingerprint()
+
     class _SearchPhrase:
 
         def __init__(self, doc, matchable_tokens, root_token,
@@ -246,7 +392,8 @@ class StructuralMatcher:
                 topic_match_phraselet_created_without_matching_tags, reverse_only):
             """Args:
 
-            doc -- the Holmes document created for the search phrase
+            doc -- the Holmes document created for the search phrase, or a *_PhraseletDoc* for a
+                topic match phraselet
             matchable_tokens -- a list of tokens all of which must have counterparts in the
                 document to produce a match
             root_token -- the token at which recursive matching starts
@@ -273,6 +420,7 @@ class StructuralMatcher:
             self.topic_match_phraselet_created_without_matching_tags = \
                     topic_match_phraselet_created_without_matching_tags
             self.reverse_only = reverse_only
+            self.words_matching_root_token = None # calculated on first use
             self.treat_as_reverse_only_during_initial_relation_matching = False # phraselets are
                 # set to this value during topic matching to prevent them from being taken into
                 # account during initial relation matching because the parent relation occurs too
@@ -287,6 +435,57 @@ class StructuralMatcher:
         def root_token(self):
             return self.doc[self._root_token_index]
 
+    class _PhraseletDoc:
+        """A lightweight replacement for the spaCy document of a topic matching phraselet that
+            offers the parts of the *Doc* interface that matching reads from search phrases,
+            so that phraselets do not keep spaCy documents alive.
+
+        Args:
+
+        doc -- the Holmes document created for the phraselet.
+        """
+
+        __slots__ = ('text', '_tokens')
+
+        def __init__(self, doc):
+            self.text = doc.text
+            self._tokens = tuple(StructuralMatcher._PhraseletToken(self, token) for token in doc)
+
+        def __len__(self):
+            return len(self._tokens)
+
+        def __getitem__(self, index):
+            return self._tokens[index]
+
+        def __iter__(self):
+            return iter(self._tokens)
+
+    class _PhraseletToken:
+        """A lightweight replacement for a spaCy token within a *_PhraseletDoc*.
+
+        Args:
+
+        doc -- the *_PhraseletDoc* containing the token.
+        token -- the spaCy token being replaced.
+        """
+
+        __slots__ = ('doc', 'i', 'text', 'lemma_', 'pos_', 'tag_', 'dep_', 'holmes')
+
+        def __init__(self, doc, token):
+            self.doc = doc
+            self.i = token.i
+            self.text = sys.intern(token.text)
+            self.lemma_ = sys.intern(token.lemma_)
+            self.pos_ = sys.intern(token.pos_)
+            self.tag_ = sys.intern(token.tag_)
+            self.dep_ = sys.intern(token.dep_)
+            self.holmes = token._.holmes
+
+        @property
+        def _(self):
+            # so that the Holmes dictionary is accessed as *token._.holmes* as with spaCy tokens
+            return self
+
     class _IndexedDocument:
         """Args:
 
@@ -298,6 +497,95 @@ class StructuralMatcher:
         def __init__(self, doc, words_to_token_indexes_dict):
             self.doc = doc
             self.words_to_token_indexes_dict = words_to_token_indexes_dict
+            self.candidate_words = None
+
+        @property
+        def number_of_tokens(self):
+            return len(self.doc)
+
+    class _LazyIndexedDocument:
+        """An indexed document whose dependency parse and Holmes parse are only performed,
+            and whose index is only built, the first time *doc* or *words_to_token_indexes_dict*
+            is accessed.
+
+        Args:
+
+        spacy_doc -- the document as returned from *SemanticAnalyzer.lazy_spacy_parse()*
+        candidate_words -- the set of words returned from
+            *SemanticAnalyzer.lazy_candidate_words()*, which is used to skip the document when
+            matching search phrases whose root words it cannot contain.
+        complete_function -- the function that parses and indexes *spacy_doc*, returning an
+            *_IndexedDocument*.
+        """
+
+        def __init__(self, spacy_doc, candidate_words, complete_function):
+            self._spacy_doc = spacy_doc
+            self.number_of_tokens = len(spacy_doc)
+            self._candidate_words = candidate_words
+            self._complete_function = complete_function
+            self._indexed_document = None
+            self._lock = Lock()
+
+        def _completed_indexed_document(self):
+            with self._lock:
+                if self._indexed_document == None:
+                    self._indexed_document = self._complete_function(self._spacy_doc)
+                    self._spacy_doc = None
+                    self._complete_function = None
+            return self._indexed_document
+
+        @property
+        def is_parsed(self):
+            return self._indexed_document != None
+
+        @property
+        def candidate_words(self):
+            # once the document has been parsed, there is nothing to be saved by skipping it
+            return None if self.is_parsed else self._candidate_words
+
+        @property
+        def doc(self):
+            return self._completed_indexed_document().doc
+
+        @property
+        def words_to_token_indexes_dict(self):
+            return self._completed_indexed_document().words_to_token_indexes_dict
+
+    class _StoredIndexedDocument:
+        """An indexed document of which only the index is held in memory, the document itself
+            being held in a *DocumentStore* from which it is materialized whenever *doc* is
+            accessed. The stored document is removed from the *DocumentStore* when this object
+            is discarded.
+
+        Args:
+
+        document_store -- the *DocumentStore* holding the document.
+        key -- the key under which the document is held in *document_store*.
+        words_to_token_indexes_dict -- a dictionary from words to the token indexes
+            where each word occurs in the document
+        number_of_tokens -- the number of tokens in the document.
+        materialize_function -- the function that recreates the document from its serialized
+            representation.
+        """
+
+        def __init__(self, document_store, key, words_to_token_indexes_dict, number_of_tokens,
+                materialize_function):
+            self._document_store = document_store
+            self._key = key
+            self.words_to_token_indexes_dict = words_to_token_indexes_dict
+            self.number_of_tokens = number_of_tokens
+            self._materialize_function = materialize_function
+            weakref.finalize(self, document_store.remove, key)
+
+        @property
+        def candidate_words(self):
+            # the index is complete, so the document need not be materialized when it contains
+            # no words matching the search phrase root words
+            return self.words_to_token_indexes_dict.keys()
+
+        @property
+        def doc(self):
+            return self._document_store.get(self._key, self._materialize_function)
 
     class _MultiwordSpan:
 
@@ -313,6 +601,15 @@ class StructuralMatcher:
             self.tokens = tokens
 
     def _words_matching_root_token(self, search_phrase):
+        """ Returns a list of all words that match the root token of the search phrase,
+            taking any ontology into account. The list is calculated once per search phrase.
+        """
+        if search_phrase.words_matching_root_token == None:
+            search_phrase.words_matching_root_token = list(
+                    self._generate_words_matching_root_token(search_phrase))
+        return search_phrase.words_matching_root_token
+
+    def _generate_words_matching_root_token(self, search_phrase):
         """ Generator over all words that match the root token of the search phrase,
             taking any ontology into account.
         """
@@ -404,20 +701,20 @@ class StructuralMatcher:
                     self.semantic_analyzer.phraselet_templates if
                     phraselet_template.single_word() and token._.holmes.is_matchable):
                 if not checking_tags or token.tag_ in phraselet_template.parent_tags:
-                    phraselet_doc = self.semantic_analyzer.parse(
-                        phraselet_template.template_sentence)
                     if token.i in token_indexes_to_multiword_lemmas and not match_all_words:
                         word = token_indexes_to_multiword_lemmas[token.i]
                     else:
                         word = get_word_from_token(token)
                     if self.ontology != None and replace_with_hypernym_ancestors:
                         word = self.ontology.get_most_general_hypernym_ancestor(word)
-                    phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = word
                     phraselet_label = ''.join((phraselet_template.label, ': ', word))
                     if word not in stop_lemmas and word != 'ENTITYNOUN':
                             # ENTITYNOUN has to be excluded as single word although it is still
                             # permitted as the child of a relation phraselet template
                         if phraselet_label not in phraselet_labels_to_search_phrases:
+                            phraselet_doc = self.semantic_analyzer.phraselet_template_doc(
+                                    phraselet_template)
+                            phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = word
                             phraselet_labels_to_search_phrases[phraselet_label] = \
                                     self.create_search_phrase('topic match phraselet',
                                     phraselet_doc, phraselet_label, phraselet_template,
@@ -473,8 +770,6 @@ class StructuralMatcher:
                                     doc[child].tag_ in phraselet_template.child_tags and \
                                     doc[parent]._.holmes.is_matchable and \
                                     doc[child]._.holmes.is_matchable:
-                                phraselet_doc = self.semantic_analyzer.parse(
-                                        phraselet_template.template_sentence)
                                 if parent in token_indexes_to_multiword_lemmas:
                                     parent_word = token_indexes_to_multiword_lemmas[parent]
                                 else:
@@ -491,10 +786,6 @@ class StructuralMatcher:
                                     child_word = \
                                             self.ontology.get_most_general_hypernym_ancestor(
                                             child_word)
-                                phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = \
-                                        parent_word
-                                phraselet_doc[phraselet_template.child_index]._.holmes.lemma = \
-                                        child_word
                                 phraselet_label = ''.join((phraselet_template.label, ': ',
                                         parent_word, '-', child_word))
                                 is_reverse_only_parent_lemma = False
@@ -506,6 +797,13 @@ class StructuralMatcher:
                                         and not (is_reverse_only_parent_lemma and not
                                         include_reverse_only):
                                     if phraselet_label not in phraselet_labels_to_search_phrases:
+                                        phraselet_doc = \
+                                                self.semantic_analyzer.phraselet_template_doc(
+                                                phraselet_template)
+                                        phraselet_doc[phraselet_template.parent_index]._.holmes.\
+                                                lemma = parent_word
+                                        phraselet_doc[phraselet_template.child_index]._.holmes.\
+                                                lemma = child_word
                                         phraselet_labels_to_search_phrases[phraselet_label] = \
                                                 self.create_search_phrase('topic match phraselet',
                                                 phraselet_doc, phraselet_label, phraselet_template,
@@ -529,8 +827,8 @@ class StructuralMatcher:
         def deserialize_phraselet(serialized_phraselet, phraselet_labels_to_search_phrases):
             for phraselet_template in self.semantic_analyzer.phraselet_templates:
                 if serialized_phraselet.template_label == phraselet_template.label:
-                    phraselet_doc = self.semantic_analyzer.parse(
-                            phraselet_template.template_sentence)
+                    phraselet_doc = self.semantic_analyzer.phraselet_template_doc(
+                            phraselet_template)
                     phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = \
                             serialized_phraselet.parent_word
                     if serialized_phraselet.child_word != None:
@@ -570,8 +868,8 @@ class StructuralMatcher:
                         for multiword_token in (
                                 multiword_token for multiword_token in multiword_span.tokens
                                 if multiword_token.i != token.i):
-                            multiword_token._.holmes.children = [SemanticDependency(
-                                    multiword_token.i, 0 - (token.i + 1), None)]
+                            multiword_token._.holmes.children = (SemanticDependency(
+                                    multiword_token.i, 0 - (token.i + 1), None),)
                             multiword_token._.holmes.is_matchable = False
 
     def create_search_phrase(self, search_phrase_text, search_phrase_doc,
@@ -620,7 +918,6 @@ class StructuralMatcher:
 
         root_tokens = []
         tokens_to_match = []
-        matchable_non_entity_tokens_to_lexemes = {}
         for token in search_phrase_doc:
             # check whether grammatical token
             if phraselet_template != None and phraselet_template.parent_index != token.i and \
@@ -633,35 +930,125 @@ class StructuralMatcher:
                     self.ontology.add_to_dictionary(token._.holmes.lemma)
                     if phraselet_template == None:
                         self.ontology.add_to_dictionary(token.text)
-                if self.overall_similarity_threshold < 1.0 and not \
-                        self._is_entity_search_phrase_token(token, phraselet_template != None):
-                    if phraselet_template == None and len(token._.holmes.lemma.split()) > 1:
-                        matchable_non_entity_tokens_to_lexemes[token.i] = \
-                                self.semantic_analyzer.nlp.vocab[token.lemma_]
-                    else:
-                        matchable_non_entity_tokens_to_lexemes[token.i] = \
-                                self.semantic_analyzer.nlp.vocab[token._.holmes.lemma]
             if token.dep_ == 'ROOT': # syntactic root
                 root_tokens.append(replace_grammatical_root_token_recursively(token))
         if len(tokens_to_match) == 0:
             raise SearchPhraseWithoutMatchableWordsError(search_phrase_text)
         if len(root_tokens) > 1:
             raise SearchPhraseContainsMultipleClausesError(search_phrase_text)
-        single_token_similarity_threshold = 1.0
-        if self.overall_similarity_threshold < 1.0 and \
-                len(matchable_non_entity_tokens_to_lexemes) > 0:
-            single_token_similarity_threshold = \
-                    self.overall_similarity_threshold ** len(matchable_non_entity_tokens_to_lexemes)
+        matchable_non_entity_tokens_to_lexemes = self._matchable_non_entity_tokens_to_lexemes(
+                tokens_to_match, phraselet_template != None)
+        single_token_similarity_threshold = self._single_token_similarity_threshold(
+                matchable_non_entity_tokens_to_lexemes)
         if phraselet_template == None:
             reverse_only = False
         else:
             reverse_only = is_reverse_only_parent_lemma or phraselet_template.reverse_only
+            search_phrase_doc = self._PhraseletDoc(search_phrase_doc)
         return self._SearchPhrase(search_phrase_doc, tokens_to_match,
                 root_tokens[0], matchable_non_entity_tokens_to_lexemes,
                 single_token_similarity_threshold, label, self.ontology,
                 phraselet_template != None, topic_match_phraselet_created_without_matching_tags,
                 reverse_only)
 
+    def _matchable_non_entity_tokens_to_lexemes(self, tokens_to_match, topic_match_phraselet):
+        """Returns a dictionary from the indexes of the matchable non-entity search phrase
+            tokens to the lexemes used for embedding-based matching, which is empty if
+            embedding-based matching is not active.
+        """
+        matchable_non_entity_tokens_to_lexemes = {}
+        if self.overall_similarity_threshold < 1.0:
+            for token in (token for token in tokens_to_match if not
+                    self._is_entity_search_phrase_token(token, topic_match_phraselet)):
+                if not topic_match_phraselet and len(token._.holmes.lemma.split()) > 1:
+                    matchable_non_entity_tokens_to_lexemes[token.i] = \
+                            self.semantic_analyzer.nlp.vocab[token.lemma_]
+                else:
+                    matchable_non_entity_tokens_to_lexemes[token.i] = \
+                            self.semantic_analyzer.nlp.vocab[token._.holmes.lemma]
+        return matchable_non_entity_tokens_to_lexemes
+
+    def _single_token_similarity_threshold(self, matchable_non_entity_tokens_to_lexemes):
+        if self.overall_similarity_threshold < 1.0 and \
+                len(matchable_non_entity_tokens_to_lexemes) > 0:
+            return self.overall_similarity_threshold ** \
+                    len(matchable_non_entity_tokens_to_lexemes)
+        return 1.0
+
+    def serialize_search_phrases(self, search_phrases):
+        """Returns a compact byte representation of search phrases created by
+            *create_search_phrase()* from which they can be recreated with
+            *deserialize_search_phrases()* without being parsed again. The representation
+            includes the words matching each root token and the ontology dictionaries generated
+            for the search phrase words. Topic match phraselets are not supported.
+        """
+        serialized_search_phrases = []
+        ontology_dictionaries = {}
+        for search_phrase in search_phrases:
+            if search_phrase.topic_match_phraselet:
+                raise ValueError('Topic match phraselets cannot be serialized')
+            serialized_search_phrases.append([search_phrase.label,
+                    self.semantic_analyzer.holmes_doc_to_bytes(search_phrase.doc),
+                    search_phrase._matchable_token_indexes, search_phrase._root_token_index,
+                    self._words_matching_root_token(search_phrase)])
+            if self.ontology != None:
+                for token in search_phrase.matchable_tokens:
+                    for word in (token._.holmes.lemma.lower(), token.text.lower()):
+                        entries = self.ontology.dictionary_entries(word)
+                        if entries != None:
+                            ontology_dictionaries[word] = entries
+        return msgpack.packb({
+                'version': SERIALIZED_SEARCH_PHRASES_VERSION,
+                'model': self.semantic_analyzer.model,
+                'model_version': self.semantic_analyzer.nlp.meta['version'],
+                'ontology': self._ontology_description(),
+                'ontology_dictionaries': ontology_dictionaries,
+                'search_phrases': serialized_search_phrases}, use_bin_type=True)
+
+    def deserialize_search_phrases(self, serialized_search_phrases):
+        """Recreates search phrases from the output of *serialize_search_phrases()*. The
+            precomputed root token words and ontology dictionaries are only reused if the
+            search phrases were serialized with an ontology with the same content and settings
+            as the ontology used by this object, and are generated again otherwise.
+        """
+        serialized = msgpack.unpackb(serialized_search_phrases, raw=False)
+        if serialized['version'] != SERIALIZED_SEARCH_PHRASES_VERSION:
+            raise WrongVersionDeserializationError(serialized['version'])
+        if serialized['model'] != self.semantic_analyzer.model or \
+                serialized['model_version'] != self.semantic_analyzer.nlp.meta['version']:
+            raise WrongModelDeserializationError(' '.join((serialized['model'],
+                    serialized['model_version'])))
+        same_ontology = self.ontology != None and \
+                serialized['ontology'] == self._ontology_description()
+        if same_ontology:
+            for word, entries in serialized['ontology_dictionaries'].items():
+                self.ontology.add_dictionary_entries(word, entries)
+        search_phrases = []
+        for label, serialized_doc, matchable_token_indexes, root_token_index, \
+                words_matching_root_token in serialized['search_phrases']:
+            doc = self.semantic_analyzer.holmes_doc_from_bytes(serialized_doc)
+            tokens_to_match = [doc[index] for index in matchable_token_indexes]
+            if self.ontology != None and not same_ontology:
+                for token in tokens_to_match:
+                    self.ontology.add_to_dictionary(token._.holmes.lemma)
+                    self.ontology.add_to_dictionary(token.text)
+            matchable_non_entity_tokens_to_lexemes = \
+                    self._matchable_non_entity_tokens_to_lexemes(tokens_to_match, False)
+            search_phrase = self._SearchPhrase(doc, tokens_to_match, doc[root_token_index],
+                    matchable_non_entity_tokens_to_lexemes,
+                    self._single_token_similarity_threshold(
+                    matchable_non_entity_tokens_to_lexemes), label, self.ontology, False, False,
+                    False)
+            if self.ontology == None or same_ontology:
+                search_phrase.words_matching_root_token = words_matching_root_token
+            search_phrases.append(search_phrase)
+        return search_phrases
+
+    def _ontology_description(self):
+        if self.ontology == None:
+            return None
+        return [self.ontology.content_fingerprint(), self.ontology.symmetric_matching]
+
     def index_document(self, parsed_document):
 
         def add_dict_entry(dict, word, token_index):
@@ -703,6 +1090,78 @@ class StructuralMatcher:
 
         return self._IndexedDocument(parsed_document, words_to_token_indexes_dict)
 
+    def serializable_index(self, indexed_document):
+        """Returns a *(fingerprint, words_to_token_indexes_dict)* tuple that can be stored with
+            the serialized form of an indexed document and passed to *reindex_document()* when
+            the document is deserialized.
+        """
+        return self.index_fingerprint, indexed_document.words_to_token_indexes_dict
+
+    def reindex_document(self, parsed_document, serialized_index):
+        """Returns an indexed document for a deserialized document, reusing *serialized_index*,
+            a tuple returned from *serializable_index()*, where it was built with an ontology
+            whose multiwords are the same as those of the ontology used by this object and
+            indexing the document again otherwise.
+        """
+        if serialized_index != None and serialized_index[0] == self.index_fingerprint:
+            return self._IndexedDocument(parsed_document, serialized_index[1])
+        return self.index_document(parsed_document)
+
+    def store_indexed_document(self, indexed_document, document_store):
+        """Writes the document of *indexed_document* to *document_store* and returns an
+            indexed document that holds only the index in memory.
+        """
+        return self._StoredIndexedDocument(document_store,
+                document_store.put(self.semantic_analyzer.holmes_doc_to_bytes(
+                indexed_document.doc)), indexed_document.words_to_token_indexes_dict,
+                indexed_document.number_of_tokens, self.semantic_analyzer.holmes_doc_from_bytes)
+
+    def index_document_lazily(self, spacy_doc, *, perform_coreference_resolution=None):
+        """Returns an indexed document for a document returned from
+            *SemanticAnalyzer.lazy_spacy_parse()* whose parsing is completed and which is
+            indexed the first time it may contain a match.
+        """
+        return self._LazyIndexedDocument(spacy_doc,
+                self.semantic_analyzer.lazy_candidate_words(spacy_doc),
+                lambda spacy_doc: self.index_document(self.semantic_analyzer.complete_lazy_parse(
+                spacy_doc, perform_coreference_resolution=perform_coreference_resolution)))
+
+    def _root_words(self, search_phrases, compare_embeddings_on_root_words):
+        """Returns the set of document words that can match the root tokens of
+            *search_phrases*, or *None* if documents can match without containing any
+            particular words.
+        """
+        if compare_embeddings_on_root_words:
+            return None
+        root_words = set()
+        for search_phrase in search_phrases:
+            if self._is_entitynoun_search_phrase_token(search_phrase.root_token,
+                    search_phrase.topic_match_phraselet):
+                return None
+            if self._is_entity_search_phrase_token(search_phrase.root_token,
+                    search_phrase.topic_match_phraselet):
+                if search_phrase.topic_match_phraselet:
+                    root_words.add(search_phrase.root_token._.holmes.lemma)
+                else:
+                    root_words.add(search_phrase.root_token.text)
+            else:
+                root_words.update(self._words_matching_root_token(search_phrase))
+        return root_words
+
+    def _may_contain_root_word_matches(self, candidate_words, root_words):
+        """Returns *False* if a document indexed lazily or stored on disk with
+            *candidate_words* cannot contain any of *root_words* as returned by *_root_words()*,
+            so that it need not be parsed or materialized.
+        """
+        if root_words == None:
+            return True
+        for word in root_words:
+            # multiwords are represented in the candidate words by their component words
+            if word in candidate_words or (' ' in word and
+                    all(part in candidate_words for part in word.split())):
+                return True
+        return False
+
     def _match_recursively(self, *, search_phrase, search_phrase_token, document, document_token,
         search_phrase_tokens_to_word_matches, search_phrase_and_document_visited_table,
         is_uncertain, structurally_matched_document_token, compare_embeddings_on_non_root_words):
@@ -1209,7 +1668,8 @@ class StructuralMatcher:
             compare_embeddings_on_root_words,
             compare_embeddings_on_non_root_words,
             document_labels_to_indexes_for_reverse_matching_sets,
-            document_labels_to_indexes_for_embedding_reverse_matching_sets):
+            document_labels_to_indexes_for_embedding_reverse_matching_sets,
+            corpus_index=None):
         """Finds and returns matches between search phrases and documents.
         match_depending_on_single_words -- 'True' to match only single word search phrases,
             'False' to match only non-single-word search phrases and 'None' to match both.
@@ -1222,6 +1682,9 @@ class StructuralMatcher:
             reverse matching only.
         document_labels_to_indexes_for_embedding_reverse_matching_sets -- indexes for direct reverse
             matching and for embedding-based reverse matching.
+        corpus_index -- optionally, the *ThreadsafeContainer* from which *indexed_documents*
+            were retrieved. Its postings index is then used to visit only those documents that
+            contain words matching the search phrase root tokens.
         """
 
         def get_indexes_to_consider(dictionary, document_label):
@@ -1243,10 +1706,35 @@ class StructuralMatcher:
                 'At least one searched document is required to match.')
         if len(search_phrases) == 0:
             raise NoSearchPhraseError('At least one search_phrase is required to match.')
-        matches = []
+        root_words = self._root_words(search_phrases, compare_embeddings_on_root_words)
+        if corpus_index != None and root_words != None:
+            indexed_documents = {document_label: indexed_documents[document_label] for
+                    document_label in corpus_index.document_labels_containing(root_words) if
+                    document_label in indexed_documents}
+        # Documents with identical content share a single indexed document: each such
+        # document is matched once and the matches are copied for the other labels.
+        shared_documents_to_labels = {}
         for document_label, registered_document in indexed_documents.items():
+            shared_document_key = id(registered_document)
+            if match_specific_indexes:
+                shared_document_key = (shared_document_key, frozenset(get_indexes_to_consider(
+                        document_labels_to_indexes_for_reverse_matching_sets, document_label)),
+                        frozenset(get_indexes_to_consider(
+                        document_labels_to_indexes_for_embedding_reverse_matching_sets,
+                        document_label)))
+            shared_documents_to_labels.setdefault(shared_document_key, []).append(
+                    document_label)
+        matches = []
+        for document_labels in shared_documents_to_labels.values():
+            document_label = document_labels[0]
+            registered_document = indexed_documents[document_label]
+            number_of_matches_before_document = len(matches)
             if output_document_matching_message_to_console:
                 print('Processing document', document_label)
+            if registered_document.candidate_words != None and not \
+                    self._may_contain_root_word_matches(registered_document.candidate_words,
+                    root_words):
+                continue
             doc = registered_document.doc
             # Dictionary used to improve performance when embedding-based matching for root tokens
             # is active and there are multiple search phrases with the same root token word: the
@@ -1390,4 +1878,10 @@ class StructuralMatcher:
                     matches.extend(self._get_matches_starting_at_root_word_match(
                             search_phrase, doc, doc[index_to_match], document_label,
                             compare_embeddings_on_non_root_words))
+            document_matches = matches[number_of_matches_before_document:]
+            for other_document_label in document_labels[1:]:
+                for match in document_matches:
+                    copied_match = copy.copy(match)
+                    copied_match.document_label = other_document_label
+                    matches.append(copied_match)
         return sorted(matches, key=lambda match: 1 - float(match.overall_similarity_measure))
@@ -1,7 +1,7 @@
 import unittest
 import holmes_extractor as holmes
 from holmes_extractor.errors import *
-import jsonpickle
+import msgpack
 
 nocoref_holmes_manager = holmes.Manager('en_core_web_lg', perform_coreference_resolution=False)
 coref_holmes_manager = holmes.Manager('en_core_web_lg', perform_coreference_resolution=True)
@@ -130,30 +130,6 @@ class ErrorsTest(unittest.TestCase):
             m.deserialize_and_register_documents({'A':deserialized_doc})
             m.deserialize_and_register_documents({'A':deserialized_doc})
 
-    def test_serialization_not_supported_on_serialization(self):
-        with self.assertRaises(SerializationNotSupportedError) as context:
-            coref_holmes_manager.remove_all_documents()
-            coref_holmes_manager.parse_and_register_document("A", '')
-            deserialized_doc = coref_holmes_manager.serialize_document('')
-
-    def test_serialization_not_supported_on_serialization_multiprocessing(self):
-        with self.assertRaises(SerializationNotSupportedError) as context:
-            m_normal = holmes.Manager('en_core_web_sm', perform_coreference_resolution=False)
-            m_normal.remove_all_documents()
-            m_normal.parse_and_register_document("A", '')
-            deserialized_doc = m_normal.serialize_document('')
-            m = holmes.MultiprocessingManager('en_core_web_sm', number_of_workers=2)
-            m.deserialize_and_register_documents({'A':deserialized_doc})
-
-    def test_serialization_not_supported_on_deserialization(self):
-        with self.assertRaises(SerializationNotSupportedError) as context:
-            nocoref_holmes_manager.remove_all_documents()
-            coref_holmes_manager.remove_all_documents()
-            coref_holmes_manager.deserialize_and_register_document("A", '')
-            nocoref_holmes_manager.parse_and_register_document("A", '')
-            deserialized_doc = nocoref_holmes_manager.serialize_document('')
-            nocoref_holmes_manager.deserialize_and_register_document(deserialized_doc, '')
-
     def test_no_search_phrase_error(self):
         with self.assertRaises(NoSearchPhraseError) as context:
             nocoref_holmes_manager.remove_all_search_phrases()
@@ -176,11 +152,19 @@ class ErrorsTest(unittest.TestCase):
             nocoref_holmes_manager.remove_all_documents()
             doc = nocoref_holmes_manager.parse_and_register_document("The cat was chased by the dog", 'pets')
             serialized_doc = nocoref_holmes_manager.serialize_document('pets')
-            document = jsonpickle.decode(serialized_doc)
-            document._version = 1
-            serialized_doc = jsonpickle.encode(document)
+            envelope = msgpack.unpackb(serialized_doc, raw=False)
+            envelope['version'] = 1
+            serialized_doc = msgpack.packb(envelope, use_bin_type=True)
             nocoref_holmes_manager.deserialize_and_register_document(serialized_doc, 'pets2')
 
+    def test_wrong_model_deserialization_error_search_phrases(self):
+        with self.assertRaises(WrongModelDeserializationError) as context:
+            nocoref_holmes_manager.remove_all_search_phrases()
+            nocoref_holmes_manager.register_search_phrase("A dog chases a cat")
+            serialized_search_phrases = nocoref_holmes_manager.serialize_search_phrases()
+            german_holmes_manager.deserialize_and_register_search_phrases(
+                    serialized_search_phrases)
+
     def test_wrong_model_deserialization_error_supervised_models(self):
         with self.assertRaises(WrongModelDeserializationError) as context:
             sttb = german_holmes_manager.get_supervised_topic_training_basis()
@@ -1,5 +1,9 @@
 import unittest
+import os
+import shutil
+import tempfile
 import holmes_extractor as holmes
+from holmes_extractor.errors import *
 
 holmes_manager = holmes.Manager('en_core_web_lg', perform_coreference_resolution=False)
 
@@ -74,3 +78,156 @@ class MatchingModesTest(unittest.TestCase):
                 "testc")), 0)
         self.assertEqual(len(holmes_manager.match_search_phrases_against(
                 "testd")), 0)
+
+    def test_parse_and_register_documents(self):
+        holmes_manager.remove_all_search_phrases()
+        holmes_manager.remove_all_documents()
+        throughput = holmes_manager.parse_and_register_documents([
+                ('pets', "All the time I am testing here, dogs keep on chasing cats."),
+                ('safari', "Everything I know suggests that lions enjoy eating gnu")],
+                batch_size=1)
+        holmes_manager.register_search_phrase("A dog chases a cat", label="test")
+        holmes_manager.register_search_phrase("A lion eats a gnu", label="test")
+        self.assertEqual(sorted(holmes_manager.document_labels()), ['pets', 'safari'])
+        self.assertEqual(len(holmes_manager.match_returning_dictionaries()), 2)
+        self.assertEqual(throughput['documents'], 2)
+        self.assertEqual(throughput['tokens'], 23)
+
+    def test_parse_and_register_documents_in_processes(self):
+        holmes_manager.remove_all_search_phrases()
+        holmes_manager.remove_all_documents()
+        progress = []
+        throughput = holmes_manager.parse_and_register_documents([
+                ('pets', "All the time I am testing here, dogs keep on chasing cats."),
+                ('safari', "Everything I know suggests that lions enjoy eating gnu"),
+                ('more pets', "A dog chased a cat.")],
+                number_of_processes=2, maximum_documents_in_flight=1,
+                progress_callback=lambda documents, tokens: progress.append(documents))
+        holmes_manager.register_search_phrase("A dog chases a cat", label="test")
+        self.assertEqual(sorted(holmes_manager.document_labels()),
+                ['more pets', 'pets', 'safari'])
+        self.assertEqual(len(holmes_manager.match_returning_dictionaries()), 2)
+        self.assertEqual(progress, [1, 2, 3])
+        self.assertEqual(throughput['documents'], 3)
+
+    def test_parse_and_register_documents_duplicate_label(self):
+        holmes_manager.remove_all_documents()
+        with self.assertRaises(DuplicateDocumentError):
+            holmes_manager.parse_and_register_documents({'pets': "A dog chased a cat."})
+            holmes_manager.parse_and_register_documents({'pets': "A dog chased a cat."})
+
+    def test_parse_and_register_documents_duplicate_label_in_batch(self):
+        holmes_manager.remove_all_documents()
+        with self.assertRaises(DuplicateDocumentError):
+            holmes_manager.parse_and_register_documents([('pets', "A dog chased a cat."),
+                    ('pets', "A lion ate a gnu.")], batch_size=1)
+        # spaCy may or may not have parsed the first document before the error was raised
+        self.assertIn(list(holmes_manager.document_labels()), [[], ['pets']])
+        if 'pets' in holmes_manager.document_labels():
+            self.assertEqual(holmes_manager.threadsafe_container.get_document('pets').text,
+                    "A dog chased a cat.")
+
+    def test_identical_documents_share_representation(self):
+        holmes_manager.remove_all_search_phrases()
+        holmes_manager.remove_all_documents()
+        holmes_manager.parse_and_register_document("A dog chased a cat.", 'first')
+        holmes_manager.parse_and_register_document("A dog chased a cat.", 'second')
+        indexed_documents = holmes_manager.threadsafe_container.get_indexed_documents()
+        self.assertIs(indexed_documents['first'], indexed_documents['second'])
+        holmes_manager.register_search_phrase("A dog chases a cat")
+        matches = holmes_manager.match()
+        self.assertEqual(sorted(match.document_label for match in matches),
+                ['first', 'second'])
+        holmes_manager.remove_document('first')
+        self.assertEqual([match.document_label for match in holmes_manager.match()],
+                ['second'])
+
+    def test_identical_documents_share_representation_in_batch(self):
+        holmes_manager.remove_all_search_phrases()
+        holmes_manager.remove_all_documents()
+        holmes_manager.parse_and_register_document("A dog chased a cat.", 'first')
+        throughput = holmes_manager.parse_and_register_documents([
+                ('second', "A lion ate a gnu."),
+                ('third', "A dog chased a cat."),
+                ('fourth', "A lion ate a gnu.")])
+        self.assertEqual(throughput['documents'], 3)
+        indexed_documents = holmes_manager.threadsafe_container.get_indexed_documents()
+        self.assertIs(indexed_documents['first'], indexed_documents['third'])
+        self.assertIs(indexed_documents['second'], indexed_documents['fourth'])
+        holmes_manager.register_search_phrase("A lion eats a gnu")
+        self.assertEqual(sorted(match_dict['document'] for match_dict in
+                holmes_manager.match_returning_dictionaries()), ['fourth', 'second'])
+
+    def test_document_storage(self):
+        directory = tempfile.mkdtemp()
+        try:
+            storing_holmes_manager = holmes.Manager('en_core_web_lg',
+                    perform_coreference_resolution=False, document_storage_directory=directory,
+                    document_memory_budget=1)
+            storing_holmes_manager.parse_and_register_documents({'pets': "A dog chased a cat.",
+                    'weather': "The weather was nice.", 'safari': "A lion ate a gnu."})
+            self.assertEqual(len(os.listdir(directory)), 3)
+            self.assertEqual(storing_holmes_manager.document_store_statistics()[
+                    'documents_in_memory'], 0)
+            storing_holmes_manager.register_search_phrase("A dog chases a cat")
+            storing_holmes_manager.register_search_phrase("A lion eats a gnu")
+            self.assertEqual(sorted(match.document_label for match in
+                    storing_holmes_manager.match()), ['pets', 'safari'])
+            statistics = storing_holmes_manager.document_store_statistics()
+            # the document about the weather contains no root words and is never materialized
+            self.assertEqual(statistics['loads'], 2)
+            self.assertEqual(statistics['documents_in_memory'], 1)
+            doc = storing_holmes_manager.threadsafe_container.get_document('safari')
+            self.assertEqual(doc[2]._.holmes.string_representation_of_children(),
+                    '1:nsubj; 4:dobj')
+            storing_holmes_manager.remove_all_documents()
+            self.assertEqual(os.listdir(directory), [])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_parse_lazily(self):
+        holmes_manager.remove_all_search_phrases()
+        holmes_manager.remove_all_documents()
+        holmes_manager.parse_and_register_document("A dog chased a cat.", 'pets',
+                parse_lazily=True)
+        holmes_manager.parse_and_register_documents({'weather': "The weather was nice.",
+                'safari': "A lion ate a gnu."}, parse_lazily=True)
+        indexed_documents = holmes_manager.threadsafe_container.get_indexed_documents()
+        self.assertFalse(indexed_documents['pets'].is_parsed)
+        holmes_manager.register_search_phrase("A dog chases a cat")
+        matches = holmes_manager.match()
+        self.assertEqual([match.document_label for match in matches], ['pets'])
+        self.assertTrue(indexed_documents['pets'].is_parsed)
+        self.assertFalse(indexed_documents['weather'].is_parsed)
+        self.assertFalse(indexed_documents['safari'].is_parsed)
+        doc = holmes_manager.threadsafe_container.get_document('safari')
+        self.assertTrue(indexed_documents['safari'].is_parsed)
+        self.assertEqual(doc[2]._.holmes.string_representation_of_children(),
+                '1:nsubj; 4:dobj')
+
+    def test_corpus_postings_index(self):
+        holmes_manager.remove_all_search_phrases()
+        holmes_manager.remove_all_documents()
+        holmes_manager.parse_and_register_document("A dog chased a cat.", 'pets')
+        holmes_manager.parse_and_register_document("The weather was nice.", 'weather')
+        holmes_manager.parse_and_register_document("A dog chased a cat.", 'more pets')
+        holmes_manager.parse_and_register_document("A lion ate a gnu.", 'safari',
+                parse_lazily=True)
+        threadsafe_container = holmes_manager.threadsafe_container
+        self.assertEqual(threadsafe_container.document_labels_containing(['dog']),
+                ['pets', 'more pets'])
+        self.assertEqual(threadsafe_container.document_labels_containing(['lion', 'weather']),
+                ['weather', 'safari'])
+        self.assertEqual(threadsafe_container.document_labels_containing(['elephant']), [])
+        holmes_manager.register_search_phrase("A dog chases a cat")
+        self.assertEqual(sorted(match.document_label for match in holmes_manager.match()),
+                ['more pets', 'pets'])
+        self.assertFalse(threadsafe_container.get_indexed_documents()['safari'].is_parsed)
+        holmes_manager.remove_document('pets')
+        self.assertEqual(threadsafe_container.document_labels_containing(['dog']),
+                ['more pets'])
+        holmes_manager.parse_and_register_document("A big dog.", 'pets')
+        self.assertEqual(threadsafe_container.document_labels_containing(['dog']),
+                ['more pets', 'pets'])
+        holmes_manager.remove_all_documents()
+        self.assertEqual(threadsafe_container.document_labels_containing(['dog']), [])
@@ -1,6 +1,11 @@
 import unittest
+import io
+from contextlib import redirect_stdout
 import holmes_extractor as holmes
+from holmes_extractor.errors import DuplicateDocumentError
 import os
+import shutil
+import tempfile
 import time
 from threading import Thread
 from queue import Queue
@@ -28,6 +33,93 @@ class MultiprocessingTest(unittest.TestCase):
                 [{'document_label': 'exact', 'text': 'The dog chased the animal', 'text_to_match': 'A dog chases an animal', 'rank': '1=', 'sentences_character_start_index_in_document': 0, 'sentences_character_end_index_in_document': 25, 'score': 99.34666666666668, 'word_infos': [[4, 7, 'overlapping_relation', False], [8, 14, 'overlapping_relation', False], [19, 25, 'overlapping_relation', True]]}, {'document_label': 'specific', 'text': 'I saw a dog. It was chasing a cat', 'text_to_match': 'A dog chases an animal', 'rank': '1=', 'sentences_character_start_index_in_document': 0, 'sentences_character_end_index_in_document': 33, 'score': 99.14666666666669, 'word_infos': [[8, 11, 'overlapping_relation', False], [20, 27, 'overlapping_relation', False], [30, 33, 'overlapping_relation', True]]}, {'document_label': 'exact-reversed', 'text': 'The animal chased the dog', 'text_to_match': 'A dog chases an animal', 'rank': '3=', 'sentences_character_start_index_in_document': 0, 'sentences_character_end_index_in_document': 25, 'score': 40.946666666666665, 'word_infos': [[4, 10, 'single', False], [11, 17, 'relation', False], [22, 25, 'relation', True]]}, {'document_label': 'specific-reversed', 'text': 'The cat chased the dog', 'text_to_match': 'A dog chases an animal', 'rank': '3=', 'sentences_character_start_index_in_document': 0, 'sentences_character_end_index_in_document': 22, 'score': 40.946666666666665, 'word_infos': [[4, 7, 'single', False], [8, 14, 'relation', False], [19, 22, 'relation', True]]}])
         m.close()
 
+    def test_load_corpus(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.sep.join((directory, 'corpus.holmes'))
+            holmes_manager = holmes.Manager('en_core_web_sm', ontology=ontology,
+                    perform_coreference_resolution=False)
+            holmes_manager.parse_and_register_document("The dog chased the animal", 'exact')
+            holmes_manager.parse_and_register_document("The cat chased the dog",
+                    'specific-reversed')
+            holmes_manager.parse_and_register_document("Houses in the village.", 'village')
+            holmes_manager.save_corpus(path)
+            m = holmes.MultiprocessingManager('en_core_web_sm', ontology=ontology,
+                    number_of_workers=2, verbose=False, perform_coreference_resolution=False)
+            m.load_corpus(path)
+            self.assertEqual(m.document_labels(), ['exact', 'specific-reversed', 'village'])
+            topic_match_dicts = m.topic_match_documents_returning_dictionaries_against(
+                    "A dog chases an animal")
+            self.assertEqual([topic_match_dict['document_label'] for topic_match_dict in
+                    topic_match_dicts], ['exact', 'specific-reversed'])
+            m.close()
+            # a text identical to a loaded document shares it
+            m = holmes.MultiprocessingManager('en_core_web_sm', ontology=ontology,
+                    number_of_workers=2, verbose=True, perform_coreference_resolution=False)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                m.load_corpus(path)
+                m.parse_and_register_documents({'exact-copy': "The dog chased the animal"})
+            self.assertIn('Registered document exact-copy sharing document exact',
+                    output.getvalue())
+            self.assertEqual(m.document_labels(), ['exact', 'exact-copy', 'specific-reversed',
+                    'village'])
+            m.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_documents_with_identical_content(self):
+        m = holmes.MultiprocessingManager('en_core_web_sm', ontology=ontology,
+                number_of_workers=2, verbose=False, perform_coreference_resolution=False)
+        m.parse_and_register_documents({'exact': "The dog chased the animal",
+                'exact-copy': "The dog chased the animal",
+                'village': "Houses in the village."})
+        m.parse_and_register_documents({'exact-second-copy': "The dog chased the animal"})
+        self.assertEqual(m.document_labels(), ['exact', 'exact-copy', 'exact-second-copy',
+                'village'])
+        topic_match_dicts = m.topic_match_documents_returning_dictionaries_against(
+                "A dog chases an animal")
+        self.assertEqual(sorted(topic_match_dict['document_label'] for topic_match_dict in
+                topic_match_dicts), ['exact', 'exact-copy', 'exact-second-copy'])
+        with self.assertRaises(DuplicateDocumentError):
+            m.parse_and_register_documents({'exact': "The dog chased the animal"})
+        m.close()
+
+    def test_identical_files_in_directory_share_document(self):
+        directory = tempfile.mkdtemp()
+        try:
+            for label, text in (('first', "The dog chased the animal"),
+                    ('second', "The dog chased the animal"),
+                    ('village', "Houses in the village.")):
+                with open(os.sep.join((directory, ''.join((label, '.txt')))), 'w',
+                        encoding='utf-8') as file:
+                    file.write(text)
+            m = holmes.MultiprocessingManager('en_core_web_sm', ontology=ontology,
+                    number_of_workers=2, verbose=True, perform_coreference_resolution=False)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                m.parse_and_register_documents(directory)
+                m.parse_and_register_documents({'third': "The dog chased the animal"})
+            self.assertIn('Registered document second sharing document first',
+                    output.getvalue())
+            self.assertIn('Registered document third sharing document first',
+                    output.getvalue())
+            self.assertEqual(m.document_labels(), ['first', 'second', 'third', 'village'])
+            m.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_worker_startup_timings(self):
+        m = holmes.MultiprocessingManager('en_core_web_sm', number_of_workers=2, verbose=False,
+                perform_coreference_resolution=False)
+        worker_startup_timings = m.worker_startup_timings()
+        self.assertEqual(sorted(worker_startup_timings), ['Worker 0', 'Worker 1'])
+        for timings in worker_startup_timings.values():
+            self.assertEqual(sorted(timings), ['model_load', 'process_start', 'ready'])
+            self.assertTrue(timings['model_load'] >= 0.0)
+            self.assertTrue(timings['ready'] >= timings['process_start'])
+        m.close()
+
     def test_workers_not_specified(self):
         m = holmes.MultiprocessingManager('en_core_web_sm', ontology=ontology)
         m.parse_and_register_documents({'specific' : "I saw a dog. It was chasing a cat",
@@ -64,6 +156,45 @@ class MultiprocessingTest(unittest.TestCase):
                 [{'document_label': 'exact', 'text': 'The dog chased the animal', 'text_to_match': 'A dog chases an animal', 'rank': '1', 'sentences_character_start_index_in_document': 0, 'sentences_character_end_index_in_document': 25, 'score': 99.34666666666668, 'word_infos': [[4, 7, 'overlapping_relation', False], [8, 14, 'overlapping_relation', False], [19, 25, 'overlapping_relation', True]]}, {'document_label': 'exact-reversed', 'text': 'The animal chased the dog', 'text_to_match': 'A dog chases an animal', 'rank': '2=', 'sentences_character_start_index_in_document': 0, 'sentences_character_end_index_in_document': 25, 'score': 40.946666666666665, 'word_infos': [[4, 10, 'single', False], [11, 17, 'relation', False], [22, 25, 'relation', True]]}, {'document_label': 'specific-reversed', 'text': 'The cat chased the dog', 'text_to_match': 'A dog chases an animal', 'rank': '2=', 'sentences_character_start_index_in_document': 0, 'sentences_character_end_index_in_document': 22, 'score': 40.946666666666665, 'word_infos': [[4, 7, 'single', False], [8, 14, 'relation', False], [19, 22, 'relation', True]]}, {'document_label': 'specific', 'text': 'I saw a dog. It was chasing a cat', 'text_to_match': 'A dog chases an animal', 'rank': '2=', 'sentences_character_start_index_in_document': 0, 'sentences_character_end_index_in_document': 33, 'score': 40.74666666666667, 'word_infos': [[8, 11, 'single', False], [20, 27, 'relation', False], [30, 33, 'relation', True]]}])
         m.close()
 
+    def test_documents_from_iterator_and_directories(self):
+        directory = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.sep.join((directory, 'texts')))
+            os.mkdir(os.sep.join((directory, 'serialized')))
+            normal_manager = holmes.Manager('en_core_web_sm',
+                    perform_coreference_resolution=False)
+            for label, text in (('exact', "The dog chased the animal"),
+                    ('specific-reversed', "The cat chased the dog")):
+                with open(os.sep.join((directory, 'texts', ''.join((label, '.txt')))), 'w',
+                        encoding='utf-8') as file:
+                    file.write(text)
+                normal_manager.parse_and_register_document(text, label)
+                with open(os.sep.join((directory, 'serialized', ''.join((label, '.holmes')))),
+                        'wb') as file:
+                    file.write(normal_manager.serialize_document(label))
+            m = holmes.MultiprocessingManager('en_core_web_sm', ontology=ontology,
+                    number_of_workers=2, verbose=False, perform_coreference_resolution=False)
+            m.parse_and_register_documents(((label, text) for label, text in
+                    (('iterated-exact', "The dog chased the animal"),
+                    ('iterated-specific-reversed', "The cat chased the dog"))),
+                    maximum_documents_in_flight=1)
+            m.parse_and_register_documents(os.sep.join((directory, 'texts')))
+            self.assertEqual(m.document_labels(), ['exact', 'iterated-exact',
+                    'iterated-specific-reversed', 'specific-reversed'])
+            with self.assertRaises(DuplicateDocumentError):
+                m.parse_and_register_documents(os.sep.join((directory, 'texts')))
+            m.close()
+            m = holmes.MultiprocessingManager('en_core_web_sm', ontology=ontology,
+                    number_of_workers=2, verbose=False, perform_coreference_resolution=False)
+            m.deserialize_and_register_documents(os.sep.join((directory, 'serialized')))
+            self.assertEqual(m.document_labels(), ['exact', 'specific-reversed'])
+            self.assertEqual([topic_match_dict['document_label'] for topic_match_dict in
+                    m.topic_match_documents_returning_dictionaries_against(
+                    "A dog chases an animal")], ['exact', 'specific-reversed'])
+            m.close()
+        finally:
+            shutil.rmtree(directory)
+
     def test_number_of_results(self):
         m = holmes.MultiprocessingManager('en_core_web_sm', ontology=ontology, number_of_workers=2,
                 verbose=False)
@@ -0,0 +1,107 @@
+import unittest
+import os
+import shutil
+import tempfile
+from threading import Thread
+import holmes_extractor as holmes
+from holmes_extractor.parse_cache import ParseCache
+
+holmes_manager = holmes.Manager('en_core_web_lg', perform_coreference_resolution=False,
+        parse_cache_size=2)
+holmes_manager.register_search_phrase("A dog chases a cat")
+
+class ParseCacheTest(unittest.TestCase):
+
+    def test_memory_hits_and_misses(self):
+        holmes_manager.semantic_analyzer.parse_cache.clear()
+        holmes_manager.match_search_phrases_against("The cat was chased by the dog")
+        self.assertEqual(holmes_manager.parse_cache_statistics(), {'entries_in_memory': 1,
+                'memory_hits': 0, 'disk_hits': 0, 'misses': 1})
+        self.assertEqual(len(holmes_manager.match_search_phrases_against(
+                "The cat was chased by the dog")), 1)
+        self.assertEqual(holmes_manager.parse_cache_statistics()['memory_hits'], 1)
+
+    def test_least_recently_used_entry_is_discarded(self):
+        holmes_manager.semantic_analyzer.parse_cache.clear()
+        holmes_manager.semantic_analyzer.parse("A dog")
+        holmes_manager.semantic_analyzer.parse("A cat")
+        holmes_manager.semantic_analyzer.parse("A dog")
+        holmes_manager.semantic_analyzer.parse("A mouse")
+        holmes_manager.semantic_analyzer.parse("A dog")
+        holmes_manager.semantic_analyzer.parse("A cat")
+        self.assertEqual(holmes_manager.parse_cache_statistics(), {'entries_in_memory': 2,
+                'memory_hits': 2, 'disk_hits': 0, 'misses': 4})
+
+    def test_cached_documents_are_independent(self):
+        holmes_manager.semantic_analyzer.parse_cache.clear()
+        doc = holmes_manager.semantic_analyzer.parse("A big dog")
+        doc[2]._.holmes.lemma = 'cat'
+        self.assertEqual(holmes_manager.semantic_analyzer.parse("A big dog")[2]._.holmes.lemma,
+                'dog')
+
+    def test_disk_tier(self):
+        directory = tempfile.mkdtemp()
+        try:
+            disk_manager = holmes.Manager('en_core_web_lg', perform_coreference_resolution=False,
+                    parse_cache_size=1, parse_cache_directory=directory)
+            disk_manager.semantic_analyzer.parse("A dog chases a cat")
+            disk_manager.semantic_analyzer.parse("A big dog")
+            doc = disk_manager.semantic_analyzer.parse("A dog chases a cat")
+            self.assertEqual(doc[2]._.holmes.string_representation_of_children(),
+                    '1:nsubj; 4:dobj')
+            self.assertEqual(disk_manager.parse_cache_statistics(), {'entries_in_memory': 1,
+                    'memory_hits': 0, 'disk_hits': 1, 'misses': 2})
+            self.assertEqual(len(os.listdir(directory)), 2)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_disk_tier_concurrent_writes_of_same_key(self):
+        directory = tempfile.mkdtemp()
+        try:
+            parse_cache = ParseCache(maximum_size=1, directory=directory)
+            errors = []
+
+            def put_repeatedly(value):
+                try:
+                    for _ in range(50):
+                        parse_cache.put('key', value)
+                except Exception as err:
+                    errors.append(err)
+
+            threads = [Thread(target=put_repeatedly, args=(bytes([index]) * 100000,)) for
+                    index in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(os.listdir(directory), ['key.holmes'])
+            parse_cache.clear()
+            serialized_doc = parse_cache.get('key')
+            self.assertEqual(len(serialized_doc), 100000)
+            self.assertEqual(len(set(serialized_doc)), 1)
+        finally:
+            shutil.rmtree(directory)
+
+class SentenceMemoTest(unittest.TestCase):
+
+    def test_repeated_sentences_are_reused(self):
+        memo_manager = holmes.Manager('en_core_web_lg', perform_coreference_resolution=False,
+                sentence_memo_size=10)
+        memo_manager.register_search_phrase("A dog chases a cat")
+        memo_manager.parse_and_register_document(
+                "The dog chased the cat. The cat chased the mouse.", 'first')
+        text = "The cat chased the mouse. The dog chased the cat."
+        memo_manager.parse_and_register_document(text, 'second')
+        self.assertEqual(memo_manager.sentence_memo_statistics(), {'entries': 2, 'hits': 2,
+                'misses': 2})
+        doc = memo_manager.threadsafe_container.get_document('second')
+        self.assertEqual(doc.text, text)
+        self.assertEqual(doc[5].whitespace_, ' ')
+        self.assertEqual(doc[8]._.holmes.string_representation_of_children(),
+                '7:nsubj; 10:dobj')
+        self.assertEqual(doc[7]._.holmes.parent_dependencies, ((8, 'nsubj'),))
+        self.assertEqual(len(memo_manager.match()), 2)
+
+    def test_sentence_memo_not_configured(self):
+        self.assertEqual(holmes_manager.sentence_memo_statistics(), None)
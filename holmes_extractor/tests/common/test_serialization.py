@@ -1,5 +1,8 @@
 import unittest
 import os
+import shutil
+import tempfile
+import spacy
 import holmes_extractor as holmes
 
 script_directory = os.path.dirname(os.path.realpath(__file__))
@@ -7,6 +10,8 @@ ontology = holmes.Ontology(os.sep.join((script_directory,'test_ontology.owl')))
 nocoref_holmes_manager = holmes.Manager('en_core_web_lg',
         perform_coreference_resolution=False)
 nocoref_holmes_manager.register_search_phrase("A dog chases a cat")
+ontology_holmes_manager = holmes.Manager('en_core_web_lg', ontology=ontology,
+        perform_coreference_resolution=False)
 
 class SerializationTest(unittest.TestCase):
 
@@ -52,7 +57,251 @@ class SerializationTest(unittest.TestCase):
         new_doc = nocoref_holmes_manager.threadsafe_container.get_document('village2')
         self.assertEqual(old_doc[0]._.holmes.string_representation_of_children(),
                 '1:prep; 3:pobjp')
-        self.assertEqual(old_doc[3]._.holmes.parent_dependencies, [[0, 'pobjp'],[1, 'pobj']])
+        self.assertEqual(old_doc[3]._.holmes.parent_dependencies, ((0, 'pobjp'), (1, 'pobj')))
+        self.assertEqual(new_doc[0]._.holmes.string_representation_of_children(),
+                '1:prep; 3:pobjp')
+        self.assertEqual(new_doc[3]._.holmes.parent_dependencies, ((0, 'pobjp'), (1, 'pobj')))
+
+    def test_holmes_doc_bytes_round_trip(self):
+        semantic_analyzer = nocoref_holmes_manager.semantic_analyzer
+        old_doc = semantic_analyzer.parse("Houses in the village.")
+        new_doc = semantic_analyzer.holmes_doc_from_bytes(
+                semantic_analyzer.holmes_doc_to_bytes(old_doc))
+        self.assertEqual(new_doc.text, old_doc.text)
         self.assertEqual(new_doc[0]._.holmes.string_representation_of_children(),
                 '1:prep; 3:pobjp')
-        self.assertEqual(new_doc[3]._.holmes.parent_dependencies, [[0, 'pobjp'],[1, 'pobj']])
+        self.assertEqual(new_doc[3]._.holmes.parent_dependencies, ((0, 'pobjp'), (1, 'pobj')))
+        nocoref_holmes_manager.remove_all_documents()
+        nocoref_holmes_manager.register_parsed_document(semantic_analyzer.holmes_doc_from_bytes(
+                semantic_analyzer.holmes_doc_to_bytes(semantic_analyzer.parse(
+                "The cat was chased by the dog"))), 'pets')
+        self.assertEqual(len(nocoref_holmes_manager.match()), 1)
+
+    def test_compressed_serialization(self):
+        nocoref_holmes_manager.remove_all_documents()
+        nocoref_holmes_manager.parse_and_register_document("The cat was chased by the dog", 'pets')
+        serialized_doc = nocoref_holmes_manager.serialize_document('pets')
+        compressed_serialized_doc = nocoref_holmes_manager.serialize_document('pets',
+                compress=True)
+        self.assertTrue(len(compressed_serialized_doc) < len(serialized_doc))
+        nocoref_holmes_manager.remove_all_documents()
+        nocoref_holmes_manager.deserialize_and_register_document(compressed_serialized_doc,
+                'pets')
+        self.assertEqual(len(nocoref_holmes_manager.match()), 1)
+
+    def test_reading_jsonpickle_serialization(self):
+        import jsonpickle
+        from holmes_extractor.semantics import SerializedHolmesDocument
+        semantic_analyzer = nocoref_holmes_manager.semantic_analyzer
+        doc = semantic_analyzer.parse("The cat was chased by the dog")
+        dictionaries = [token._.holmes for token in doc]
+        for token in doc:
+            token._.holmes = None
+        serialized_doc = jsonpickle.encode(SerializedHolmesDocument(doc.to_bytes(),
+                dictionaries, semantic_analyzer.model))
+        nocoref_holmes_manager.remove_all_documents()
+        nocoref_holmes_manager.deserialize_and_register_document(serialized_doc, 'pets')
+        self.assertEqual(len(nocoref_holmes_manager.match()), 1)
+
+    def test_pipeline_component(self):
+        semantic_analyzer = nocoref_holmes_manager.semantic_analyzer
+        component = semantic_analyzer.pipeline_component()
+        self.assertEqual(component.name, 'holmes')
+        doc = component(semantic_analyzer.spacy_parse("Houses in the village."))
+        self.assertEqual(doc[0]._.holmes.string_representation_of_children(),
+                '1:prep; 3:pobjp')
+
+    def test_pipeline_component_created_by_spacy(self):
+        nlp = spacy.load('en_core_web_lg')
+        nlp.add_pipe(nlp.create_pipe('holmes', config={'perform_coreference_resolution': False}),
+                last=True)
+        self.assertEqual(nlp.pipe_names[-1], 'holmes')
+        component = nlp.get_pipe('holmes')
+        self.assertEqual(component.semantic_analyzer.model, 'en_core_web_lg')
+        self.assertIs(component.semantic_analyzer.nlp, nlp)
+        doc = nlp("Houses in the village.")
+        self.assertEqual(doc[0]._.holmes.string_representation_of_children(),
+                '1:prep; 3:pobjp')
+
+    def test_search_phrases_round_trip(self):
+        ontology_holmes_manager = holmes.Manager('en_core_web_lg', ontology=ontology,
+                perform_coreference_resolution=False)
+        ontology_holmes_manager.register_search_phrase("An animal chases a cat", 'animals')
+        serialized_search_phrases = ontology_holmes_manager.serialize_search_phrases()
+        new_ontology = holmes.Ontology(os.sep.join((script_directory,'test_ontology.owl')))
+        new_holmes_manager = holmes.Manager('en_core_web_lg', ontology=new_ontology,
+                perform_coreference_resolution=False)
+        new_holmes_manager.deserialize_and_register_search_phrases(serialized_search_phrases)
+        self.assertEqual(sorted(new_ontology.dictionary_entries('animal')),
+                sorted(ontology.dictionary_entries('animal')))
+        new_holmes_manager.parse_and_register_document("The dog chased the kitten")
+        matches = new_holmes_manager.match()
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0].search_phrase_label, 'animals')
+
+    def test_search_phrases_after_ontology_file_changed(self):
+        directory = tempfile.mkdtemp()
+        try:
+            ontology_path = os.sep.join((directory, 'ontology.owl'))
+            shutil.copyfile(os.sep.join((script_directory, 'test_ontology.owl')), ontology_path)
+            first_holmes_manager = holmes.Manager('en_core_web_lg',
+                    ontology=holmes.Ontology(ontology_path), perform_coreference_resolution=False)
+            first_holmes_manager.register_search_phrase("A dog chases a cat", 'dogs')
+            first_holmes_manager.parse_and_register_document(
+                    "The German Shepherd dog chased the cat")
+            self.assertEqual(len(first_holmes_manager.match()), 1)
+            serialized_search_phrases = first_holmes_manager.serialize_search_phrases()
+            with open(ontology_path, encoding='utf-8') as file:
+                ontology_text = file.read()
+            # the first subclass relationship to 'dog' makes a German Shepherd dog a dog
+            ontology_text = ontology_text.replace(''.join(('<rdfs:subClassOf rdf:resource="',
+                    'http://www.semanticweb.org/hudsonr/ontologies/2019/0/animals#dog"/>')), '',
+                    1)
+            with open(ontology_path, 'w', encoding='utf-8') as file:
+                file.write(ontology_text)
+            changed_ontology = holmes.Ontology(ontology_path)
+            self.assertNotEqual(changed_ontology.content_fingerprint(),
+                    first_holmes_manager.ontology.content_fingerprint())
+            new_holmes_manager = holmes.Manager('en_core_web_lg', ontology=changed_ontology,
+                    perform_coreference_resolution=False)
+            new_holmes_manager.deserialize_and_register_search_phrases(
+                    serialized_search_phrases)
+            new_holmes_manager.parse_and_register_document(
+                    "The German Shepherd dog chased the cat")
+            self.assertEqual(new_holmes_manager.match(), [])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_import_conllu_and_spacy_bytes(self):
+        semantic_analyzer = nocoref_holmes_manager.semantic_analyzer
+        spacy_doc = semantic_analyzer.spacy_parse("The cat was chased by the dog. It rained")
+        lines = ['# newdoc id = pets']
+        for sentence in spacy_doc.sents:
+            for token in sentence:
+                head = 0 if token.head == token else token.head.i - sentence.start + 1
+                lines.append('\t'.join((str(token.i - sentence.start + 1), token.text,
+                        token.lemma_, token.pos_, token.tag_, '_', str(head), token.dep_, '_',
+                        '_' if token.whitespace_ != '' else 'SpaceAfter=No')))
+            lines.append('')
+        directory = tempfile.mkdtemp()
+        try:
+            conllu_path = os.sep.join((directory, 'external.conllu'))
+            with open(conllu_path, 'w', encoding='utf-8') as file:
+                file.write('\n'.join(lines))
+            bytes_path = os.sep.join((directory, 'safari.spacy'))
+            with open(bytes_path, 'wb') as file:
+                file.write(semantic_analyzer.spacy_parse("A dog chases a cat").to_bytes())
+            nocoref_holmes_manager.remove_all_documents()
+            throughput = nocoref_holmes_manager.import_and_register_documents(
+                    [conllu_path, bytes_path])
+            self.assertEqual(throughput['documents'], 2)
+            doc = nocoref_holmes_manager.threadsafe_container.get_document('pets')
+            self.assertEqual(doc.text, "The cat was chased by the dog. It rained")
+            self.assertEqual(len(list(doc.sents)), 2)
+            for token, expected_token in zip(doc, semantic_analyzer.parse(doc.text)):
+                self.assertEqual(token._.holmes.string_representation_of_children(),
+                        expected_token._.holmes.string_representation_of_children())
+            self.assertEqual(sorted(match.document_label for match in
+                    nocoref_holmes_manager.match()), ['pets', 'safari'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_corpus_bundle_round_trip(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.sep.join((directory, 'corpus.holmes'))
+            nocoref_holmes_manager.remove_all_documents()
+            nocoref_holmes_manager.parse_and_register_document("The cat was chased by the dog",
+                    'pets')
+            nocoref_holmes_manager.parse_and_register_document("The cat was chased by the dog",
+                    'more pets')
+            nocoref_holmes_manager.parse_and_register_document("Houses in the village.",
+                    'village')
+            nocoref_holmes_manager.save_corpus(path)
+            new_holmes_manager = holmes.Manager('en_core_web_lg',
+                    perform_coreference_resolution=False)
+            new_holmes_manager.load_corpus(path)
+            self.assertEqual(sorted(new_holmes_manager.document_labels()),
+                    ['more pets', 'pets', 'village'])
+            indexed_documents = new_holmes_manager.threadsafe_container.get_indexed_documents()
+            self.assertIs(indexed_documents['pets'], indexed_documents['more pets'])
+            doc = new_holmes_manager.threadsafe_container.get_document('village')
+            self.assertEqual(doc.text, "Houses in the village.")
+            self.assertEqual(doc[0]._.holmes.string_representation_of_children(),
+                    '1:prep; 3:pobjp')
+            self.assertEqual(doc[3]._.holmes.parent_dependencies, ((0, 'pobjp'), (1, 'pobj')))
+            new_holmes_manager.register_search_phrase("A dog chases a cat")
+            self.assertEqual(sorted(match.document_label for match in
+                    new_holmes_manager.match()), ['more pets', 'pets'])
+            new_holmes_manager.parse_and_register_document("The cat was chased by the dog",
+                    'yet more pets')
+            self.assertIs(new_holmes_manager.threadsafe_container.get_indexed_document(
+                    'yet more pets'), indexed_documents['pets'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_incremental_snapshots(self):
+        directory = tempfile.mkdtemp()
+        try:
+            nocoref_holmes_manager.remove_all_documents()
+            nocoref_holmes_manager.parse_and_register_document("The cat was chased by the dog",
+                    'pets')
+            nocoref_holmes_manager.parse_and_register_document("Houses in the village.",
+                    'village')
+            nocoref_holmes_manager.save_snapshot(directory)
+            snapshot_id = open(os.sep.join((directory, 'CURRENT'))).read()
+            log_path = os.sep.join((directory, ''.join((snapshot_id, '.log'))))
+            empty_log_size = os.path.getsize(log_path)
+            nocoref_holmes_manager.save_snapshot(directory)
+            self.assertEqual(os.path.getsize(log_path), empty_log_size)
+            nocoref_holmes_manager.remove_document('village')
+            nocoref_holmes_manager.parse_and_register_document("The cat was chased by the dog",
+                    'more pets')
+            nocoref_holmes_manager.parse_and_register_document("A dog chases a cat", 'village')
+            nocoref_holmes_manager.save_snapshot(directory)
+            self.assertEqual(open(os.sep.join((directory, 'CURRENT'))).read(), snapshot_id)
+            self.assertGreater(os.path.getsize(log_path), empty_log_size)
+            new_holmes_manager = holmes.Manager('en_core_web_lg',
+                    perform_coreference_resolution=False)
+            new_holmes_manager.load_snapshot(directory)
+            self.assertEqual(sorted(new_holmes_manager.document_labels()),
+                    ['more pets', 'pets', 'village'])
+            self.assertEqual(new_holmes_manager.threadsafe_container.get_document(
+                    'village').text, "A dog chases a cat")
+            new_holmes_manager.remove_document('pets')
+            new_holmes_manager.save_snapshot(directory)
+            new_holmes_manager.save_snapshot(directory, compact=True)
+            self.assertNotEqual(open(os.sep.join((directory, 'CURRENT'))).read(), snapshot_id)
+            self.assertFalse(os.path.exists(log_path))
+            new_holmes_manager = holmes.Manager('en_core_web_lg',
+                    perform_coreference_resolution=False)
+            new_holmes_manager.load_snapshot(directory)
+            new_holmes_manager.register_search_phrase("A dog chases a cat")
+            self.assertEqual(sorted(match.document_label for match in
+                    new_holmes_manager.match()), ['more pets', 'village'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_index_stored_with_serialized_document(self):
+        ontology_holmes_manager.remove_all_documents()
+        ontology_holmes_manager.parse_and_register_document(
+                "The German Shepherd dog chased the cat", 'pets')
+        serialized_doc = ontology_holmes_manager.serialize_document('pets')
+        words_to_token_indexes_dict = ontology_holmes_manager.threadsafe_container.\
+                get_indexed_document('pets').words_to_token_indexes_dict
+        self.assertIn('german shepherd dog', words_to_token_indexes_dict)
+        doc, serialized_index = ontology_holmes_manager.semantic_analyzer.\
+                from_serialized_string_with_index(serialized_doc)
+        self.assertEqual(serialized_index,
+                (ontology.multiword_fingerprint(), words_to_token_indexes_dict))
+        ontology_holmes_manager.deserialize_and_register_document(serialized_doc, 'pets2')
+        self.assertEqual(ontology_holmes_manager.threadsafe_container.get_indexed_document(
+                'pets2').words_to_token_indexes_dict, words_to_token_indexes_dict)
+        # the index was built with a different ontology, so the document is indexed again
+        nocoref_holmes_manager.remove_all_documents()
+        nocoref_holmes_manager.deserialize_and_register_document(serialized_doc, 'pets')
+        reindexed_words_to_token_indexes_dict = nocoref_holmes_manager.threadsafe_container.\
+                get_indexed_document('pets').words_to_token_indexes_dict
+        self.assertNotIn('german shepherd dog', reindexed_words_to_token_indexes_dict)
+        self.assertEqual(reindexed_words_to_token_indexes_dict['dog'], [3])
+        self.assertEqual(len(nocoref_holmes_manager.match()), 1)
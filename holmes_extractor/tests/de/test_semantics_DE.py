@@ -15,51 +15,51 @@ class GermanSemanticAnalyzerTest(unittest.TestCase):
 
     def test_one_righthand_sibling_with_and_conjunction(self):
         doc = analyzer.parse("Der Hund und der Löwe jagten die Katze")
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [4])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (4,))
         self.assertFalse(doc[1]._.holmes.is_involved_in_or_conjunction)
         self.assertFalse(doc[4]._.holmes.is_involved_in_or_conjunction)
-        self.assertEqual(doc[4]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[4]._.holmes.righthand_siblings, ())
 
     def test_many_righthand_siblings_with_and_conjunction(self):
         doc = analyzer.parse("Der Hund, der Hund und der Löwe jagten die Katze")
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [4, 7])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (4, 7))
         self.assertFalse(doc[1]._.holmes.is_involved_in_or_conjunction)
         self.assertFalse(doc[4]._.holmes.is_involved_in_or_conjunction)
         self.assertFalse(doc[7]._.holmes.is_involved_in_or_conjunction)
-        self.assertEqual(doc[4]._.holmes.righthand_siblings, [])
-        self.assertEqual(doc[7]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[4]._.holmes.righthand_siblings, ())
+        self.assertEqual(doc[7]._.holmes.righthand_siblings, ())
 
     def test_one_righthand_sibling_with_or_conjunction(self):
         doc = analyzer.parse("Der Hund oder der Löwe jagten die Katze")
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [4])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (4,))
         self.assertTrue(doc[1]._.holmes.is_involved_in_or_conjunction)
         self.assertTrue(doc[4]._.holmes.is_involved_in_or_conjunction)
-        self.assertEqual(doc[4]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[4]._.holmes.righthand_siblings, ())
 
     def test_many_righthand_siblings_with_or_conjunction(self):
         doc = analyzer.parse("Die Maus, der Hund oder der Löwe jagten die Katze")
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [4, 7])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (4, 7))
         self.assertTrue(doc[1]._.holmes.is_involved_in_or_conjunction)
         self.assertTrue(doc[4]._.holmes.is_involved_in_or_conjunction)
         self.assertTrue(doc[7]._.holmes.is_involved_in_or_conjunction)
-        self.assertEqual(doc[4]._.holmes.righthand_siblings, [])
-        self.assertEqual(doc[7]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[4]._.holmes.righthand_siblings, ())
+        self.assertEqual(doc[7]._.holmes.righthand_siblings, ())
 
     def test_righthand_siblings_of_semantic_children_two(self):
         doc = analyzer.parse("Der große und starke Hund kam heim")
         self.assertEqual(doc[4]._.holmes.string_representation_of_children(), '1:nk; 3:nk')
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [3])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (3,))
 
     def test_righthand_siblings_of_semantic_children_many(self):
         doc = analyzer.parse("Der große, starke und scharfe Hund kam heim")
         self.assertEqual(doc[6]._.holmes.string_representation_of_children(), '1:nk; 3:nk; 5:nk')
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [3,5])
-        self.assertEqual(doc[3]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (3, 5))
+        self.assertEqual(doc[3]._.holmes.righthand_siblings, ())
 
     def test_semantic_children_of_righthand_siblings_two(self):
         doc = analyzer.parse("Der große Hund und Löwe")
         self.assertEqual(doc[2]._.holmes.string_representation_of_children(), '1:nk; 3:cd')
-        self.assertEqual(doc[2]._.holmes.righthand_siblings, [4])
+        self.assertEqual(doc[2]._.holmes.righthand_siblings, (4,))
         self.assertEqual(doc[4]._.holmes.string_representation_of_children(), '1:nk')
 
     def test_semantic_children_of_righthand_siblings_many(self):
@@ -608,4 +608,4 @@ class GermanSemanticAnalyzerTest(unittest.TestCase):
 
     def test_parent_token_indexes(self):
         doc = analyzer.parse("Häuser im Dorf.")
-        self.assertEqual(doc[2]._.holmes.parent_dependencies, [[0, 'pobjp'],[1, 'nk']])
+        self.assertEqual(doc[2]._.holmes.parent_dependencies, ((0, 'pobjp'), (1, 'nk')))
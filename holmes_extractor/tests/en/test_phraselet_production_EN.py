@@ -269,3 +269,26 @@ class EnglishPhraseletProductionTest(unittest.TestCase):
                 "Richard Paul Hudson came",
                 ['predicate-actor: come-richard paul hudson',
                 'word: richard', 'word: paul', 'word: hudson', 'word: come'], False, True)
+
+    def test_phraselets_do_not_hold_spacy_documents(self):
+        doc = ontology_holmes_manager.semantic_analyzer.parse("A plant grows")
+        phraselet_labels_to_search_phrases = {}
+        ontology_holmes_manager.structural_matcher.add_phraselets_to_dict(doc,
+                phraselet_labels_to_search_phrases=phraselet_labels_to_search_phrases,
+                replace_with_hypernym_ancestors=False,
+                match_all_words=False,
+                returning_serialized_phraselets=False,
+                ignore_relation_phraselets=False,
+                include_reverse_only=False,
+                stop_lemmas = ontology_holmes_manager.semantic_analyzer.\
+                topic_matching_phraselet_stop_lemmas,
+                reverse_only_parent_lemmas = ontology_holmes_manager.semantic_analyzer.\
+                topic_matching_reverse_only_parent_lemmas)
+        phraselet = phraselet_labels_to_search_phrases['predicate-actor: grow-plant']
+        self.assertFalse(hasattr(phraselet.doc, 'vocab'))
+        self.assertFalse(hasattr(phraselet.root_token, '__dict__'))
+        self.assertEqual(phraselet.root_token._.holmes.lemma, 'grow')
+        self.assertEqual([token._.holmes.lemma for token in phraselet.matchable_tokens],
+                ['plant', 'grow'])
+        self.assertEqual(phraselet.root_token._.holmes.string_representation_of_children(),
+                '1:nsubj')
@@ -1,4 +1,5 @@
 import unittest
+from threading import Thread
 from holmes_extractor.semantics import SemanticAnalyzerFactory
 
 analyzer = SemanticAnalyzerFactory().semantic_analyzer(model='en_core_web_lg', debug=False,
@@ -14,53 +15,53 @@ class EnglishSemanticAnalyzerTest(unittest.TestCase):
 
     def test_one_righthand_sibling_with_and_conjunction(self):
         doc = analyzer.parse("The dog and the hound chased the cat")
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [4])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (4,))
         self.assertFalse(doc[1]._.holmes.is_involved_in_or_conjunction)
         self.assertFalse(doc[4]._.holmes.is_involved_in_or_conjunction)
-        self.assertEqual(doc[4]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[4]._.holmes.righthand_siblings, ())
 
     def test_many_righthand_siblings_with_and_conjunction(self):
         doc = analyzer.parse("The dog, the wolf and the hound chased the cat")
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [4, 7])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (4, 7))
         self.assertFalse(doc[1]._.holmes.is_involved_in_or_conjunction)
         self.assertFalse(doc[4]._.holmes.is_involved_in_or_conjunction)
         self.assertFalse(doc[7]._.holmes.is_involved_in_or_conjunction)
-        self.assertEqual(doc[4]._.holmes.righthand_siblings, [])
-        self.assertEqual(doc[7]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[4]._.holmes.righthand_siblings, ())
+        self.assertEqual(doc[7]._.holmes.righthand_siblings, ())
 
     def test_one_righthand_sibling_with_or_conjunction(self):
         doc = analyzer.parse("The dog or the hound chased the cat")
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [4])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (4,))
         self.assertTrue(doc[1]._.holmes.is_involved_in_or_conjunction)
         self.assertTrue(doc[4]._.holmes.is_involved_in_or_conjunction)
-        self.assertEqual(doc[4]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[4]._.holmes.righthand_siblings, ())
 
     def test_many_righthand_siblings_with_or_conjunction(self):
         doc = analyzer.parse("The dog, the wolf or the hound chased the cat")
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [4, 7])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (4, 7))
         self.assertTrue(doc[1]._.holmes.is_involved_in_or_conjunction)
         self.assertTrue(doc[4]._.holmes.is_involved_in_or_conjunction)
         self.assertTrue(doc[7]._.holmes.is_involved_in_or_conjunction)
-        self.assertEqual(doc[4]._.holmes.righthand_siblings, [])
-        self.assertEqual(doc[7]._.holmes.righthand_siblings, [])
+        self.assertEqual(doc[4]._.holmes.righthand_siblings, ())
+        self.assertEqual(doc[7]._.holmes.righthand_siblings, ())
 
     def test_righthand_siblings_of_semantic_children_two(self):
         doc = analyzer.parse("The large and strong dog came home")
         self.assertEqual(doc[4]._.holmes.string_representation_of_children(), '1:amod; 3:amod')
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [3])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, (3,))
 
     def test_righthand_siblings_of_semantic_children_many(self):
         doc = analyzer.parse("The large, strong and fierce dog came home")
         self.assertEqual(doc[6]._.holmes.string_representation_of_children(), '1:amod; 3:amod; 5:amod')
-        self.assertEqual(doc[1]._.holmes.righthand_siblings, [])
-        self.assertEqual(doc[3]._.holmes.righthand_siblings, [5])
+        self.assertEqual(doc[1]._.holmes.righthand_siblings, ())
+        self.assertEqual(doc[3]._.holmes.righthand_siblings, (5,))
         # Conjunction between 1 and 3 is already reflected in the underlying spaCy structure and does not need to be dealt with by Holmes
 
     def test_semantic_children_of_righthand_siblings_two(self):
         doc = analyzer.parse("The large dog and cat")
         self.assertEqual(doc[2]._.holmes.string_representation_of_children(),
                 '1:amod; 3:cc; 4:conj')
-        self.assertEqual(doc[2]._.holmes.righthand_siblings, [4])
+        self.assertEqual(doc[2]._.holmes.righthand_siblings, (4,))
         self.assertEqual(doc[4]._.holmes.string_representation_of_children(), '1:amod(U)')
 
     def test_semantic_children_of_righthand_siblings_many(self):
@@ -624,29 +625,29 @@ class EnglishSemanticAnalyzerTest(unittest.TestCase):
 
     def test_coreference_within_sentence(self):
         doc = analyzer.parse("The employee got home and he was surprised")
-        self.assertEqual(doc[1]._.holmes.token_and_coreference_chain_indexes, [1,5])
-        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, [5,1])
-        self.assertEqual(doc[3]._.holmes.token_and_coreference_chain_indexes, [3])
+        self.assertEqual(doc[1]._.holmes.token_and_coreference_chain_indexes, (1, 5))
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5, 1))
+        self.assertEqual(doc[3]._.holmes.token_and_coreference_chain_indexes, (3,))
 
     def test_coreference_between_sentences(self):
         doc = analyzer.parse("The employee got home. He was surprised")
-        self.assertEqual(doc[1]._.holmes.token_and_coreference_chain_indexes, [1,5])
-        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, [5,1])
-        self.assertEqual(doc[3]._.holmes.token_and_coreference_chain_indexes, [3])
+        self.assertEqual(doc[1]._.holmes.token_and_coreference_chain_indexes, (1, 5))
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5, 1))
+        self.assertEqual(doc[3]._.holmes.token_and_coreference_chain_indexes, (3,))
 
     def test_coreference_three_items_in_chain(self):
         doc = analyzer.parse("Richard was at work. He went home. He was surprised")
-        self.assertEqual(doc[0]._.holmes.token_and_coreference_chain_indexes, [0,5,9])
-        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, [5,0,9])
-        self.assertEqual(doc[9]._.holmes.token_and_coreference_chain_indexes, [9,0,5])
-        self.assertEqual(doc[3]._.holmes.token_and_coreference_chain_indexes, [3])
+        self.assertEqual(doc[0]._.holmes.token_and_coreference_chain_indexes, (0, 5, 9))
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5, 0, 9))
+        self.assertEqual(doc[9]._.holmes.token_and_coreference_chain_indexes, (9, 0, 5))
+        self.assertEqual(doc[3]._.holmes.token_and_coreference_chain_indexes, (3,))
 
     def test_coreference_conjunction_in_antecedent(self):
         doc = analyzer.parse("Richard and Carol came to work. They had a discussion")
-        self.assertEqual(doc[0]._.holmes.token_and_coreference_chain_indexes, [0,7])
-        self.assertEqual(doc[2]._.holmes.token_and_coreference_chain_indexes, [2,7])
-        self.assertEqual(doc[7]._.holmes.token_and_coreference_chain_indexes, [7,0,2])
-        self.assertEqual(doc[3]._.holmes.token_and_coreference_chain_indexes, [3])
+        self.assertEqual(doc[0]._.holmes.token_and_coreference_chain_indexes, (0, 7))
+        self.assertEqual(doc[2]._.holmes.token_and_coreference_chain_indexes, (2, 7))
+        self.assertEqual(doc[7]._.holmes.token_and_coreference_chain_indexes, (7, 0, 2))
+        self.assertEqual(doc[3]._.holmes.token_and_coreference_chain_indexes, (3,))
 
     def test_coreference_repeated_conjunctions(self):
         doc = analyzer.parse("A dog and a man came. A dog and a man sang")
@@ -655,24 +656,24 @@ class EnglishSemanticAnalyzerTest(unittest.TestCase):
                 [1,8,11])
         self.assertEqual(doc[4]._.holmes.token_and_coreference_chain_indexes,
                 [4,8,11])
-        self.assertEqual(doc[8]._.holmes.token_and_coreference_chain_indexes, [8,1,4])
+        self.assertEqual(doc[8]._.holmes.token_and_coreference_chain_indexes, (8, 1, 4))
         self.assertEqual(doc[11]._.holmes.token_and_coreference_chain_indexes,
                 [11,1,4])
 
     def test_maximum_mentions_difference(self):
         doc = analyzer.parse("""Richard came to work. He was happy. He was happy. He was happy.
         He was happy. He was happy. He was happy. He was happy. He was happy.""")
-        self.assertEqual(doc[0]._.holmes.token_and_coreference_chain_indexes, [0,5,9,13])
-        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, [5,0,9,13,18])
-        self.assertEqual(doc[9]._.holmes.token_and_coreference_chain_indexes, [9,0,5,13,18,22])
-        self.assertEqual(doc[13]._.holmes.token_and_coreference_chain_indexes, [13,0,5,9,18,22,26])
+        self.assertEqual(doc[0]._.holmes.token_and_coreference_chain_indexes, (0, 5, 9, 13))
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5, 0, 9, 13, 18))
+        self.assertEqual(doc[9]._.holmes.token_and_coreference_chain_indexes, (9, 0, 5, 13, 18, 22))
+        self.assertEqual(doc[13]._.holmes.token_and_coreference_chain_indexes, (13, 0, 5, 9, 18, 22, 26))
         self.assertEqual(doc[18]._.holmes.token_and_coreference_chain_indexes,
                 [18,5,9,13,22,26,30])
         self.assertEqual(doc[22]._.holmes.token_and_coreference_chain_indexes,
                 [22,9,13,18,26,30,34])
-        self.assertEqual(doc[26]._.holmes.token_and_coreference_chain_indexes, [26,13,18,22,30,34])
-        self.assertEqual(doc[30]._.holmes.token_and_coreference_chain_indexes, [30,18,22,26,34])
-        self.assertEqual(doc[34]._.holmes.token_and_coreference_chain_indexes, [34,22,26,30])
+        self.assertEqual(doc[26]._.holmes.token_and_coreference_chain_indexes, (26, 13, 18, 22, 30, 34))
+        self.assertEqual(doc[30]._.holmes.token_and_coreference_chain_indexes, (30, 18, 22, 26, 34))
+        self.assertEqual(doc[34]._.holmes.token_and_coreference_chain_indexes, (34, 22, 26, 30))
 
     def test_adjective_verb_clause_subjective_simple(self):
         doc = analyzer.parse("Richard was glad to understand.")
@@ -728,4 +729,112 @@ class EnglishSemanticAnalyzerTest(unittest.TestCase):
         doc = analyzer.parse("Houses in the village.")
         self.assertEqual(doc[0]._.holmes.string_representation_of_children(),
                 '1:prep; 3:pobjp')
-        self.assertEqual(doc[3]._.holmes.parent_dependencies, [[0, 'pobjp'],[1, 'pobj']])
+        self.assertEqual(doc[3]._.holmes.parent_dependencies, ((0, 'pobjp'), (1, 'pobj')))
+
+    def test_holmes_parse_stage_timings(self):
+        analyzer.reset_holmes_parse_stage_timings()
+        analyzer.parse("The dog chased the cat.")
+        analyzer.parse("The cat was chased by the dog.")
+        stage_timings = analyzer.holmes_parse_stage_timings()
+        self.assertEqual(stage_timings['documents'], 2)
+        self.assertEqual(set(stage_timings.keys()),
+                set(analyzer.holmes_parse_stages()) | {'documents'})
+        for stage_name in analyzer.holmes_parse_stages():
+            self.assertTrue(stage_timings[stage_name] >= 0.0)
+
+    def test_holmes_parse_stage_timings_multithreaded(self):
+
+        def parse_documents():
+            for _ in range(10):
+                analyzer.parse("The dog chased the cat.")
+
+        analyzer.reset_holmes_parse_stage_timings()
+        threads = [Thread(target=parse_documents) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(analyzer.holmes_parse_stage_timings()['documents'], 80)
+
+    def test_coreference_chain_without_coreference_resolution(self):
+        nocoref_analyzer = SemanticAnalyzerFactory().semantic_analyzer(model='en_core_web_lg',
+                debug=False, perform_coreference_resolution=False)
+        doc = nocoref_analyzer.parse("I saw a dog. It was chasing a cat.")
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5,))
+        self.assertEqual(doc[5]._.holmes.mentions, ())
+
+    def test_holmes_structures_have_no_instance_dictionaries(self):
+        doc = analyzer.parse("The employee got home. He was surprised")
+        self.assertFalse(hasattr(doc[2]._.holmes, '__dict__'))
+        self.assertFalse(hasattr(doc[2]._.holmes.children[0], '__dict__'))
+        self.assertFalse(hasattr(doc[5]._.holmes.mentions[0], '__dict__'))
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5, 1))
+
+    def test_pipeline_component_performs_coreference_resolution(self):
+        component = analyzer.pipeline_component()
+        doc = component(analyzer.nlp("The employee got home. He was surprised"))
+        self.assertEqual(doc[1]._.holmes.token_and_coreference_chain_indexes, (1, 5))
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5, 1))
+        self.assertTrue(len(doc[5]._.holmes.mentions) > 0)
+        parsed_doc = analyzer.parse("The employee got home. He was surprised")
+        for token, parsed_token in zip(doc, parsed_doc):
+            self.assertEqual([str(mention) for mention in token._.holmes.mentions],
+                    [str(mention) for mention in parsed_token._.holmes.mentions])
+            self.assertEqual(token._.holmes.token_and_coreference_chain_indexes,
+                    parsed_token._.holmes.token_and_coreference_chain_indexes)
+
+    def test_holmes_edges_are_held_in_tuples(self):
+        doc = analyzer.parse("The employee got home. He was surprised")
+        for token in doc:
+            self.assertIsInstance(token._.holmes.children, tuple)
+            self.assertIsInstance(token._.holmes.righthand_siblings, tuple)
+            self.assertIsInstance(token._.holmes.parent_dependencies, tuple)
+            self.assertIsInstance(token._.holmes.mentions, tuple)
+        deserialized_doc = analyzer.from_serialized_string(analyzer.to_serialized_string(doc))
+        self.assertIsInstance(deserialized_doc[2]._.holmes.children, tuple)
+        self.assertEqual(deserialized_doc[1]._.holmes.parent_dependencies,
+                doc[1]._.holmes.parent_dependencies)
+
+    def test_parse_in_chunks(self):
+        text = "The dog chased the cat.\n\nThe dog chased the cat. The cat chased the mouse."
+        doc = analyzer.parse_in_chunks(text, maximum_chunk_size=30)
+        self.assertEqual(doc.text, text)
+        self.assertEqual(len(list(doc.sents)), 3)
+        self.assertEqual(doc[7].idx, 25)
+        self.assertEqual(doc[2]._.holmes.string_representation_of_children(), '1:nsubj; 4:dobj')
+        self.assertEqual(doc[9]._.holmes.string_representation_of_children(),
+                '8:nsubj; 11:dobj')
+        self.assertEqual(doc[8]._.holmes.parent_dependencies, ((9, 'nsubj'),))
+        self.assertEqual(doc[15]._.holmes.string_representation_of_children(),
+                '14:nsubj; 17:dobj')
+        self.assertEqual(doc[15]._.holmes.lemma, 'chase')
+
+    def test_coreference_resolution_switched_off_for_document(self):
+        doc = analyzer.parse("The employee got home. He was surprised",
+                perform_coreference_resolution=False)
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5,))
+        self.assertEqual(doc[5]._.holmes.mentions, ())
+
+    def test_coreference_resolution_within_windows(self):
+        analyzer.coreference_window_size = 2
+        try:
+            doc = analyzer.parse(
+                    "The weather was bad. The employee got home. He was surprised. It rained.")
+        finally:
+            analyzer.coreference_window_size = None
+        self.assertEqual(doc[10]._.holmes.token_and_coreference_chain_indexes, (10, 6))
+        self.assertEqual(doc[6]._.holmes.token_and_coreference_chain_indexes, (6, 10))
+        self.assertEqual(len(list(doc.sents)), 4)
+
+    def test_phraselet_template_docs_are_independent_copies(self):
+        for phraselet_template in analyzer.phraselet_templates:
+            parsed_doc = analyzer.parse(phraselet_template.template_sentence)
+            template_doc = analyzer.phraselet_template_doc(phraselet_template)
+            self.assertEqual([token.tag_ for token in template_doc],
+                    [token.tag_ for token in parsed_doc])
+            self.assertEqual([token._.holmes.string_representation_of_children() for token in
+                    template_doc], [token._.holmes.string_representation_of_children() for
+                    token in parsed_doc])
+            template_doc[phraselet_template.parent_index]._.holmes.lemma = 'changed'
+            self.assertNotEqual(analyzer.phraselet_template_doc(phraselet_template)[
+                    phraselet_template.parent_index]._.holmes.lemma, 'changed')
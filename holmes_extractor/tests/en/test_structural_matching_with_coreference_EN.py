@@ -1,6 +1,8 @@
 import unittest
 import holmes_extractor as holmes
 import os
+import shutil
+import tempfile
 
 script_directory = os.path.dirname(os.path.realpath(__file__))
 ontology = holmes.Ontology(os.sep.join((script_directory,'test_ontology.owl')))
@@ -822,3 +824,38 @@ class CoreferenceEnglishMatchingTest(unittest.TestCase):
         self.assertTrue(coref_holmes_manager.semantic_analyzer.is_involved_in_coreference(doc[7]))
         self.assertEqual(doc[10]._.holmes.parent_dependencies,
                 [[3,'pobjp'],[6,'pobjp'],[7,'pobjp'],[8,'pobj']])
+
+    def test_matching_after_serialization(self):
+        coref_holmes_manager.remove_all_documents()
+        coref_holmes_manager.parse_and_register_document("I saw a dog and it was chasing a cat.",
+                'original')
+        serialized_doc = coref_holmes_manager.serialize_document('original')
+        coref_holmes_manager.remove_all_documents()
+        coref_holmes_manager.deserialize_and_register_document(serialized_doc, 'deserialized')
+        doc = coref_holmes_manager.threadsafe_container.get_document('deserialized')
+        self.assertTrue(coref_holmes_manager.semantic_analyzer.is_involved_in_coreference(doc[5]))
+        self.assertEqual(doc[5]._.holmes.token_and_coreference_chain_indexes, (5, 3))
+        matches = coref_holmes_manager.match()
+        self.assertTrue(matches[0].involves_coreference)
+        self._check_word_match(matches[0], 0, 3, 'dog')
+        self._check_word_match(matches[0], 1, 7, 'chase')
+        self._check_word_match(matches[0], 2, 9, 'cat')
+
+    def test_matching_after_corpus_bundle_round_trip(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.sep.join((directory, 'corpus.holmes'))
+            coref_holmes_manager.remove_all_documents()
+            coref_holmes_manager.parse_and_register_document(
+                    "I saw a house. I saw it in the village.", 'village')
+            coref_holmes_manager.save_corpus(path)
+            coref_holmes_manager.remove_all_documents()
+            coref_holmes_manager.load_corpus(path)
+            doc = coref_holmes_manager.threadsafe_container.get_document('village')
+            self.assertTrue(coref_holmes_manager.semantic_analyzer.is_involved_in_coreference(
+                    doc[7]))
+            self.assertEqual(doc[7]._.holmes.mention_root_index, 7)
+            self.assertEqual(doc[10]._.holmes.parent_dependencies,
+                    [[3,'pobjp'],[6,'pobjp'],[7,'pobjp'],[8,'pobj']])
+        finally:
+            shutil.rmtree(directory)
@@ -2,6 +2,8 @@ import unittest
 import holmes_extractor as holmes
 from holmes_extractor.extensive_matching import SupervisedTopicClassifier
 import os
+import shutil
+import tempfile
 
 script_directory = os.path.dirname(os.path.realpath(__file__))
 ontology = holmes.Ontology(os.sep.join((script_directory,'test_ontology.owl')))
@@ -279,6 +281,64 @@ class EnglishSupervisedTopicClassificationTest(unittest.TestCase):
         self.assertEqual(stc2.parse_and_classify("Your dog appears to be on a lead."),
                 ['animal', 'hound', 'dog'])
 
+    def test_binary_and_legacy_model_serialization(self):
+        sttb = holmes_manager.get_supervised_topic_training_basis()
+        sttb.parse_and_register_training_document("A dog chases a cat", 'animals')
+        sttb.parse_and_register_training_document("A cat chases a dog", 'animals')
+        sttb.parse_and_register_training_document("A computer has a program", 'computers')
+        sttb.parse_and_register_training_document("A program runs on a computer", 'computers')
+        sttb.prepare()
+        stc = sttb.train(minimum_occurrences=0, cv_threshold=0, mlp_max_iter=10000).classifier()
+        serialized_model = stc.serialize_model()
+        self.assertTrue(isinstance(serialized_model, bytes))
+        import jsonpickle
+        for stc2 in (holmes_manager.deserialize_supervised_topic_classifier(serialized_model),
+                no_ontology_holmes_manager.deserialize_supervised_topic_classifier(
+                serialized_model),
+                no_ontology_holmes_manager.deserialize_supervised_topic_classifier(
+                jsonpickle.encode(stc._model))):
+            self.assertEqual(list(stc._model.sorted_label_dict.keys()),
+                    list(stc2._model.sorted_label_dict.keys()))
+            self.assertEqual(stc.parse_and_classify("A dog chases a cat."),
+                    stc2.parse_and_classify("A dog chases a cat."))
+            self.assertEqual(stc.parse_and_classify("A program runs on a computer."),
+                    stc2.parse_and_classify("A program runs on a computer."))
+
+    def test_model_loaded_after_ontology_file_changed(self):
+        directory = tempfile.mkdtemp()
+        try:
+            ontology_path = os.sep.join((directory, 'ontology.owl'))
+            shutil.copyfile(os.sep.join((script_directory, 'test_ontology.owl')), ontology_path)
+            training_ontology = holmes.Ontology(ontology_path)
+            training_holmes_manager = holmes.Manager('en_core_web_lg',
+                    perform_coreference_resolution=False, ontology=training_ontology)
+            sttb = training_holmes_manager.get_supervised_topic_training_basis()
+            sttb.parse_and_register_training_document("A dog chases a cat", 'animals')
+            sttb.parse_and_register_training_document("A computer has a program", 'computers')
+            sttb.prepare()
+            serialized_model = sttb.train(minimum_occurrences=0, cv_threshold=0,
+                    mlp_max_iter=10000).classifier().serialize_model()
+            # an ontology with the same content is reused even if loaded from another path
+            stc = holmes_manager.deserialize_supervised_topic_classifier(serialized_model)
+            self.assertIs(stc._model.structural_matcher_ontology, ontology)
+            with open(ontology_path, encoding='utf-8') as file:
+                ontology_text = file.read()
+            with open(ontology_path, 'w', encoding='utf-8') as file:
+                file.write(ontology_text.replace(''.join(('<rdfs:subClassOf rdf:resource="',
+                        'http://www.semanticweb.org/hudsonr/ontologies/2019/0/animals#dog"/>')),
+                        '', 1))
+            changed_ontology = holmes.Ontology(ontology_path)
+            changed_holmes_manager = holmes.Manager('en_core_web_lg',
+                    perform_coreference_resolution=False, ontology=changed_ontology)
+            stc = changed_holmes_manager.deserialize_supervised_topic_classifier(
+                    serialized_model)
+            self.assertIsNot(stc._model.structural_matcher_ontology, changed_ontology)
+            self.assertEqual(stc._model.structural_matcher_ontology.content_fingerprint(),
+                    training_ontology.content_fingerprint())
+            self.assertEqual(stc.parse_and_classify("A dog chases a cat."), ['animals'])
+        finally:
+            shutil.rmtree(directory)
+
     def test_filtering(self):
         sttb = holmes_manager.get_supervised_topic_training_basis()
         sttb.parse_and_register_training_document("A dog chases a cat", 'animals')